@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Generador paramétrico de instancias sintéticas para las pruebas de rendimiento
+"""
+
+import math
+import random
+from model.profesor import Profesor
+from model.materia import Materia, MateriaSecciones
+from model.sala import Sala
+from config import NUM_DIAS, NUM_PERIODOS
+
+# Escalas predefinidas: parámetros de generar_instancia
+ESCALAS = {
+    "pequeña": {"num_profesores": 20},
+    "mediana": {"num_profesores": 100},
+    "grande": {"num_profesores": 300},
+    "muy_grande": {"num_profesores": 1000}
+}
+
+# Equipamientos que pueden requerir las materias (y tener las salas)
+EQUIPAMIENTOS = ["teclado", "percusión", "ensamble", "coro"]
+
+
+def generar_instancia(num_profesores=20, num_salas=None, num_materias=None, horas_semanales=(1, 4),
+                      horas_por_grupo=25, ocupacion=0.3, proporcion_infantil=0.25,
+                      proporcion_item=0.3, disponibilidad=0.9, especialidades=3,
+                      proporcion_equipamiento=0.2, proporcion_especifica=0.05, semilla=0):
+    """
+    Genera en memoria una instancia sintética del problema, sin pasar por
+    archivos Excel. El número de horas a programar se ajusta para ocupar una
+    fracción fija de las salas, de modo que la dificultad es parecida en
+    todas las escalas. Con la misma semilla se obtiene siempre la misma instancia.
+    
+    Args:
+        num_profesores: Número de profesores
+        num_salas: Número de salas (por defecto, 3 por cada 4 profesores)
+        num_materias: Número de materias distintas (por defecto, la mitad de
+                      los profesores, con un mínimo de 12)
+        horas_semanales: Tupla (mínimo, máximo) de horas semanales por materia
+        horas_por_grupo: Horas semanales aproximadas de cada grupo (sección)
+        ocupacion: Fracción de los períodos de las salas que ocupan las clases
+        proporcion_infantil: Fracción de salas, materias y grupos de nivel infantil
+        proporcion_item: Fracción de profesores con ítem (mínimo de 14 horas)
+        disponibilidad: Probabilidad de que un profesor esté disponible en cada período
+        especialidades: Número de materias que puede impartir cada profesor
+        proporcion_equipamiento: Fracción de materias no infantiles que requieren equipamiento
+        proporcion_especifica: Fracción de materias-secciones con profesor específico
+        semilla: Semilla del generador aleatorio
+        
+    Returns:
+        Tupla (profesores, materias_secciones, salas) con listas de objetos del modelo
+    """
+    rng = random.Random(semilla)
+    
+    if num_salas is None:
+        num_salas = max(3, round(num_profesores * 0.75))
+    if num_materias is None:
+        num_materias = max(12, num_profesores // 2)
+    
+    # Salas: las primeras son de nivel infantil; algunas del resto tienen equipamiento
+    num_salas_infantil = max(1, round(num_salas * proporcion_infantil)) if proporcion_infantil > 0 else 0
+    salas = []
+    for i in range(num_salas):
+        infantil = i < num_salas_infantil
+        equipamiento = None
+        if not infantil:
+            # Cada equipamiento está al menos en una sala general
+            indice_general = i - num_salas_infantil
+            if indice_general < len(EQUIPAMIENTOS):
+                equipamiento = [EQUIPAMIENTOS[indice_general]]
+            elif rng.random() < 0.3:
+                equipamiento = [rng.choice(EQUIPAMIENTOS)]
+        salas.append(Sala(
+            id=f"{'F' if infantil else 'B'}-{101 + i}",
+            nombre=f"{'F' if infantil else 'B'}-{101 + i}",
+            capacidad=rng.randint(20, 40),
+            nivel="infantil" if infantil else "general",
+            equipamiento=equipamiento
+        ))
+    
+    # Materias: una parte de nivel infantil, el resto en los demás niveles
+    num_materias_infantil = (max(1, round(num_materias * proporcion_infantil))
+                             if num_salas_infantil else 0)
+    materias = []
+    for i in range(num_materias):
+        infantil = i < num_materias_infantil
+        equipamiento = None
+        if not infantil and rng.random() < proporcion_equipamiento:
+            equipamiento = [rng.choice(EQUIPAMIENTOS)]
+        materias.append(Materia(
+            id=f"M-{i + 1:04d}",
+            nombre=f"Materia {i + 1}",
+            nivel="infantil" if infantil else rng.choice(["basico", "intermedio", "avanzado"]),
+            horas_semanales=rng.randint(*horas_semanales),
+            requiere_equipamiento=equipamiento
+        ))
+    materias_infantil = materias[:num_materias_infantil]
+    materias_generales = materias[num_materias_infantil:]
+    
+    # Grupos: tantos como hagan falta para cubrir la ocupación pedida de las salas
+    horas_totales = ocupacion * num_salas * NUM_DIAS * NUM_PERIODOS
+    num_grupos = max(1, math.ceil(horas_totales / horas_por_grupo))
+    num_grupos_infantil = round(num_grupos * proporcion_infantil) if materias_infantil else 0
+    
+    materias_secciones = []
+    for g in range(num_grupos):
+        disponibles = materias_infantil if g < num_grupos_infantil else materias_generales
+        grupo = f"G{g + 1:04d}"
+        horas = 0
+        for materia in rng.sample(disponibles, len(disponibles)):
+            if horas >= horas_por_grupo:
+                break
+            materias_secciones.append(MateriaSecciones(materia, grupo))
+            horas += materia.horas_semanales
+    
+    # Profesores: especialidades aleatorias, asegurando que toda materia tenga algún profesor
+    profesores = []
+    for i in range(num_profesores):
+        disponibilidad_profesor = [[rng.random() < disponibilidad for _ in range(NUM_PERIODOS)]
+                                   for _ in range(NUM_DIAS)]
+        profesores.append(Profesor(
+            id=1001 + i,
+            nombre=f"Nombre{i + 1} Apellido{i + 1}",
+            tiene_item=rng.random() < proporcion_item,
+            especialidades=[m.id for m in rng.sample(materias, min(especialidades, len(materias)))],
+            disponibilidad=disponibilidad_profesor
+        ))
+    
+    cubiertas = {materia_id for profesor in profesores for materia_id in profesor.especialidades}
+    for materia in materias:
+        if materia.id not in cubiertas:
+            rng.choice(profesores).especialidades.append(materia.id)
+    
+    # Profesores específicos elegidos entre los que pueden impartir la materia
+    for materia_seccion in materias_secciones:
+        if rng.random() < proporcion_especifica:
+            candidatos = [p for p in profesores if p.puede_impartir(materia_seccion.materia.id)]
+            materia_seccion.profesor_especifico = rng.choice(candidatos).id
+    
+    return profesores, materias_secciones, salas
+
+
+def generar_escala(escala, semilla=0):
+    """
+    Genera la instancia de una de las escalas predefinidas.
+    
+    Args:
+        escala: Nombre de la escala (clave de ESCALAS)
+        semilla: Semilla del generador aleatorio
+        
+    Returns:
+        Tupla (profesores, materias_secciones, salas)
+    """
+    if escala not in ESCALAS:
+        raise ValueError(f"Escala desconocida: {escala}")
+    return generar_instancia(semilla=semilla, **ESCALAS[escala])
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-pruebas de rendimiento de cada restricción y cada operador genético.
+
+Mide cada subclase de Restriccion (evaluar y, si está vectorizada,
+evaluar_codificado), cada OperadorCruce.cruzar y cada
+OperadorMutacion._aplicar_mutacion sobre horarios fijos de varios tamaños,
+y da el tiempo por evento (ns/evento) y la memoria asignada por llamada
+medida con tracemalloc.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.micro --escalas pequeña mediana grande --salida micro.json
+    python -m benchmarks.micro --comparar micro.json
+"""
+
+import argparse
+import inspect
+import itertools
+import random
+import sys
+import time
+import tracemalloc
+from benchmarks.instancias import ESCALAS, generar_escala
+from benchmarks.suite import crear_evaluador, guardar_y_comparar
+from model.problema import ProblemaCompilado
+from genetic.chromosomes import GeneradorCromosomas
+from genetic.constraints import Restriccion
+from genetic.crossover import OperadorCruce
+from genetic.mutation import OperadorMutacion, MutacionCompuesta
+
+# Operadores que solo delegan en otros y no tienen coste propio que medir
+EXCLUIDAS = (MutacionCompuesta,)
+
+
+def subclases(clase):
+    """
+    Devuelve todas las subclases concretas de una clase, en orden de definición.
+    
+    Args:
+        clase: Clase base
+        
+    Returns:
+        Lista de clases
+    """
+    resultado = []
+    for subclase in clase.__subclasses__():
+        if subclase not in EXCLUIDAS:
+            resultado.append(subclase)
+        resultado.extend(subclases(subclase))
+    return resultado
+
+
+def instanciar(clase, disponibles):
+    """
+    Crea un objeto pasando al constructor los argumentos de disponibles que acepta.
+    
+    Args:
+        clase: Clase a instanciar
+        disponibles: Diccionario nombre -> valor de posibles argumentos
+        
+    Returns:
+        Objeto de la clase
+    """
+    parametros = inspect.signature(clase.__init__).parameters
+    return clase(**{nombre: valor for nombre, valor in disponibles.items() if nombre in parametros})
+
+
+def cronometrar(funcion, argumentos, tiempo_minimo=0.2, repeticiones=5):
+    """
+    Mide el tiempo por llamada de una función. El número de llamadas de cada
+    repetición se ajusta para que dure al menos tiempo_minimo; se devuelve la
+    mejor repetición.
+    
+    Args:
+        funcion: Función a medir
+        argumentos: Función sin argumentos que devuelve la tupla de argumentos
+                    de una llamada; se prepara fuera del tiempo medido
+        tiempo_minimo: Duración mínima de cada repetición en segundos
+        repeticiones: Número de repeticiones
+        
+    Returns:
+        Tiempo por llamada en nanosegundos
+    """
+    # Calibrar el número de llamadas por repetición
+    llamadas = 1
+    while True:
+        lote = [argumentos() for _ in range(llamadas)]
+        inicio = time.perf_counter_ns()
+        for args in lote:
+            funcion(*args)
+        transcurrido = time.perf_counter_ns() - inicio
+        if transcurrido >= tiempo_minimo * 1e9 or llamadas >= 1 << 20:
+            break
+        llamadas *= 2 if transcurrido == 0 else max(2, min(10, int(tiempo_minimo * 1e9 / transcurrido) + 1))
+    
+    mejor = transcurrido / llamadas
+    for _ in range(repeticiones - 1):
+        lote = [argumentos() for _ in range(llamadas)]
+        inicio = time.perf_counter_ns()
+        for args in lote:
+            funcion(*args)
+        mejor = min(mejor, (time.perf_counter_ns() - inicio) / llamadas)
+    
+    return mejor
+
+
+def asignaciones(funcion, argumentos):
+    """
+    Mide con tracemalloc la memoria de una llamada: el máximo asignado durante
+    la llamada y lo que queda asignado al terminar (incluido el resultado).
+    
+    Args:
+        funcion: Función a medir
+        argumentos: Función sin argumentos que devuelve la tupla de argumentos
+        
+    Returns:
+        Tupla (bytes máximos, bytes retenidos, bloques retenidos)
+    """
+    args = argumentos()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        resultado = funcion(*args)
+        actual, pico = tracemalloc.get_traced_memory()
+        despues = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    
+    bloques = sum(diferencia.count_diff for diferencia in despues.compare_to(antes, "filename"))
+    del resultado
+    return pico - base, actual - base, bloques
+
+
+class MicroPruebas:
+    """
+    Micro-pruebas sobre un horario fijo de una escala: el horario se genera
+    una sola vez con el generador constructivo y una semilla fija.
+    """
+    
+    def __init__(self, escala, semilla=0, tiempo_minimo=0.2, repeticiones=5):
+        """
+        Genera la instancia de la escala y los horarios de prueba.
+        
+        Args:
+            escala: Nombre de la escala (clave de ESCALAS)
+            semilla: Semilla de la instancia y de los horarios
+            tiempo_minimo: Duración mínima de cada repetición en segundos
+            repeticiones: Número de repeticiones de cada medida
+        """
+        self.escala = escala
+        self.semilla = semilla
+        self.tiempo_minimo = tiempo_minimo
+        self.repeticiones = repeticiones
+        
+        self.profesores, self.materias_secciones, self.salas = generar_escala(escala, semilla)
+        self.problema = ProblemaCompilado(self.profesores, self.materias_secciones, self.salas)
+        self.evaluador = crear_evaluador(self.materias_secciones)
+        self.evaluador.catalogo = self.problema
+        
+        random.seed(semilla)
+        generador = GeneradorCromosomas(self.profesores, self.materias_secciones, self.salas, self.problema)
+        self.horario = generador.generar_constructivo()
+        self.pareja = generador.generar_constructivo()
+        self.evaluador.evaluar_poblacion([self.horario, self.pareja])
+        self.codificado = self.horario.codificar(self.problema)
+        
+        # Argumentos que pueden recibir los constructores de restricciones y operadores
+        self.disponibles = {
+            "peso": 1,
+            "materias_secciones": self.materias_secciones,
+            "probabilidad": 1.0,
+            "evaluador": self.evaluador,
+            "salas": self.salas,
+            "problema": self.problema
+        }
+    
+    def _medir(self, grupo, nombre, funcion, argumentos):
+        """
+        Mide una función y construye la fila de resultados.
+        
+        Args:
+            grupo: Grupo de la medida ("restricciones", "cruce" o "mutacion")
+            nombre: Nombre de la medida
+            funcion: Función a medir
+            argumentos: Función sin argumentos que devuelve los argumentos de una llamada
+            
+        Returns:
+            Diccionario con los resultados
+        """
+        random.seed(self.semilla)
+        ns_llamada = cronometrar(funcion, argumentos, self.tiempo_minimo, self.repeticiones)
+        pico, retenida, bloques = asignaciones(funcion, argumentos)
+        eventos = len(self.horario)
+        
+        return {
+            "escala": self.escala,
+            "grupo": grupo,
+            "nombre": nombre,
+            "eventos": eventos,
+            "tiempo": ns_llamada / 1e9,
+            "ns_por_evento": ns_llamada / eventos if eventos else None,
+            "memoria_pico": pico,
+            "bytes_por_evento": pico / eventos if eventos else None,
+            "memoria_retenida": retenida,
+            "bloques_retenidos": bloques
+        }
+    
+    def restricciones(self):
+        """
+        Mide evaluar de cada restricción y, si está vectorizada, evaluar_codificado.
+        
+        Returns:
+            Lista de resultados
+        """
+        resultados = []
+        for clase in subclases(Restriccion):
+            restriccion = instanciar(clase, self.disponibles)
+            resultados.append(self._medir("restricciones", f"{clase.__name__}.evaluar",
+                                          restriccion.evaluar, lambda: (self.horario,)))
+            if restriccion.vectorizada:
+                resultados.append(self._medir(
+                    "restricciones", f"{clase.__name__}.evaluar_codificado",
+                    restriccion.evaluar_codificado, lambda: (self.codificado, self.problema)))
+        return resultados
+    
+    def cruce(self):
+        """
+        Mide cruzar de cada operador de cruce sobre la pareja de horarios fijos.
+        
+        Returns:
+            Lista de resultados
+        """
+        return [self._medir("cruce", f"{clase.__name__}.cruzar",
+                            instanciar(clase, self.disponibles).cruzar,
+                            lambda: (self.horario, self.pareja))
+                for clase in subclases(OperadorCruce)]
+    
+    def mutacion(self, copias=32):
+        """
+        Mide _aplicar_mutacion de cada operador de mutación, con evaluación
+        incremental. Las llamadas se reparten por turnos entre unas pocas copias
+        del horario fijo, creadas de nuevo para cada operador: clonar el horario
+        en cada llamada costaría mucho más que la propia mutación.
+        
+        Args:
+            copias: Número de copias del horario entre las que se reparten las llamadas
+            
+        Returns:
+            Lista de resultados
+        """
+        resultados = []
+        for clase in subclases(OperadorMutacion):
+            turno = itertools.cycle([self.horario.clonar() for _ in range(copias)])
+            resultados.append(self._medir("mutacion", f"{clase.__name__}._aplicar_mutacion",
+                                          instanciar(clase, self.disponibles)._aplicar_mutacion,
+                                          lambda turno=turno: (next(turno),)))
+        return resultados
+    
+    def ejecutar(self):
+        """
+        Ejecuta todas las micro-pruebas.
+        
+        Returns:
+            Lista con todos los resultados
+        """
+        return self.restricciones() + self.cruce() + self.mutacion()
+
+
+def mostrar(resultados):
+    """
+    Imprime una tabla con los resultados.
+    
+    Args:
+        resultados: Lista de resultados
+    """
+    print(f"{'escala':<11} {'nombre':<48} {'eventos':>8} {'µs/llamada':>11} {'ns/evento':>10} "
+          f"{'B/evento':>9} {'bloques':>8}")
+    for r in resultados:
+        print(f"{r['escala']:<11} {r['nombre']:<48} {r['eventos']:>8} {r['tiempo'] * 1e6:>11.2f} "
+              f"{r['ns_por_evento']:>10.1f} {r['bytes_por_evento']:>9.1f} {r['bloques_retenidos']:>8}")
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    
+    Args:
+        argv: Lista de argumentos (por defecto, los del proceso)
+        
+    Returns:
+        Código de salida: 1 si hay regresiones respecto a la referencia, 0 si no
+    """
+    parser = argparse.ArgumentParser(description="Micro-pruebas de restricciones y operadores")
+    parser.add_argument("--escalas", nargs="+", default=["pequeña", "mediana", "grande"],
+                        choices=list(ESCALAS))
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--tiempo-minimo", type=float, default=0.2,
+                        help="Duración mínima en segundos de cada repetición")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Archivo JSON de referencia con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.1,
+                        help="Aumento relativo de tiempo o memoria admitido al comparar")
+    argumentos = parser.parse_args(argv)
+    
+    resultados = []
+    for escala in argumentos.escalas:
+        print(f"Escala {escala}...", file=sys.stderr)
+        resultados.extend(MicroPruebas(escala, argumentos.semilla, argumentos.tiempo_minimo,
+                                       argumentos.repeticiones).ejecutar())
+    
+    mostrar(resultados)
+    
+    return guardar_y_comparar(resultados, argumentos)
+
+if __name__ == "__main__":
+    sys.exit(main())
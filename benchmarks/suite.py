@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pruebas de rendimiento reproducibles sobre instancias sintéticas.
+
+Mide el tiempo, las evaluaciones por segundo, la memoria máxima y el fitness
+final de los generadores de cromosomas, cada restricción, cada operador y
+ejecuciones completas del algoritmo genético y del recocido simulado, y guarda
+los resultados en JSON para compararlos con una ejecución de referencia.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.suite --escalas pequeña mediana --salida base.json
+    python -m benchmarks.suite --escalas pequeña mediana --comparar base.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from benchmarks.instancias import ESCALAS, generar_escala
+from model.problema import ProblemaCompilado
+from genetic.chromosomes import GeneradorCromosomas
+from genetic.crossover import CruceDias, CruceEventos, CruceMateriasSeccion
+from genetic.mutation import MutacionCambioHorario, MutacionCambioSala, MutacionIntercambio
+from genetic.fitness import Evaluador
+from genetic.genetic_algorithm import GeneticAlgorithm
+from genetic.simulated_annealing import RecocidoSimulado
+from genetic.instrumentation import Instrumentacion
+from genetic.constraints import (
+    ProfesorNoSimultaneo,
+    SalaNoSimultanea,
+    GrupoNoSimultaneo,
+    ProfesorMinHoras,
+    SalaNivelCorrecto,
+    AsignacionEspecifica,
+    HorasCompletas,
+    MinimizarHuecos,
+    DistribucionEquilibrada
+)
+from config import PESOS
+
+# Grupos de pruebas disponibles
+GRUPOS = ("generadores", "restricciones", "operadores", "ga", "recocido")
+
+# Versión del formato de los resultados
+VERSION_RESULTADOS = 1
+
+
+def crear_evaluador(materias_secciones):
+    """
+    Crea un evaluador con las mismas restricciones que main.py.
+    
+    Args:
+        materias_secciones: Lista de objetos MateriaSecciones
+        
+    Returns:
+        Objeto Evaluador
+    """
+    restricciones_duras = [
+        ProfesorNoSimultaneo(peso=PESOS["profesor_simultaneo"]),
+        SalaNoSimultanea(peso=PESOS["sala_simultanea"]),
+        GrupoNoSimultaneo(peso=PESOS["grupo_simultaneo"]),
+        ProfesorMinHoras(peso=PESOS["profesor_min_horas"]),
+        SalaNivelCorrecto(peso=PESOS["sala_nivel"]),
+        AsignacionEspecifica(peso=PESOS["asignacion_especifica"]),
+        HorasCompletas(peso=PESOS["horas_completas"], materias_secciones=materias_secciones)
+    ]
+    
+    restricciones_blandas = [
+        MinimizarHuecos(peso=PESOS["minimizar_huecos"]),
+        DistribucionEquilibrada(peso=PESOS["distribucion_equilibrada"])
+    ]
+    
+    return Evaluador(restricciones_duras, restricciones_blandas)
+
+
+def medir(funcion, repeticiones=1, memoria=True, preparar=None):
+    """
+    Mide el tiempo de una función. La memoria máxima se mide con tracemalloc en
+    una ejecución adicional, para que el rastreo no altere los tiempos.
+    
+    Args:
+        funcion: Función sin argumentos a medir (o que recibe lo que devuelve preparar)
+        repeticiones: Número de ejecuciones cronometradas
+        memoria: Si es True se mide también la memoria máxima
+        preparar: Función sin argumentos llamada antes de cada ejecución, fuera
+                  del tiempo medido; su resultado se pasa a funcion (opcional)
+                  
+    Returns:
+        Tupla (medidas, resultado): diccionario con "tiempo" (mínimo),
+        "tiempo_mediana" y "memoria_pico" (bytes, o None), y el resultado
+        de la última ejecución cronometrada
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        argumentos = () if preparar is None else (preparar(),)
+        inicio = time.perf_counter()
+        resultado = funcion(*argumentos)
+        tiempos.append(time.perf_counter() - inicio)
+    
+    pico = None
+    if memoria:
+        argumentos = () if preparar is None else (preparar(),)
+        tracemalloc.start()
+        try:
+            funcion(*argumentos)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    
+    return {
+        "tiempo": min(tiempos),
+        "tiempo_mediana": statistics.median(tiempos),
+        "memoria_pico": pico
+    }, resultado
+
+
+class SuiteRendimiento:
+    """
+    Ejecuta las pruebas de rendimiento de una escala de instancia. Cada prueba
+    fija la semilla antes de empezar, de modo que los resultados son
+    comparables entre ejecuciones.
+    """
+    
+    def __init__(self, escala, semilla=0, repeticiones=3, memoria=True,
+                 tamaño_poblacion=40, generaciones=20, iteraciones_recocido=20000):
+        """
+        Genera la instancia de la escala y prepara los objetos compartidos.
+        
+        Args:
+            escala: Nombre de la escala (clave de ESCALAS)
+            semilla: Semilla de la instancia y de las pruebas
+            repeticiones: Ejecuciones cronometradas de cada prueba (el GA se ejecuta una vez)
+            memoria: Si es True se mide la memoria máxima de cada prueba
+            tamaño_poblacion: Individuos de las poblaciones de prueba y del GA
+            generaciones: Generaciones de la ejecución completa del GA
+            iteraciones_recocido: Vecinos probados en la ejecución completa del recocido simulado
+        """
+        self.escala = escala
+        self.semilla = semilla
+        self.repeticiones = repeticiones
+        self.memoria = memoria
+        self.tamaño_poblacion = tamaño_poblacion
+        self.generaciones = generaciones
+        self.iteraciones_recocido = iteraciones_recocido
+        
+        self.profesores, self.materias_secciones, self.salas = generar_escala(escala, semilla)
+        self.problema = ProblemaCompilado(self.profesores, self.materias_secciones, self.salas)
+        self.generador = GeneradorCromosomas(self.profesores, self.materias_secciones,
+                                             self.salas, self.problema)
+        
+        self.evaluador = crear_evaluador(self.materias_secciones)
+        self.evaluador.catalogo = self.problema
+        
+        self._poblacion = None
+    
+    def _resultado(self, grupo, nombre, medidas, **extra):
+        """
+        Construye la fila de resultados de una prueba.
+        
+        Args:
+            grupo: Grupo de la prueba (ver GRUPOS)
+            nombre: Nombre de la prueba dentro del grupo
+            medidas: Diccionario devuelto por medir
+            **extra: Otros valores medidos
+            
+        Returns:
+            Diccionario con los resultados
+        """
+        resultado = {"escala": self.escala, "grupo": grupo, "nombre": nombre}
+        resultado.update(medidas)
+        resultado.update(extra)
+        return resultado
+    
+    def poblacion(self):
+        """
+        Población evaluada de referencia para las pruebas de restricciones y
+        operadores: la mitad constructiva y la otra mitad aleatoria.
+        
+        Returns:
+            Lista de objetos Horario evaluados
+        """
+        if self._poblacion is None:
+            random.seed(self.semilla)
+            mitad = self.tamaño_poblacion // 2
+            self._poblacion = ([self.generador.generar_constructivo() for _ in range(mitad)] +
+                               [self.generador.generar_aleatorio()
+                                for _ in range(self.tamaño_poblacion - mitad)])
+            self.evaluador.evaluar_poblacion(self._poblacion)
+        return self._poblacion
+    
+    def generadores(self):
+        """
+        Mide los generadores de cromosomas: un horario por llamada.
+        
+        Returns:
+            Lista de resultados
+        """
+        resultados = []
+        for nombre in ("aleatorio", "heuristico", "constructivo"):
+            generar = getattr(self.generador, f"generar_{nombre}")
+            random.seed(self.semilla)
+            medidas, horario = medir(generar, self.repeticiones, self.memoria)
+            resultados.append(self._resultado("generadores", nombre, medidas,
+                                              eventos=len(horario),
+                                              fitness=self.evaluador.evaluar(horario)))
+        return resultados
+    
+    def restricciones(self):
+        """
+        Mide cada restricción sobre la población de referencia, con su versión
+        vectorizada por lotes si la tiene, y la evaluación completa del Evaluador.
+        
+        Returns:
+            Lista de resultados
+        """
+        poblacion = self.poblacion()
+        codificados = [horario.codificar(self.problema) for horario in poblacion]
+        eventos = np.concatenate(codificados)
+        individuos = np.repeat(np.arange(len(poblacion)), [len(c) for c in codificados])
+        
+        resultados = []
+        for restriccion in self.evaluador.restricciones_duras + self.evaluador.restricciones_blandas:
+            if restriccion.vectorizada:
+                def evaluar(restriccion=restriccion):
+                    return restriccion.medir_lote(eventos, individuos, len(poblacion), self.problema)
+            else:
+                def evaluar(restriccion=restriccion):
+                    return [restriccion.medir(horario) for horario in poblacion]
+            
+            medidas, _ = medir(evaluar, self.repeticiones, self.memoria)
+            resultados.append(self._resultado(
+                "restricciones", type(restriccion).__name__, medidas,
+                vectorizada=restriccion.vectorizada,
+                evaluaciones_por_segundo=len(poblacion) / medidas["tiempo"]))
+        
+        # Evaluación completa de la población (sin caché)
+        def preparar():
+            copias = [horario.clonar() for horario in poblacion]
+            for copia in copias:
+                copia.medidas = None
+            return copias
+        
+        medidas, _ = medir(self.evaluador.evaluar_poblacion, self.repeticiones, self.memoria, preparar)
+        resultados.append(self._resultado("restricciones", "Evaluador", medidas,
+                                          evaluaciones_por_segundo=len(poblacion) / medidas["tiempo"]))
+        return resultados
+    
+    def operadores(self):
+        """
+        Mide cada operador de cruce sobre parejas de la población de referencia y
+        cada operador de mutación (con evaluación incremental) sobre copias de ella.
+        
+        Returns:
+            Lista de resultados
+        """
+        poblacion = self.poblacion()
+        parejas = list(zip(poblacion[::2], poblacion[1::2]))
+        
+        resultados = []
+        for operador in (CruceDias(), CruceEventos(), CruceMateriasSeccion()):
+            def cruzar(operador=operador):
+                random.seed(self.semilla)
+                return [operador.cruzar(padre1, padre2) for padre1, padre2 in parejas]
+            
+            medidas, _ = medir(cruzar, self.repeticiones, self.memoria)
+            resultados.append(self._resultado(
+                "operadores", type(operador).__name__, medidas,
+                operaciones_por_segundo=len(parejas) / medidas["tiempo"]))
+        
+        mutaciones = (
+            MutacionCambioHorario(probabilidad=1.0, evaluador=self.evaluador),
+            MutacionCambioSala(probabilidad=1.0, salas=self.salas, evaluador=self.evaluador,
+                               problema=self.problema),
+            MutacionIntercambio(probabilidad=1.0, evaluador=self.evaluador)
+        )
+        for operador in mutaciones:
+            def mutar(copias, operador=operador):
+                random.seed(self.semilla)
+                return sum(operador.mutar(copia) for copia in copias)
+            
+            medidas, aplicadas = medir(mutar, self.repeticiones, self.memoria,
+                                       lambda: [horario.clonar() for horario in poblacion])
+            resultados.append(self._resultado(
+                "operadores", type(operador).__name__, medidas,
+                operaciones_por_segundo=len(poblacion) / medidas["tiempo"],
+                tasa_aceptacion=aplicadas / len(poblacion)))
+        return resultados
+    
+    def ga(self):
+        """
+        Ejecuta el algoritmo genético completo durante un número fijo de
+        generaciones (sin parada por fitness ni por estancamiento).
+        
+        Returns:
+            Lista con un resultado
+        """
+        instrumentacion = Instrumentacion(diversidad=False)
+        
+        def ejecutar():
+            random.seed(self.semilla)
+            evaluador = crear_evaluador(self.materias_secciones)
+            ga = GeneticAlgorithm(self.profesores, self.materias_secciones, self.salas, evaluador,
+                                  tamaño_poblacion=self.tamaño_poblacion,
+                                  max_generaciones=self.generaciones,
+                                  instrumentacion=instrumentacion,
+                                  criterio_parada_fitness=float("inf"),
+                                  max_generaciones_sin_mejora=self.generaciones + 1)
+            with contextlib.redirect_stdout(io.StringIO()):
+                ga.ejecutar()
+            return ga
+        
+        instrumentacion.registros.clear()
+        medidas, ga = medir(ejecutar, 1, False)
+        contadores = instrumentacion.totales()["contadores"]
+        evaluaciones = (contadores.get("evaluaciones.completas", 0) +
+                        contadores.get("evaluaciones.incrementales", 0))
+        
+        if self.memoria:
+            medidas["memoria_pico"] = medir(ejecutar, 1, True)[0]["memoria_pico"]
+        
+        return [self._resultado(
+            "ga", f"poblacion_{self.tamaño_poblacion}", medidas,
+            generaciones=ga.generacion,
+            evaluaciones=evaluaciones,
+            evaluaciones_por_segundo=evaluaciones / medidas["tiempo"],
+            fitness=ga.mejor_fitness,
+            penalizacion=ga.evaluador.penalizacion(ga.mejor_individuo.medidas))]
+    
+    def recocido(self):
+        """
+        Ejecuta el recocido simulado completo durante un número fijo de
+        iteraciones (sin parada por fitness), desde la solución constructiva.
+        
+        Returns:
+            Lista con un resultado
+        """
+        def ejecutar():
+            random.seed(self.semilla)
+            evaluador = crear_evaluador(self.materias_secciones)
+            recocido = RecocidoSimulado(self.profesores, self.materias_secciones, self.salas, evaluador,
+                                        max_iteraciones=self.iteraciones_recocido,
+                                        criterio_parada_fitness=float("inf"))
+            with contextlib.redirect_stdout(io.StringIO()):
+                recocido.ejecutar()
+            return recocido
+        
+        medidas, recocido = medir(ejecutar, 1, False)
+        
+        if self.memoria:
+            medidas["memoria_pico"] = medir(ejecutar, 1, True)[0]["memoria_pico"]
+        
+        return [self._resultado(
+            "recocido", f"iteraciones_{self.iteraciones_recocido}", medidas,
+            iteraciones=recocido.iteraciones,
+            aceptados=recocido.aceptados,
+            evaluaciones=recocido.iteraciones,
+            evaluaciones_por_segundo=recocido.iteraciones / medidas["tiempo"],
+            fitness=recocido.mejor_fitness,
+            penalizacion=recocido.evaluador.penalizacion(recocido.mejor_individuo.medidas))]
+    
+    def ejecutar(self, grupos=GRUPOS):
+        """
+        Ejecuta los grupos de pruebas indicados.
+        
+        Args:
+            grupos: Nombres de los grupos (ver GRUPOS)
+            
+        Returns:
+            Lista con todos los resultados
+        """
+        resultados = []
+        for grupo in grupos:
+            resultados.extend(getattr(self, grupo)())
+        return resultados
+
+
+def metadatos(argumentos):
+    """
+    Describe el entorno de la ejecución para poder interpretar los resultados.
+    
+    Args:
+        argumentos: Diccionario con los parámetros de la ejecución
+        
+    Returns:
+        Diccionario con los metadatos
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "version": VERSION_RESULTADOS,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "parametros": argumentos
+    }
+
+
+def comparar(resultados, referencia, tolerancia=0.1):
+    """
+    Compara los resultados con los de una ejecución de referencia. Se considera
+    regresión un tiempo mayor que el de referencia en más de la tolerancia, o
+    un fitness final menor.
+    
+    Args:
+        resultados: Lista de resultados de la ejecución actual
+        referencia: Lista de resultados de la ejecución de referencia
+        tolerancia: Aumento relativo de tiempo admitido
+        
+    Returns:
+        Lista de diccionarios (escala, grupo, nombre, medida, referencia, actual,
+        cambio, regresion), una por medida comparada
+    """
+    por_clave = {(r["escala"], r["grupo"], r["nombre"]): r for r in referencia}
+    
+    comparaciones = []
+    for resultado in resultados:
+        anterior = por_clave.get((resultado["escala"], resultado["grupo"], resultado["nombre"]))
+        if anterior is None:
+            continue
+        
+        for medida in ("tiempo", "memoria_pico", "fitness"):
+            actual, previo = resultado.get(medida), anterior.get(medida)
+            if actual is None or previo is None:
+                continue
+            
+            cambio = (actual - previo) / previo if previo else 0.0
+            if medida == "fitness":
+                regresion = actual < previo
+            else:
+                regresion = cambio > tolerancia
+            
+            comparaciones.append({
+                "escala": resultado["escala"], "grupo": resultado["grupo"],
+                "nombre": resultado["nombre"], "medida": medida,
+                "referencia": previo, "actual": actual, "cambio": cambio,
+                "regresion": regresion
+            })
+    
+    return comparaciones
+
+
+def guardar_y_comparar(resultados, argumentos):
+    """
+    Guarda los resultados en argumentos.salida y los compara con la referencia
+    de argumentos.comparar, si se indicaron, mostrando las regresiones.
+    
+    Args:
+        resultados: Lista de resultados
+        argumentos: Namespace de argparse con salida, comparar y tolerancia
+        
+    Returns:
+        Código de salida: 1 si hay regresiones respecto a la referencia, 0 si no
+    """
+    if argumentos.salida:
+        directorio = os.path.dirname(argumentos.salida)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"metadatos": metadatos(vars(argumentos)), "resultados": resultados},
+                      archivo, ensure_ascii=False, indent=2)
+        print(f"Resultados guardados en {argumentos.salida}")
+    
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            referencia = json.load(archivo)["resultados"]
+        
+        comparaciones = comparar(resultados, referencia, argumentos.tolerancia)
+        regresiones = [c for c in comparaciones if c["regresion"]]
+        for c in regresiones:
+            print(f"REGRESIÓN {c['escala']}/{c['grupo']}/{c['nombre']} {c['medida']}: "
+                  f"{c['referencia']:.6g} -> {c['actual']:.6g} ({c['cambio']:+.1%})")
+        print(f"{len(comparaciones)} medidas comparadas, {len(regresiones)} regresiones")
+        return 1 if regresiones else 0
+    
+    return 0
+
+
+def mostrar(resultados):
+    """
+    Imprime una tabla con los resultados principales.
+    
+    Args:
+        resultados: Lista de resultados
+    """
+    print(f"{'escala':<11} {'grupo':<13} {'nombre':<26} {'tiempo (ms)':>12} "
+          f"{'eval/s':>10} {'memoria (KiB)':>14} {'fitness':>10}")
+    for r in resultados:
+        velocidad = r.get("evaluaciones_por_segundo", r.get("operaciones_por_segundo"))
+        memoria = r.get("memoria_pico")
+        print(f"{r['escala']:<11} {r['grupo']:<13} {r['nombre']:<26} {r['tiempo'] * 1000:>12.3f} "
+              f"{'' if velocidad is None else f'{velocidad:.0f}':>10} "
+              f"{'' if memoria is None else f'{memoria / 1024:.1f}':>14} "
+              f"{r.get('fitness', ''):>10}")
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    
+    Args:
+        argv: Lista de argumentos (por defecto, los del proceso)
+        
+    Returns:
+        Código de salida: 1 si hay regresiones respecto a la referencia, 0 si no
+    """
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento sobre instancias sintéticas")
+    parser.add_argument("--escalas", nargs="+", default=["pequeña", "mediana"], choices=list(ESCALAS))
+    parser.add_argument("--grupos", nargs="+", default=list(GRUPOS), choices=GRUPOS)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--poblacion", type=int, default=40)
+    parser.add_argument("--generaciones", type=int, default=20)
+    parser.add_argument("--iteraciones-recocido", type=int, default=20000)
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="No medir la memoria máxima (cada medida repite la prueba con tracemalloc)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Archivo JSON de referencia con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.1,
+                        help="Aumento relativo de tiempo o memoria admitido al comparar")
+    argumentos = parser.parse_args(argv)
+    
+    resultados = []
+    for escala in argumentos.escalas:
+        print(f"Escala {escala}...", file=sys.stderr)
+        suite = SuiteRendimiento(escala, semilla=argumentos.semilla,
+                                 repeticiones=argumentos.repeticiones,
+                                 memoria=not argumentos.sin_memoria,
+                                 tamaño_poblacion=argumentos.poblacion,
+                                 generaciones=argumentos.generaciones,
+                                 iteraciones_recocido=argumentos.iteraciones_recocido)
+        resultados.extend(suite.ejecutar(argumentos.grupos))
+    
+    mostrar(resultados)
+    
+    return guardar_y_comparar(resultados, argumentos)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -35,7 +35,35 @@ GA_CONFIG = {
     "elitismo": 5,
     "max_generaciones": 500,
     "criterio_parada_fitness": 0.95,  # Porcentaje del fitness máximo teórico
-    "generaciones_sin_mejora": 50     # Número de generaciones sin mejora para detener
+    "generaciones_sin_mejora": 50,    # Número de generaciones sin mejora para detener
+    "tamaño_cache_fitness": 10000,    # Horarios distintos recordados por la caché de fitness
+    "inicializacion": "constructiva", # "constructiva" o "heuristica" para la parte no aleatoria
+    "intervalo_busqueda_local": 10,   # Generaciones entre búsquedas locales (0 para desactivarla)
+    "individuos_busqueda_local": 2,   # Mejores individuos a los que se aplica la búsqueda local
+    "estrategia_busqueda_local": "primera_mejora",  # "primera_mejora" o "maximo_descenso"
+    "reparar_hijos": True,            # Reubicar choques y completar horas tras cruce y mutación
+    "intervalo_checkpoint": 10,       # Generaciones entre puntos de control (si se indica una ruta)
+    "tiempo_maximo": None             # Segundos de ejecución (None para no limitar el tiempo)
+}
+
+# Configuración del modelo de islas
+ISLAS_CONFIG = {
+    "num_islas": 4,
+    "intervalo_migracion": 10,  # Generaciones entre migraciones
+    "tamaño_migracion": 2,      # Individuos que emigran de cada isla
+    "topologia": "anillo"       # "anillo" o "aleatoria"
+}
+
+# Configuración del recocido simulado
+RECOCIDO_CONFIG = {
+    "temperatura_inicial": None,     # None para estimarla a partir de vecinos aleatorios
+    "aceptacion_inicial": 0.5,       # Probabilidad de aceptar un empeoramiento medio al inicio
+    "temperatura_final": 0.5,
+    "enfriamiento": "geometrico",    # "geometrico" o "lineal"
+    "alfa": 0.98,                    # Factor del enfriamiento geométrico
+    "iteraciones_por_temperatura": 200,
+    "max_iteraciones": 200000,
+    "reparar": True                  # Reparar la solución inicial y cada nueva mejor solución
 }
 
 # Pesos para las restricciones
@@ -47,6 +75,7 @@ PESOS = {
     "profesor_min_horas": 1000,
     "sala_nivel": 1000,
     "asignacion_especifica": 1000,
+    "horas_completas": 1000,
     
     # Restricciones blandas
     "minimizar_huecos": 10,
@@ -54,4 +83,7 @@ PESOS = {
 }
 
 # Valor base para el cálculo de fitness
-BASE_FITNESS = 10000
\ No newline at end of file
+BASE_FITNESS = 10000
+
+# Directorio de la caché binaria de instancias cargadas desde Excel
+DIRECTORIO_CACHE_INSTANCIAS = "db/cache"
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Puntos de control del algoritmo genético en formato .npz
+"""
+
+import hashlib
+import os
+import random
+import numpy as np
+from model.catalogo import NUM_COLUMNAS
+from model.horario import Horario
+
+# Versión del formato de los puntos de control
+VERSION_CHECKPOINT = 2
+
+
+def _firma(catalogo):
+    """
+    Resume la instancia del problema para detectar puntos de control de otra
+    instancia: huella SHA-256 de los identificadores, en orden, de profesores,
+    materias-secciones y salas, que son los índices de los eventos codificados.
+    
+    Args:
+        catalogo: Objeto Catalogo
+        
+    Returns:
+        Arreglo de bytes con la huella
+    """
+    identificadores = (
+        [p.id for p in catalogo.profesores],
+        [(ms.materia.id, ms.seccion) for ms in catalogo.materias_secciones],
+        [s.id for s in catalogo.salas]
+    )
+    return np.frombuffer(hashlib.sha256(repr(identificadores).encode()).digest(), dtype=np.uint8)
+
+
+def guardar_checkpoint(ruta, ga):
+    """
+    Guarda el estado de un GeneticAlgorithm en un archivo .npz sin comprimir.
+    Los individuos se guardan como eventos codificados (ver Catalogo), no como
+    objetos serializados con pickle. El archivo se escribe primero en una ruta
+    temporal y después se renombra, de modo que un fallo durante la escritura
+    no deja un punto de control corrupto.
+    
+    Args:
+        ruta: Ruta del archivo .npz
+        ga: Objeto GeneticAlgorithm con la población evaluada
+    """
+    catalogo = ga.catalogo
+    
+    codificados = [horario.codificar(catalogo) for horario in ga.poblacion]
+    eventos = (np.concatenate(codificados) if codificados
+               else np.empty((0, NUM_COLUMNAS), dtype=catalogo.dtype))
+    longitudes = np.array([len(c) for c in codificados], dtype=np.int64)
+    
+    mejor = (ga.mejor_individuo.codificar(catalogo) if ga.mejor_individuo is not None
+             else np.empty((0, NUM_COLUMNAS), dtype=catalogo.dtype))
+    
+    # Estado del generador aleatorio de Python: (versión, estado interno, gauss_next)
+    version_rng, estado_rng, gauss_rng = random.getstate()
+    
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as archivo:
+        np.savez(
+            archivo,
+            version=np.array(VERSION_CHECKPOINT),
+            firma=_firma(catalogo),
+            eventos=eventos,
+            longitudes=longitudes,
+            mejor=mejor,
+            hay_mejor=np.array(ga.mejor_individuo is not None),
+            historia=np.array(ga.historia_fitness, dtype=np.float64).reshape(-1, 2),
+            generacion=np.array(ga.generacion),
+            generaciones_sin_mejora=np.array(ga.generaciones_sin_mejora),
+            version_rng=np.array(version_rng),
+            estado_rng=np.array(estado_rng, dtype=np.uint64),
+            gauss_rng=np.array(np.nan if gauss_rng is None else gauss_rng)
+        )
+    os.replace(temporal, ruta)
+
+
+def cargar_checkpoint(ruta, catalogo):
+    """
+    Lee un punto de control y reconstruye sus individuos con el catálogo dado.
+    
+    Args:
+        ruta: Ruta del archivo .npz
+        catalogo: Objeto Catalogo del problema (el mismo con el que se guardó)
+        
+    Returns:
+        Diccionario con la población (lista de Horario sin evaluar), el mejor
+        individuo, la historia de fitness, los contadores de generaciones y
+        el estado del generador aleatorio
+    """
+    with np.load(ruta) as datos:
+        if int(datos["version"]) != VERSION_CHECKPOINT:
+            raise ValueError(f"Versión de punto de control no soportada: {int(datos['version'])}")
+        if not np.array_equal(datos["firma"], _firma(catalogo)):
+            raise ValueError("El punto de control pertenece a otra instancia del problema")
+        
+        longitudes = datos["longitudes"]
+        bloques = np.split(datos["eventos"], np.cumsum(longitudes)[:-1]) if len(longitudes) else []
+        poblacion = [Horario(catalogo.decodificar(bloque)) for bloque in bloques]
+        
+        mejor = Horario(catalogo.decodificar(datos["mejor"])) if bool(datos["hay_mejor"]) else None
+        
+        historia = [(int(generacion), int(fitness) if fitness.is_integer() else float(fitness))
+                    for generacion, fitness in datos["historia"].tolist()]
+        
+        gauss = float(datos["gauss_rng"])
+        estado_rng = (int(datos["version_rng"]),
+                      tuple(int(x) for x in datos["estado_rng"]),
+                      None if np.isnan(gauss) else gauss)
+        
+        return {
+            "poblacion": poblacion,
+            "mejor_individuo": mejor,
+            "historia_fitness": historia,
+            "generacion": int(datos["generacion"]),
+            "generaciones_sin_mejora": int(datos["generaciones_sin_mejora"]),
+            "estado_rng": estado_rng
+        }
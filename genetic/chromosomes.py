@@ -6,17 +6,28 @@ Clases para la representación cromosómica en el algoritmo genético
 """
 
 import random
-import copy
+import numpy as np
 from model.evento import Evento
 from model.horario import Horario
+from model.problema import ProblemaCompilado
+from genetic.vectorized import TABLA_HUECOS
 from config import NUM_DIAS, NUM_PERIODOS
 
+# Bit de cada período del día
+BITS_PERIODO = np.left_shift(1, np.arange(NUM_PERIODOS, dtype=np.int64))
+
+# Pesos de la valoración de cada hueco libre en el generador constructivo
+PESO_HUECO = 10        # Por cada hueco nuevo en el día del profesor
+PESO_ADYACENTE = 5     # Si el profesor tiene clase en una hora contigua
+PESO_CARGA_DIA = 3     # Por cada clase del profesor ese día
+PESO_REPETIR_DIA = 4   # Por cada hora de la misma materia-sección ese día
+
 class GeneradorCromosomas:
     """
     Clase responsable de generar cromosomas iniciales para el algoritmo genético.
     """
     
-    def __init__(self, profesores, materias_secciones, salas):
+    def __init__(self, profesores, materias_secciones, salas, problema=None):
         """
         Inicializa el generador con los datos disponibles.
         
@@ -24,10 +35,62 @@ class GeneradorCromosomas:
             profesores: Lista de objetos Profesor
             materias_secciones: Lista de objetos MateriaSecciones
             salas: Lista de objetos Sala
+            problema: Objeto ProblemaCompilado con los dominios precalculados
+                      (opcional, se compila si no se indica)
         """
         self.profesores = profesores
         self.materias_secciones = materias_secciones
         self.salas = salas
+        self.problema = problema or ProblemaCompilado(profesores, materias_secciones, salas)
+    
+    def _materias_ordenadas(self, profesor_especifico_primero=False):
+        """
+        Ordena las materias-secciones para la generación. No se copian: los
+        horarios no modifican los objetos del catálogo.
+        
+        Args:
+            profesor_especifico_primero: Si es True, las que requieren profesor
+                                         específico van antes que el resto
+                                         
+        Returns:
+            Lista de tuplas (índice en el problema, materia-sección)
+        """
+        materias_secciones = self.problema.materias_secciones
+        
+        # Priorizar las que tienen más horas semanales
+        orden = sorted(range(len(materias_secciones)),
+                       key=lambda i: materias_secciones[i].materia.horas_semanales, reverse=True)
+        
+        if profesor_especifico_primero:
+            orden.sort(key=lambda i: 1 if materias_secciones[i].profesor_especifico else 0, reverse=True)
+        
+        return [(i, materias_secciones[i]) for i in orden]
+    
+    def _elegir_profesor(self, indice, ms, horario):
+        """
+        Elige el profesor para una materia-sección a partir de sus candidatos precalculados.
+        
+        Args:
+            indice: Índice de la materia-sección en el problema
+            ms: Objeto MateriaSecciones
+            horario: Objeto Horario en construcción, con las horas de cada profesor
+            
+        Returns:
+            Objeto Profesor, o None si no hay ninguno disponible
+        """
+        profesores_posibles = self.problema.profesores_seccion[indice]
+        if not profesores_posibles:
+            return None  # Profesor específico inexistente o nadie puede impartir la materia
+        
+        if ms.profesor_especifico:
+            return profesores_posibles[0]
+        
+        # Priorizar profesores con ítem que necesitan más horas (primero de la ordenación)
+        def clave(p):
+            horas = horario.horas_profesor(p.id)
+            return (p.tiene_item and horas < 14, -horas)
+        
+        return min(profesores_posibles, key=clave)
     
     def generar_aleatorio(self):
         """
@@ -38,41 +101,21 @@ class GeneradorCromosomas:
         """
         horario = Horario()
         
-        # Ordenar materias_secciones por horas semanales (priorizar las que tienen más horas)
-        materias_ordenadas = sorted(
-            copy.deepcopy(self.materias_secciones),
-            key=lambda ms: ms.materia.horas_semanales,
-            reverse=True
-        )
-        
         # Para cada materia-sección, intentar asignar todas sus horas
-        for ms in materias_ordenadas:
+        for indice, ms in self._materias_ordenadas():
             # Determinar profesor a asignar
-            if ms.profesor_especifico:
-                # Si la sección requiere un profesor específico
-                profesor = next((p for p in self.profesores if p.id == ms.profesor_especifico), None)
-                if not profesor:
-                    continue  # Saltar si no se encuentra el profesor específico
-            else:
-                # Buscar profesores que puedan impartir la materia
-                profesores_posibles = [p for p in self.profesores if p.puede_impartir(ms.materia.id)]
-                if not profesores_posibles:
-                    continue  # Saltar si no hay profesores disponibles
-                
-                # Priorizar profesores con ítem que necesitan más horas
-                profesores_posibles.sort(key=lambda p: (p.tiene_item and p.horas_asignadas < 14, -p.horas_asignadas))
-                profesor = profesores_posibles[0]
+            profesor = self._elegir_profesor(indice, ms, horario)
+            if not profesor:
+                continue  # Saltar si no hay profesor disponible
             
-            # Buscar salas adecuadas
-            salas_posibles = [s for s in self.salas 
-                             if s.es_adecuada_para_nivel(ms.materia.nivel) 
-                             and s.tiene_equipamiento(ms.materia.requiere_equipamiento)]
+            # Salas adecuadas precalculadas
+            salas_posibles = self.problema.salas_seccion[indice]
             
             if not salas_posibles:
                 continue  # Saltar si no hay salas adecuadas
             
             # Intentar asignar todas las horas requeridas
-            horas_pendientes = ms.horas_pendientes()
+            horas_pendientes = int(self.problema.horas_seccion[indice])
             intentos = 0
             max_intentos = 100  # Límite para evitar bucles infinitos
             
@@ -85,7 +128,7 @@ class GeneradorCromosomas:
                 hora = random.randint(0, NUM_PERIODOS - 1)
                 
                 # Verificar disponibilidad del profesor
-                if not profesor.esta_disponible(dia, hora):
+                if not self.problema.esta_disponible(profesor.id, dia, hora):
                     intentos += 1
                     continue
                 
@@ -109,38 +152,16 @@ class GeneradorCromosomas:
         """
         horario = Horario()
         
-        # Ordenar materias_secciones por horas semanales (priorizar las que tienen más horas)
-        materias_ordenadas = sorted(
-            copy.deepcopy(self.materias_secciones),
-            key=lambda ms: ms.materia.horas_semanales,
-            reverse=True
-        )
-        
-        # Priorizar las materias que requieren profesor específico
-        materias_ordenadas.sort(key=lambda ms: 1 if ms.profesor_especifico else 0, reverse=True)
-        
         # Para cada materia-sección, intentar asignar todas sus horas
-        for ms in materias_ordenadas:
+        # (primero las que requieren profesor específico)
+        for indice, ms in self._materias_ordenadas(profesor_especifico_primero=True):
             # Determinar profesor a asignar
-            if ms.profesor_especifico:
-                # Si la sección requiere un profesor específico
-                profesor = next((p for p in self.profesores if p.id == ms.profesor_especifico), None)
-                if not profesor:
-                    continue  # Saltar si no se encuentra el profesor específico
-            else:
-                # Buscar profesores que puedan impartir la materia
-                profesores_posibles = [p for p in self.profesores if p.puede_impartir(ms.materia.id)]
-                if not profesores_posibles:
-                    continue  # Saltar si no hay profesores disponibles
-                
-                # Priorizar profesores con ítem que necesitan más horas
-                profesores_posibles.sort(key=lambda p: (p.tiene_item and p.horas_asignadas < 14, -p.horas_asignadas))
-                profesor = profesores_posibles[0]
+            profesor = self._elegir_profesor(indice, ms, horario)
+            if not profesor:
+                continue  # Saltar si no hay profesor disponible
             
-            # Buscar salas adecuadas
-            salas_posibles = [s for s in self.salas 
-                             if s.es_adecuada_para_nivel(ms.materia.nivel) 
-                             and s.tiene_equipamiento(ms.materia.requiere_equipamiento)]
+            # Salas adecuadas precalculadas
+            salas_posibles = self.problema.salas_seccion[indice]
             
             if not salas_posibles:
                 continue  # Saltar si no hay salas adecuadas
@@ -149,7 +170,7 @@ class GeneradorCromosomas:
             matriz_profesor = horario.obtener_matriz_horario('profesor', profesor.id)
             
             # Intentar asignar todas las horas requeridas
-            horas_pendientes = ms.horas_pendientes()
+            horas_pendientes = int(self.problema.horas_seccion[indice])
             max_intentos_por_hora = 50
             
             while horas_pendientes > 0:
@@ -172,7 +193,7 @@ class GeneradorCromosomas:
                         
                         for hora in horas_candidatas:
                             # Verificar si el profesor está disponible
-                            if not profesor.esta_disponible(dia, hora):
+                            if not self.problema.esta_disponible(profesor.id, dia, hora):
                                 continue
                             
                             # Crear evento candidato
@@ -227,4 +248,182 @@ class GeneradorCromosomas:
                     # Si no se encontró un evento adecuado tras los intentos, desistir
                     horas_pendientes -= 1
         
-        return horario
\ No newline at end of file
+        return horario
+    
+    def generar_constructivo(self):
+        """
+        Genera un horario de forma constructiva y voraz. Las materias-secciones
+        se colocan de la más restringida (menos profesores y salas posibles) a la
+        menos restringida, y cada hora se asigna al mejor hueco libre, valorando
+        todos los huecos de la semana a la vez sobre máscaras de ocupación.
+        No copia las materias-secciones ni modifica sus contadores.
+        
+        Returns:
+            Objeto Horario sin conflictos de profesor, sala ni grupo
+        """
+        problema = self.problema
+        rng = np.random.default_rng(random.getrandbits(32))
+        
+        # Ocupación como máscara de bits por entidad y día
+        ocupacion_profesor = np.zeros((len(problema.profesores), NUM_DIAS), dtype=np.int64)
+        ocupacion_sala = np.zeros((len(problema.salas), NUM_DIAS), dtype=np.int64)
+        ocupacion_grupo = np.zeros((len(problema.grupos), NUM_DIAS), dtype=np.int64)
+        carga_profesor = np.zeros((len(problema.profesores), NUM_DIAS), dtype=np.int64)
+        horas_profesor = np.zeros(len(problema.profesores), dtype=np.int64)
+        disponibilidad = problema.disponibilidad_profesor.astype(np.int64)
+        
+        eventos = []
+        
+        for indice in self._orden_mas_restringido(rng):
+            salas = problema.indices_salas_seccion[indice]
+            candidatos = problema.indices_profesores_seccion[indice]
+            if not len(salas) or not len(candidatos):
+                continue  # Sin salas adecuadas o sin profesor posible
+            
+            grupo = problema.grupo_seccion[indice]
+            horas = problema.horas_seccion[indice]
+            carga_seccion = np.zeros(NUM_DIAS, dtype=np.int64)
+            
+            # Candidatos en orden de preferencia, descartando los que no tienen ningún
+            # hueco compatible con el grupo; primero los que pueden cubrir todas las horas
+            orden = self._orden_profesores_constructivo(candidatos, horas_profesor, rng)
+            num_huecos = self._huecos_libres(orden, grupo, salas, disponibilidad, ocupacion_profesor,
+                                             ocupacion_sala, ocupacion_grupo).sum(axis=(1, 2))
+            posibles = np.concatenate((orden[num_huecos >= horas],
+                                       orden[(num_huecos > 0) & (num_huecos < horas)]))
+            posicion = 0
+            
+            for _ in range(horas):
+                # Huecos del profesor actual o, si ya no le quedan, del siguiente candidato
+                while posicion < len(posibles):
+                    profesor = posibles[posicion]
+                    huecos_libres = self._huecos_libres(posibles[posicion:posicion + 1], grupo, salas,
+                                                        disponibilidad, ocupacion_profesor,
+                                                        ocupacion_sala, ocupacion_grupo)[0]
+                    if huecos_libres.any():
+                        break
+                    posicion += 1
+                else:
+                    break  # Ningún candidato tiene huecos para esta materia-sección
+                
+                dia, hora = self._mejor_hueco(huecos_libres, ocupacion_profesor[profesor],
+                                              carga_profesor[profesor], carga_seccion, rng)
+                bit = 1 << hora
+                
+                # Elegir una sala adecuada libre en ese día y hora
+                salas_libres = salas[(ocupacion_sala[salas, dia] & bit) == 0]
+                sala = salas_libres[rng.integers(len(salas_libres))]
+                
+                # Registrar el evento y actualizar la ocupación
+                eventos.append(Evento(problema.profesores[profesor], problema.materias_secciones[indice],
+                                      problema.salas[sala], dia, hora))
+                ocupacion_profesor[profesor, dia] |= bit
+                ocupacion_sala[sala, dia] |= bit
+                ocupacion_grupo[grupo, dia] |= bit
+                carga_profesor[profesor, dia] += 1
+                carga_seccion[dia] += 1
+                horas_profesor[profesor] += 1
+        
+        return Horario(eventos)
+    
+    def _orden_mas_restringido(self, rng):
+        """
+        Ordena las materias-secciones de la más restringida a la menos restringida:
+        menos profesores candidatos, menos salas adecuadas y más horas por asignar.
+        Los empates se rompen al azar para diversificar la población.
+        
+        Args:
+            rng: Generador aleatorio de NumPy
+            
+        Returns:
+            Lista de índices de materias-secciones
+        """
+        problema = self.problema
+        desempate = rng.random(len(problema.materias_secciones))
+        return sorted(range(len(problema.materias_secciones)),
+                      key=lambda i: (len(problema.indices_profesores_seccion[i]),
+                                     len(problema.indices_salas_seccion[i]),
+                                     -problema.horas_seccion[i],
+                                     desempate[i]))
+    
+    def _orden_profesores_constructivo(self, candidatos, horas_profesor, rng):
+        """
+        Ordena los profesores candidatos de una materia-sección en el generador
+        constructivo. Se concentran las horas en los profesores con ítem que ya
+        tienen clases y no llegan a las horas mínimas; después van los profesores
+        sin ítem, los que ya cumplen el mínimo y, por último, los que aún no tienen
+        clases, porque solo cuentan para el mínimo los profesores que aparecen.
+        Fuera del primer grupo se prefieren los profesores con menos horas.
+        
+        Args:
+            candidatos: Arreglo de índices de los profesores candidatos
+            horas_profesor: Arreglo con las horas asignadas a cada profesor en este horario
+            rng: Generador aleatorio de NumPy
+            
+        Returns:
+            Arreglo con los índices de los candidatos, del preferido al menos preferido
+        """
+        con_item = self.problema.profesor_con_item[candidatos]
+        horas = horas_profesor[candidatos]
+        prioridad = np.select([con_item & (horas > 0) & (horas < 14), ~con_item, horas >= 14],
+                              [0, 1, 2], default=3)
+        
+        # Orden lexicográfico: prioridad, horas (más en el primer grupo, menos en el resto), desempate
+        orden = np.lexsort((rng.random(len(candidatos)), np.where(prioridad == 0, -horas, horas),
+                            prioridad))
+        return candidatos[orden]
+    
+    def _huecos_libres(self, profesores, grupo, salas, disponibilidad, ocupacion_profesor,
+                       ocupacion_sala, ocupacion_grupo):
+        """
+        Calcula los huecos en que cada profesor podría dar una clase al grupo:
+        profesor disponible y libre, grupo libre y alguna sala adecuada libre.
+        
+        Args:
+            profesores: Arreglo de índices de profesores
+            grupo: Índice del grupo
+            salas: Arreglo de índices de las salas adecuadas
+            disponibilidad: Máscaras de disponibilidad por profesor y día
+            ocupacion_profesor: Máscaras de ocupación por profesor y día
+            ocupacion_sala: Máscaras de ocupación por sala y día
+            ocupacion_grupo: Máscaras de ocupación por grupo y día
+            
+        Returns:
+            Matriz booleana len(profesores) x NUM_DIAS x NUM_PERIODOS
+        """
+        sala_libre = np.bitwise_or.reduce(~ocupacion_sala[salas], axis=0)
+        libres = (disponibilidad[profesores] & ~ocupacion_profesor[profesores] &
+                  ~ocupacion_grupo[grupo] & sala_libre)
+        return (libres[:, :, None] & BITS_PERIODO) != 0
+    
+    def _mejor_hueco(self, huecos_libres, ocupacion, carga_dia, carga_seccion, rng):
+        """
+        Valora todos los huecos libres de la semana a la vez y devuelve el mejor.
+        
+        Args:
+            huecos_libres: Matriz booleana NUM_DIAS x NUM_PERIODOS de huecos válidos
+            ocupacion: Máscara de horas ocupadas del profesor en cada día
+            carga_dia: Clases del profesor en cada día
+            carga_seccion: Horas de la materia-sección en cada día
+            rng: Generador aleatorio de NumPy
+            
+        Returns:
+            Tupla (día, hora) del hueco elegido
+        """
+        valoracion = rng.random(huecos_libres.shape)
+        
+        # Penalizar los huecos nuevos que crearía la clase en el día del profesor
+        if TABLA_HUECOS is not None:
+            nuevas = ocupacion[:, None] | BITS_PERIODO
+            valoracion -= PESO_HUECO * (TABLA_HUECOS[nuevas] - TABLA_HUECOS[ocupacion][:, None])
+        
+        # Favorecer clases contiguas a otras del profesor
+        contiguas = (ocupacion << 1) | (ocupacion >> 1)
+        valoracion += PESO_ADYACENTE * ((contiguas[:, None] & BITS_PERIODO) != 0)
+        
+        # Favorecer distribución uniforme a lo largo de la semana
+        valoracion -= (PESO_CARGA_DIA * carga_dia + PESO_REPETIR_DIA * carga_seccion)[:, None]
+        
+        valoracion[~huecos_libres] = -np.inf
+        dia, hora = np.unravel_index(np.argmax(valoracion), valoracion.shape)
+        return int(dia), int(hora)
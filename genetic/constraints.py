@@ -5,11 +5,64 @@
 Restricciones para el problema de timetabling
 """
 
+from math import fsum, sqrt
+import numpy as np
+from model.catalogo import COL_PROFESOR, COL_SECCION, COL_SALA, COL_DIA, COL_HORA
+from genetic.vectorized import (
+    contar_choques_lote, contar_por_individuo, huecos_lote, carga_diaria_lote
+)
+from config import NUM_PERIODOS
+
+def _ajustes(movimientos, clave):
+    """
+    Calcula cuántos eventos ganaría o perdería cada clave si se aplicaran los movimientos.
+    
+    Args:
+        movimientos: Lista de tuplas (evento, dia, hora, sala) con la nueva ubicación de cada evento
+        clave: Función (evento, dia, hora, sala) -> clave de agrupación
+        
+    Returns:
+        Diccionario clave -> cambio en el número de eventos
+    """
+    ajustes = {}
+    for evento, dia, hora, sala in movimientos:
+        antes = clave(evento, evento.dia, evento.hora, evento.sala)
+        despues = clave(evento, dia, hora, sala)
+        if antes != despues:
+            ajustes[antes] = ajustes.get(antes, 0) - 1
+            ajustes[despues] = ajustes.get(despues, 0) + 1
+    return ajustes
+
+
+def _delta_choques(ocupacion, ajustes):
+    """
+    Calcula el cambio en el número de choques dados los ajustes de ocupación.
+    
+    Args:
+        ocupacion: Función (*clave) -> número actual de eventos con esa clave
+        ajustes: Diccionario clave -> cambio en el número de eventos
+        
+    Returns:
+        Cambio en el número de conflictos
+    """
+    delta = 0
+    for clave, ajuste in ajustes.items():
+        actual = ocupacion(*clave)
+        delta += max(0, actual + ajuste - 1) - max(0, actual - 1)
+    return delta
+
+
 class Restriccion:
     """
     Clase base para las restricciones del problema.
     """
     
+    # Indica si la restricción implementa evaluar_lote sobre eventos codificados
+    vectorizada = False
+    
+    # Indica si la restricción implementa delta para movimientos de eventos
+    incremental = False
+    
     def __init__(self, peso):
         """
         Inicializa una restricción con un peso asociado.
@@ -30,6 +83,107 @@ class Restriccion:
             Número de violaciones de la restricción (0 si se cumple completamente)
         """
         raise NotImplementedError("Método no implementado en clase base")
+    
+    def evaluar_codificado(self, eventos, catalogo):
+        """
+        Evalúa la restricción sobre los eventos codificados de un horario.
+        Solo disponible en las restricciones con vectorizada = True.
+        
+        Args:
+            eventos: Arreglo de eventos codificados (ver Catalogo)
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Número de violaciones de la restricción (igual que evaluar)
+        """
+        return self.a_violaciones(self.medir_codificado(eventos, catalogo))
+    
+    def medir(self, horario):
+        """
+        Calcula la medida de la que se derivan las violaciones. Coincide con
+        evaluar salvo en las restricciones cuya medida es continua.
+        
+        Args:
+            horario: Objeto Horario a evaluar
+            
+        Returns:
+            Medida de la restricción
+        """
+        return self.evaluar(horario)
+    
+    def a_violaciones(self, medida):
+        """
+        Convierte una medida en número de violaciones.
+        
+        Args:
+            medida: Valor devuelto por medir
+            
+        Returns:
+            Número de violaciones de la restricción
+        """
+        return medida
+    
+    def medir_codificado(self, eventos, catalogo):
+        """
+        Calcula la medida de la restricción sobre los eventos codificados de un horario.
+        
+        Args:
+            eventos: Arreglo de eventos codificados (ver Catalogo)
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Medida de la restricción
+        """
+        individuos = np.zeros(len(eventos), dtype=np.int64)
+        return self.medir_lote(eventos, individuos, 1, catalogo).tolist()[0]
+    
+    def medir_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Calcula la medida de la restricción para varios horarios a la vez.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con la medida de cada horario
+        """
+        return self.evaluar_lote(eventos, individuos, num_individuos, catalogo)
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Evalúa la restricción sobre los eventos codificados de varios horarios a la vez.
+        Solo disponible en las restricciones con vectorizada = True.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de violaciones de cada horario
+        """
+        raise NotImplementedError("Método no implementado en clase base")
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en la medida de la restricción que producirían los
+        movimientos, sin modificar el horario. Los movimientos solo cambian el
+        día, la hora y la sala de los eventos.
+        Solo disponible en las restricciones con incremental = True.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala) con la nueva
+                         ubicación de cada evento movido
+                         
+        Returns:
+            Cambio en la medida de la restricción
+        """
+        raise NotImplementedError("Método no implementado en clase base")
 
 
 #========================
@@ -41,6 +195,9 @@ class ProfesorNoSimultaneo(Restriccion):
     Restricción: un profesor no puede impartir dos clases simultáneamente.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta el número de conflictos de profesor en el horario.
@@ -63,6 +220,36 @@ class ProfesorNoSimultaneo(Restriccion):
         conflictos = sum(len(eventos) - 1 for eventos in eventos_profesor.values() if len(eventos) > 1)
         
         return conflictos
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Cuenta los conflictos de profesor de cada horario sobre eventos codificados.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de conflictos de cada horario
+        """
+        return contar_choques_lote(eventos[:, COL_PROFESOR], eventos[:, COL_DIA], eventos[:, COL_HORA],
+                                   individuos, num_individuos, len(catalogo.profesores))
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en los conflictos de profesor que producirían los movimientos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Cambio en el número de conflictos
+        """
+        ajustes = _ajustes(movimientos, lambda evento, dia, hora, sala: (evento.profesor.id, dia, hora))
+        return _delta_choques(horario.ocupacion_profesor, ajustes)
 
 
 class SalaNoSimultanea(Restriccion):
@@ -70,6 +257,9 @@ class SalaNoSimultanea(Restriccion):
     Restricción: una sala no puede albergar dos clases simultáneamente.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta el número de conflictos de sala en el horario.
@@ -92,6 +282,36 @@ class SalaNoSimultanea(Restriccion):
         conflictos = sum(len(eventos) - 1 for eventos in eventos_sala.values() if len(eventos) > 1)
         
         return conflictos
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Cuenta los conflictos de sala de cada horario sobre eventos codificados.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de conflictos de cada horario
+        """
+        return contar_choques_lote(eventos[:, COL_SALA], eventos[:, COL_DIA], eventos[:, COL_HORA],
+                                   individuos, num_individuos, len(catalogo.salas))
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en los conflictos de sala que producirían los movimientos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Cambio en el número de conflictos
+        """
+        ajustes = _ajustes(movimientos, lambda evento, dia, hora, sala: (sala.id, dia, hora))
+        return _delta_choques(horario.ocupacion_sala, ajustes)
 
 
 class GrupoNoSimultaneo(Restriccion):
@@ -99,6 +319,9 @@ class GrupoNoSimultaneo(Restriccion):
     Restricción: un grupo/sección no puede asistir a dos clases simultáneamente.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta el número de conflictos de grupo/sección en el horario.
@@ -121,6 +344,36 @@ class GrupoNoSimultaneo(Restriccion):
         conflictos = sum(len(eventos) - 1 for eventos in eventos_seccion.values() if len(eventos) > 1)
         
         return conflictos
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Cuenta los conflictos de grupo/sección de cada horario sobre eventos codificados.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de conflictos de cada horario
+        """
+        return contar_choques_lote(catalogo.grupo_seccion[eventos[:, COL_SECCION]], eventos[:, COL_DIA], eventos[:, COL_HORA],
+                                   individuos, num_individuos, len(catalogo.grupos))
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en los conflictos de grupo/sección que producirían los movimientos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Cambio en el número de conflictos
+        """
+        ajustes = _ajustes(movimientos, lambda evento, dia, hora, sala: (evento.materia_seccion.seccion, dia, hora))
+        return _delta_choques(horario.ocupacion_grupo, ajustes)
 
 
 class ProfesorMinHoras(Restriccion):
@@ -128,6 +381,9 @@ class ProfesorMinHoras(Restriccion):
     Restricción: profesores con ítem deben tener al menos 14 horas asignadas.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta la diferencia entre las horas asignadas y las 14 horas mínimas
@@ -157,6 +413,46 @@ class ProfesorMinHoras(Restriccion):
                 violaciones += (14 - horas)
         
         return violaciones
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Suma las horas faltantes de los profesores con ítem de cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con las horas faltantes de cada horario
+        """
+        num_profesores = len(catalogo.profesores)
+        
+        # Horas por (individuo, profesor)
+        claves = individuos.astype(np.int64) * num_profesores + eventos[:, COL_PROFESOR]
+        horas = np.bincount(claves, minlength=num_individuos * num_profesores)
+        horas = horas.reshape(num_individuos, num_profesores)
+        
+        # Solo cuentan los profesores con ítem que aparecen en el horario
+        evaluados = (horas > 0) & catalogo.profesor_con_item
+        faltantes = np.where(evaluados, np.maximum(0, 14 - horas), 0)
+        
+        return faltantes.sum(axis=1)
+    
+    def delta(self, horario, movimientos):
+        """
+        Los movimientos no cambian el profesor de los eventos, por lo que
+        las horas de cada profesor no varían.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            0
+        """
+        return 0
 
 
 class SalaNivelCorrecto(Restriccion):
@@ -165,6 +461,9 @@ class SalaNivelCorrecto(Restriccion):
     para clases de nivel infantil y viceversa.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta el número de asignaciones incorrectas de sala según nivel.
@@ -189,6 +488,62 @@ class SalaNivelCorrecto(Restriccion):
                 violaciones += 1
         
         return violaciones
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Cuenta las asignaciones incorrectas de sala según nivel en cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de asignaciones incorrectas de cada horario
+        """
+        sala_infantil = catalogo.sala_infantil[eventos[:, COL_SALA]]
+        materia_infantil = catalogo.seccion_infantil[eventos[:, COL_SECCION]]
+        
+        # Sala infantil con materia de otro nivel, o materia infantil fuera de sala infantil
+        incorrectas = sala_infantil != materia_infantil
+        
+        return contar_por_individuo(incorrectas, individuos, num_individuos)
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en las asignaciones incorrectas de sala que producirían los movimientos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Cambio en el número de asignaciones incorrectas
+        """
+        delta = 0
+        for evento, dia, hora, sala in movimientos:
+            nivel_materia = evento.materia_seccion.materia.nivel
+            delta += self._incorrecta(nivel_materia, sala.nivel) - self._incorrecta(nivel_materia, evento.sala.nivel)
+        return delta
+    
+    @staticmethod
+    def _incorrecta(nivel_materia, nivel_sala):
+        """
+        Verifica si una combinación de niveles de materia y sala es incorrecta.
+        
+        Args:
+            nivel_materia: Nivel de la materia
+            nivel_sala: Nivel de la sala
+            
+        Returns:
+            1 si la asignación es incorrecta, 0 en caso contrario
+        """
+        if nivel_sala == "infantil" and nivel_materia != "infantil":
+            return 1
+        if nivel_materia == "infantil" and nivel_sala != "infantil":
+            return 1
+        return 0
 
 
 class AsignacionEspecifica(Restriccion):
@@ -197,6 +552,9 @@ class AsignacionEspecifica(Restriccion):
     de una materia si la sección así lo desea.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Cuenta el número de asignaciones que no respetan las asignaciones
@@ -218,6 +576,111 @@ class AsignacionEspecifica(Restriccion):
                     violaciones += 1
         
         return violaciones
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Cuenta las asignaciones que no respetan al profesor específico en cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número de asignaciones incorrectas de cada horario
+        """
+        requerido = catalogo.seccion_profesor_especifico[eventos[:, COL_SECCION]]
+        incorrectas = (requerido != catalogo.SIN_PROFESOR) & (requerido != eventos[:, COL_PROFESOR])
+        
+        return contar_por_individuo(incorrectas, individuos, num_individuos)
+    
+    def delta(self, horario, movimientos):
+        """
+        Los movimientos no cambian el profesor de los eventos, por lo que
+        las asignaciones específicas no varían.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            0
+        """
+        return 0
+
+
+class HorasCompletas(Restriccion):
+    """
+    Restricción: cada materia-sección debe recibir todas sus horas semanales.
+    Sin ella, un horario puede mejorar su fitness eliminando eventos.
+    """
+    
+    vectorizada = True
+    incremental = True
+    
+    def __init__(self, peso, materias_secciones):
+        """
+        Inicializa la restricción.
+        
+        Args:
+            peso: Peso numérico que indica la importancia de la restricción
+            materias_secciones: Lista de objetos MateriaSecciones que deben cubrirse;
+                                debe coincidir con la del catálogo que usa evaluar_lote
+        """
+        super().__init__(peso)
+        self.materias_secciones = materias_secciones
+    
+    def evaluar(self, horario):
+        """
+        Cuenta las horas semanales que faltan por asignar.
+        
+        Args:
+            horario: Objeto Horario a evaluar
+            
+        Returns:
+            Suma de horas faltantes de todas las materias-secciones
+        """
+        return sum(max(0, ms.materia.horas_semanales - horario.horas_materia_seccion(ms))
+                   for ms in self.materias_secciones)
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Suma las horas faltantes de todas las materias-secciones del catálogo en cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con las horas faltantes de cada horario
+        """
+        num_secciones = len(catalogo.materias_secciones)
+        
+        # Horas por (individuo, materia-sección)
+        claves = individuos.astype(np.int64) * num_secciones + eventos[:, COL_SECCION]
+        horas = np.bincount(claves, minlength=num_individuos * num_secciones)
+        horas = horas.reshape(num_individuos, num_secciones)
+        
+        faltantes = np.maximum(0, catalogo.horas_requeridas - horas)
+        
+        return faltantes.sum(axis=1)
+    
+    def delta(self, horario, movimientos):
+        """
+        Los movimientos no cambian la materia-sección de los eventos, por lo que
+        las horas de cada materia-sección no varían.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            0
+        """
+        return 0
 
 
 #========================
@@ -229,6 +692,9 @@ class MinimizarHuecos(Restriccion):
     Restricción blanda: minimizar los "huecos" en los horarios de los profesores.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Calcula el número total de huecos en los horarios de los profesores.
@@ -250,6 +716,60 @@ class MinimizarHuecos(Restriccion):
             total_huecos += horario.obtener_huecos_profesor(prof_id)
         
         return total_huecos
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Calcula el número total de huecos de los profesores en cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con el número total de huecos de cada horario
+        """
+        return huecos_lote(eventos[:, COL_PROFESOR], eventos[:, COL_DIA], eventos[:, COL_HORA],
+                           individuos, num_individuos, len(catalogo.profesores))
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en los huecos de los profesores que producirían los movimientos.
+        Solo se recalculan los días afectados de los profesores movidos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Cambio en el número total de huecos
+        """
+        ajustes = _ajustes(movimientos, lambda evento, dia, hora, sala: (evento.profesor.id, dia, hora))
+        
+        delta = 0
+        for prof_id, dia in {(prof_id, dia) for prof_id, dia, _ in ajustes}:
+            antes = [horario.ocupacion_profesor(prof_id, dia, hora) for hora in range(NUM_PERIODOS)]
+            despues = [conteo + ajustes.get((prof_id, dia, hora), 0) for hora, conteo in enumerate(antes)]
+            delta += self._huecos_dia(despues) - self._huecos_dia(antes)
+        
+        return delta
+    
+    @staticmethod
+    def _huecos_dia(eventos_por_hora):
+        """
+        Calcula los huecos de un día a partir del número de eventos en cada hora.
+        
+        Args:
+            eventos_por_hora: Lista con el número de eventos en cada período del día
+            
+        Returns:
+            Número de huecos del día
+        """
+        ocupadas = [hora for hora, conteo in enumerate(eventos_por_hora) if conteo > 0]
+        if not ocupadas:
+            return 0
+        return ocupadas[-1] - ocupadas[0] + 1 - len(ocupadas)
 
 
 class DistribucionEquilibrada(Restriccion):
@@ -257,6 +777,9 @@ class DistribucionEquilibrada(Restriccion):
     Restricción blanda: distribuir equilibradamente las clases a lo largo de la semana.
     """
     
+    vectorizada = True
+    incremental = True
+    
     def evaluar(self, horario):
         """
         Calcula el desequilibrio en la distribución de clases por día.
@@ -267,33 +790,129 @@ class DistribucionEquilibrada(Restriccion):
         Returns:
             Medida del desequilibrio (desviación estándar de clases por día)
         """
-        from math import sqrt
+        return self.a_violaciones(self.medir(horario))
+    
+    def medir(self, horario):
+        """
+        Calcula la suma de las desviaciones estándar de clases por día de cada profesor.
         
+        Args:
+            horario: Objeto Horario a evaluar
+            
+        Returns:
+            Suma de desviaciones (float)
+        """
         # Obtener todos los profesores únicos
         profesores = {evento.profesor.id for evento in horario.eventos}
         
-        total_desequilibrio = 0
+        desviaciones = []
         
         # Calcular desequilibrio para cada profesor
         for prof_id in profesores:
-            # Contar eventos por día para este profesor
-            eventos_por_dia = [0] * 5  # 5 días a la semana
+            # Eventos por día de este profesor, mantenidos por el propio horario
+            eventos_por_dia = [horario.carga_profesor(prof_id, dia) for dia in range(5)]  # 5 días a la semana
             
-            for evento in horario.eventos:
-                if evento.profesor.id == prof_id:
-                    eventos_por_dia[evento.dia] += 1
+            desviaciones.append(self._desviacion(eventos_por_dia))
+        
+        # Suma exacta: el resultado no depende del orden de los profesores
+        return fsum(desviaciones)
+    
+    def a_violaciones(self, medida):
+        """
+        Convierte la suma de desviaciones en violaciones.
+        
+        Args:
+            medida: Suma de desviaciones
             
-            # Calcular promedio
-            total_eventos = sum(eventos_por_dia)
-            if total_eventos == 0:
-                continue
-                
-            promedio = total_eventos / 5
+        Returns:
+            Medida del desequilibrio como entero
+        """
+        # Multiplicar por 10 para dar más peso. La tolerancia absorbe el error de
+        # redondeo acumulado al actualizar la medida con deltas.
+        return int(medida * 10 + 1e-9)
+    
+    @staticmethod
+    def _desviacion(eventos_por_dia):
+        """
+        Calcula la desviación estándar de clases por día de un profesor.
+        
+        Args:
+            eventos_por_dia: Lista con el número de eventos de cada día
+            
+        Returns:
+            Desviación estándar (0 si el profesor no tiene eventos)
+        """
+        # Calcular promedio
+        total_eventos = sum(eventos_por_dia)
+        if total_eventos == 0:
+            return 0.0
+        
+        promedio = total_eventos / 5
+        
+        # Calcular desequilibrio (desviación estándar)
+        suma_cuadrados = sum((dia - promedio) ** 2 for dia in eventos_por_dia)
+        return sqrt(suma_cuadrados / 5)
+    
+    def evaluar_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Calcula el desequilibrio en la distribución de clases por día de cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
+            
+        Returns:
+            Arreglo con la medida de desequilibrio de cada horario
+        """
+        medidas = self.medir_lote(eventos, individuos, num_individuos, catalogo)
+        return np.array([self.a_violaciones(m) for m in medidas.tolist()], dtype=np.int64)
+    
+    def medir_lote(self, eventos, individuos, num_individuos, catalogo):
+        """
+        Calcula la suma de desviaciones de cada horario.
+        
+        Args:
+            eventos: Arreglo con los eventos codificados de todos los horarios
+            individuos: Arreglo con el índice del horario al que pertenece cada evento
+            num_individuos: Número de horarios del lote
+            catalogo: Objeto Catalogo con el que se codificaron los eventos
             
-            # Calcular desequilibrio (desviación estándar)
-            suma_cuadrados = sum((dia - promedio) ** 2 for dia in eventos_por_dia)
-            desviacion = sqrt(suma_cuadrados / 5)
+        Returns:
+            Arreglo con la suma de desviaciones (float) de cada horario
+        """
+        num_dias = 5  # 5 días a la semana
+        
+        eventos_por_dia = carga_diaria_lote(eventos[:, COL_PROFESOR], eventos[:, COL_DIA],
+                                            individuos, num_individuos, len(catalogo.profesores))
+        
+        # Desviación estándar de clases por día de cada (individuo, profesor)
+        promedio = eventos_por_dia.sum(axis=2, keepdims=True) / num_dias
+        suma_cuadrados = ((eventos_por_dia - promedio) ** 2).sum(axis=2)
+        desviaciones = np.sqrt(suma_cuadrados / num_dias)
+        
+        # Los profesores sin eventos tienen desviación 0 y no alteran la suma
+        return np.array([fsum(fila) for fila in desviaciones.tolist()])
+    
+    def delta(self, horario, movimientos):
+        """
+        Calcula el cambio en la suma de desviaciones que producirían los movimientos.
+        Solo se recalculan los profesores movidos.
+        
+        Args:
+            horario: Objeto Horario en su estado actual
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
             
-            total_desequilibrio += desviacion
+        Returns:
+            Cambio en la medida de desequilibrio
+        """
+        ajustes = _ajustes(movimientos, lambda evento, dia, hora, sala: (evento.profesor.id, dia))
+        
+        delta = 0.0
+        for prof_id in {prof_id for prof_id, _ in ajustes}:
+            antes = [horario.carga_profesor(prof_id, dia) for dia in range(5)]
+            despues = [conteo + ajustes.get((prof_id, dia), 0) for dia, conteo in enumerate(antes)]
+            delta += self._desviacion(despues) - self._desviacion(antes)
         
-        return int(total_desequilibrio * 10)  # Multiplicar por 10 para dar más peso
\ No newline at end of file
+        return delta
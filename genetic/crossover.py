@@ -63,15 +63,15 @@ class CruceDias(OperadorCruce):
         # Copiar eventos según los días seleccionados
         for evento in padre1.eventos:
             if evento.dia in dias_cruce:
-                hijo2.agregar_evento(evento)
+                hijo2.agregar_evento(evento.copiar())
             else:
-                hijo1.agregar_evento(evento)
+                hijo1.agregar_evento(evento.copiar())
         
         for evento in padre2.eventos:
             if evento.dia in dias_cruce:
-                hijo1.agregar_evento(evento)
+                hijo1.agregar_evento(evento.copiar())
             else:
-                hijo2.agregar_evento(evento)
+                hijo2.agregar_evento(evento.copiar())
         
         return hijo1, hijo2
 
@@ -113,19 +113,19 @@ class CruceEventos(OperadorCruce):
         
         # Construir primer hijo: eventos seleccionados del padre2 y restantes del padre1
         for evento in eventos_seleccionados2:
-            hijo1.agregar_evento(evento)
+            hijo1.agregar_evento(evento.copiar())
         
         for evento in padre1.eventos:
             if evento.get_key() not in seleccionados1_keys:
-                hijo1.agregar_evento(evento)
+                hijo1.agregar_evento(evento.copiar())
         
         # Construir segundo hijo: eventos seleccionados del padre1 y restantes del padre2
         for evento in eventos_seleccionados1:
-            hijo2.agregar_evento(evento)
+            hijo2.agregar_evento(evento.copiar())
         
         for evento in padre2.eventos:
             if evento.get_key() not in seleccionados2_keys:
-                hijo2.agregar_evento(evento)
+                hijo2.agregar_evento(evento.copiar())
         
         return hijo1, hijo2
 
@@ -160,21 +160,21 @@ class CruceMateriasSeccion(OperadorCruce):
         
         # Seleccionar un subconjunto aleatorio para intercambiar
         num_intercambiar = random.randint(1, max(1, len(todas_materias_secciones) // 3))
-        materias_intercambiar = set(random.sample(list(todas_materias_secciones), num_intercambiar))
+        materias_intercambiar = set(random.sample(sorted(todas_materias_secciones), num_intercambiar))
         
         # Construir los hijos
         for evento in padre1.eventos:
             ms_key = (evento.materia_seccion.materia.id, evento.materia_seccion.seccion)
             if ms_key in materias_intercambiar:
-                hijo2.agregar_evento(evento)
+                hijo2.agregar_evento(evento.copiar())
             else:
-                hijo1.agregar_evento(evento)
+                hijo1.agregar_evento(evento.copiar())
         
         for evento in padre2.eventos:
             ms_key = (evento.materia_seccion.materia.id, evento.materia_seccion.seccion)
             if ms_key in materias_intercambiar:
-                hijo1.agregar_evento(evento)
+                hijo1.agregar_evento(evento.copiar())
             else:
-                hijo2.agregar_evento(evento)
+                hijo2.agregar_evento(evento.copiar())
         
         return hijo1, hijo2
\ No newline at end of file
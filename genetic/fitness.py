@@ -5,14 +5,98 @@
 Funciones de fitness para evaluar la calidad de los horarios
 """
 
+import time
+from collections import OrderedDict
+import numpy as np
 from config import BASE_FITNESS
+from genetic.vectorized import huella_eventos
+
+class CacheFitness:
+    """
+    Caché LRU de medidas de evaluación indexada por la huella del contenido
+    del horario. Evita reevaluar horarios idénticos a otros ya evaluados.
+    """
+    
+    def __init__(self, capacidad=10000):
+        """
+        Inicializa la caché.
+        
+        Args:
+            capacidad: Número máximo de horarios distintos que se recuerdan
+        """
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, clave):
+        """
+        Busca las medidas asociadas a una huella.
+        
+        Args:
+            clave: Huella del horario (ver huella_eventos)
+            
+        Returns:
+            Lista de medidas, o None si la huella no está en la caché
+        """
+        medidas = self._entradas.get(clave)
+        if medidas is None:
+            self.fallos += 1
+            return None
+        
+        # Marcar como usada recientemente
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return list(medidas)
+    
+    def guardar(self, clave, medidas):
+        """
+        Guarda las medidas de un horario, descartando la entrada menos usada
+        recientemente si se supera la capacidad.
+        
+        Args:
+            clave: Huella del horario
+            medidas: Lista de medidas del horario
+        """
+        self._entradas[clave] = tuple(medidas)
+        self._entradas.move_to_end(clave)
+        
+        while len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+    
+    @property
+    def tasa_aciertos(self):
+        """
+        Proporción de consultas resueltas por la caché (entre 0 y 1).
+        """
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+    
+    def limpiar(self):
+        """
+        Vacía la caché y reinicia sus estadísticas.
+        """
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def __len__(self):
+        """
+        Devuelve el número de horarios guardados en la caché.
+        
+        Returns:
+            Número de entradas
+        """
+        return len(self._entradas)
+
 
 class Evaluador:
     """
     Clase para evaluar la calidad de los horarios según las restricciones.
     """
     
-    def __init__(self, restricciones_duras, restricciones_blandas, base_fitness=BASE_FITNESS):
+    def __init__(self, restricciones_duras, restricciones_blandas, base_fitness=BASE_FITNESS,
+                 catalogo=None, cache=None):
         """
         Inicializa el evaluador con las restricciones configuradas.
         
@@ -20,39 +104,314 @@ class Evaluador:
             restricciones_duras: Lista de objetos Restriccion (duras)
             restricciones_blandas: Lista de objetos Restriccion (blandas)
             base_fitness: Valor base para el cálculo de fitness
+            catalogo: Objeto Catalogo para evaluar las restricciones vectorizadas
+                      sobre eventos codificados (opcional)
+            cache: Objeto CacheFitness para no reevaluar horarios repetidos
+                   (opcional, requiere catálogo)
         """
         self.restricciones_duras = restricciones_duras
         self.restricciones_blandas = restricciones_blandas
         self.base_fitness = base_fitness
+        self.catalogo = catalogo
+        self.cache = cache
+        
+        # Objeto Instrumentacion para medir el tiempo de cada restricción (opcional)
+        self.instrumentacion = None
     
-    def evaluar(self, horario):
+    def _codificar(self, horario):
         """
-        Evalúa la calidad de un horario según las restricciones.
+        Codifica el horario si alguna restricción puede aprovecharlo.
         
         Args:
+            horario: Objeto Horario a codificar
+            
+        Returns:
+            Arreglo de eventos codificados, o None si no se usará
+        """
+        if self.catalogo is None:
+            return None
+        
+        restricciones = self.restricciones_duras + self.restricciones_blandas
+        if not any(r.vectorizada for r in restricciones):
+            return None
+        
+        return horario.codificar(self.catalogo)
+    
+    def _medir(self, restriccion, horario, codificado):
+        """
+        Calcula la medida de una restricción, usando su versión vectorizada si es posible.
+        
+        Args:
+            restriccion: Objeto Restriccion a evaluar
             horario: Objeto Horario a evaluar
+            codificado: Eventos codificados del horario, o None
             
         Returns:
-            Valor numérico de fitness (mayor es mejor)
+            Medida de la restricción (ver Restriccion.medir)
         """
-        # Evaluar restricciones duras
+        if codificado is not None and restriccion.vectorizada:
+            return restriccion.medir_codificado(codificado, self.catalogo)
+        return restriccion.medir(horario)
+    
+    def _violaciones(self, restriccion, horario, codificado):
+        """
+        Evalúa una restricción, usando su versión vectorizada si es posible.
+        
+        Args:
+            restriccion: Objeto Restriccion a evaluar
+            horario: Objeto Horario a evaluar
+            codificado: Eventos codificados del horario, o None
+            
+        Returns:
+            Número de violaciones de la restricción
+        """
+        return restriccion.a_violaciones(self._medir(restriccion, horario, codificado))
+    
+    def penalizacion(self, medidas):
+        """
+        Calcula la penalización total a partir de las medidas de todas las
+        restricciones. A diferencia del fitness, no está acotada, por lo que
+        distingue entre horarios con muchas violaciones duras.
+        
+        Args:
+            medidas: Lista de medidas alineada con restricciones_duras + restricciones_blandas
+            
+        Returns:
+            Suma de violaciones por peso de todas las restricciones
+        """
+        num_duras = len(self.restricciones_duras)
+        
+        # Penalizaciones de restricciones duras
         penalizaciones_duras = 0
-        for restriccion in self.restricciones_duras:
-            violaciones = restriccion.evaluar(horario)
-            penalizaciones_duras += violaciones * restriccion.peso
+        for restriccion, medida in zip(self.restricciones_duras, medidas[:num_duras]):
+            penalizaciones_duras += restriccion.a_violaciones(medida) * restriccion.peso
         
-        # Evaluar restricciones blandas
+        # Penalizaciones de restricciones blandas
         penalizaciones_blandas = 0
-        for restriccion in self.restricciones_blandas:
-            violaciones = restriccion.evaluar(horario)
-            penalizaciones_blandas += violaciones * restriccion.peso
+        for restriccion, medida in zip(self.restricciones_blandas, medidas[num_duras:]):
+            penalizaciones_blandas += restriccion.a_violaciones(medida) * restriccion.peso
         
+        return penalizaciones_duras + penalizaciones_blandas
+    
+    def _fitness(self, medidas):
+        """
+        Calcula el fitness a partir de las medidas de todas las restricciones.
+        
+        Args:
+            medidas: Lista de medidas alineada con restricciones_duras + restricciones_blandas
+            
+        Returns:
+            Valor numérico de fitness (mayor es mejor)
+        """
         # Calcular fitness final
-        fitness = self.base_fitness - penalizaciones_duras - penalizaciones_blandas
+        fitness = self.base_fitness - self.penalizacion(medidas)
         
-        # Actualizar fitness del horario
-        horario.fitness = max(0, fitness)
+        return max(0, fitness)
+    
+    def evaluar(self, horario):
+        """
+        Evalúa la calidad de un horario según las restricciones. Las medidas de
+        cada restricción se guardan en horario.medidas para poder actualizarlas
+        después de forma incremental (ver evaluar_movimientos).
+        
+        Args:
+            horario: Objeto Horario a evaluar
+            
+        Returns:
+            Valor numérico de fitness (mayor es mejor)
+        """
+        codificado = self._codificar(horario)
+        
+        # Consultar la caché por el contenido del horario
+        clave = None
+        if self.cache is not None and self.catalogo is not None:
+            if codificado is None:
+                codificado = horario.codificar(self.catalogo)
+            clave = huella_eventos(codificado)
+            medidas = self.cache.obtener(clave)
+            if medidas is not None:
+                if self.instrumentacion is not None:
+                    self.instrumentacion.contar("evaluaciones", "cache")
+                return self.aplicar_medidas(horario, medidas)
+        
+        restricciones = self.restricciones_duras + self.restricciones_blandas
+        if self.instrumentacion is None:
+            medidas = [self._medir(restriccion, horario, codificado) for restriccion in restricciones]
+        else:
+            medidas = []
+            for restriccion in restricciones:
+                inicio = time.perf_counter()
+                medidas.append(self._medir(restriccion, horario, codificado))
+                self.instrumentacion.acumular("restriccion", type(restriccion).__name__,
+                                              time.perf_counter() - inicio)
+            self.instrumentacion.contar("evaluaciones", "completas")
+        
+        if clave is not None:
+            self.cache.guardar(clave, medidas)
+        
+        return self.aplicar_medidas(horario, medidas)
+    
+    def evaluar_poblacion(self, horarios):
+        """
+        Evalúa varios horarios a la vez. Los eventos codificados de todos los
+        horarios se apilan en un único arreglo y cada restricción vectorizada
+        se calcula para toda la población en una sola llamada.
+        
+        Args:
+            horarios: Lista de objetos Horario a evaluar
+            
+        Returns:
+            Lista con el fitness de cada horario (también se asigna a cada uno)
+        """
+        restricciones = self.restricciones_duras + self.restricciones_blandas
+        if self.catalogo is None or not any(r.vectorizada for r in restricciones):
+            return [self.evaluar(horario) for horario in horarios]
+        
+        if not horarios:
+            return []
+        
+        codificados = [horario.codificar(self.catalogo) for horario in horarios]
+        
+        if self.cache is None:
+            self._evaluar_lote(horarios, codificados)
+            return [horario.fitness for horario in horarios]
+        
+        # Resolver con la caché los horarios ya vistos y agrupar los repetidos
+        pendientes = OrderedDict()  # huella -> índices de los horarios con ese contenido
+        for i, codificado in enumerate(codificados):
+            clave = huella_eventos(codificado)
+            if clave in pendientes:
+                # Repetido dentro del lote: se evaluará una sola vez
+                self.cache.aciertos += 1
+                pendientes[clave].append(i)
+                continue
+            
+            medidas = self.cache.obtener(clave)
+            if medidas is not None:
+                self.aplicar_medidas(horarios[i], medidas)
+            else:
+                pendientes[clave] = [i]
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("evaluaciones", "cache", len(horarios) - len(pendientes))
+        
+        # Evaluar un representante de cada contenido nuevo
+        if pendientes:
+            representantes = [indices[0] for indices in pendientes.values()]
+            self._evaluar_lote([horarios[i] for i in representantes],
+                               [codificados[i] for i in representantes])
+            
+            for clave, indices in pendientes.items():
+                medidas = horarios[indices[0]].medidas
+                self.cache.guardar(clave, medidas)
+                for i in indices[1:]:
+                    self.aplicar_medidas(horarios[i], list(medidas))
+        
+        return [horario.fitness for horario in horarios]
+    
+    def _evaluar_lote(self, horarios, codificados):
+        """
+        Evalúa varios horarios con sus eventos apilados en un único arreglo.
+        
+        Args:
+            horarios: Lista de objetos Horario a evaluar
+            codificados: Lista con los eventos codificados de cada horario
+        """
+        restricciones = self.restricciones_duras + self.restricciones_blandas
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("evaluaciones", "completas", len(horarios))
+        
+        # Apilar los eventos de todos los horarios
+        eventos = np.concatenate(codificados)
+        individuos = np.repeat(np.arange(len(horarios)), [len(c) for c in codificados])
+        
+        # Una lista de medidas por restricción, con un valor por horario
+        por_restriccion = self._medidas_lote(restricciones, horarios, eventos, individuos)
+        
+        # Calcular y asignar el fitness de cada horario
+        for horario, medidas in zip(horarios, zip(*por_restriccion)):
+            self.aplicar_medidas(horario, list(medidas))
+    
+    def _medidas_lote(self, restricciones, horarios, eventos, individuos):
+        """
+        Calcula la medida de cada restricción para cada horario.
+        
+        Args:
+            restricciones: Lista de objetos Restriccion
+            horarios: Lista de objetos Horario evaluados
+            eventos: Eventos codificados de todos los horarios
+            individuos: Índice del horario al que pertenece cada evento
+            
+        Returns:
+            Lista con, para cada restricción, la lista de medidas de cada horario
+        """
+        por_restriccion = []
+        
+        for restriccion in restricciones:
+            inicio = time.perf_counter()
+            
+            if restriccion.vectorizada:
+                medidas = restriccion.medir_lote(
+                    eventos, individuos, len(horarios), self.catalogo).tolist()
+            else:
+                medidas = [restriccion.medir(horario) for horario in horarios]
+            
+            por_restriccion.append(medidas)
+            
+            if self.instrumentacion is not None:
+                self.instrumentacion.acumular("restriccion", type(restriccion).__name__,
+                                              time.perf_counter() - inicio)
+        
+        return por_restriccion
+    
+    def evaluar_movimientos(self, horario, movimientos):
+        """
+        Calcula de forma incremental las medidas que tendría el horario tras
+        mover algunos eventos, sin modificarlo. Solo se recorren los profesores,
+        salas y grupos afectados por los movimientos.
+        
+        Args:
+            horario: Objeto Horario evaluado (con horario.medidas al día)
+            movimientos: Lista de tuplas (evento, dia, hora, sala) con la nueva
+                         ubicación de cada evento movido
+                         
+        Returns:
+            Lista con las nuevas medidas, o None si el horario no tiene medidas
+            o alguna restricción no admite evaluación incremental
+        """
+        restricciones = self.restricciones_duras + self.restricciones_blandas
+        if horario.medidas is None or not all(r.incremental for r in restricciones):
+            return None
+        
+        if self.instrumentacion is None:
+            return [medida + restriccion.delta(horario, movimientos)
+                    for restriccion, medida in zip(restricciones, horario.medidas)]
+        
+        # Con instrumentación se mide el tiempo de cada delta por separado
+        medidas = []
+        for restriccion, medida in zip(restricciones, horario.medidas):
+            inicio = time.perf_counter()
+            medidas.append(medida + restriccion.delta(horario, movimientos))
+            self.instrumentacion.acumular("delta", type(restriccion).__name__,
+                                          time.perf_counter() - inicio)
+        self.instrumentacion.contar("evaluaciones", "incrementales")
         
+        return medidas
+    
+    def aplicar_medidas(self, horario, medidas):
+        """
+        Asigna al horario sus medidas y el fitness correspondiente.
+        
+        Args:
+            horario: Objeto Horario
+            medidas: Lista de medidas alineada con restricciones_duras + restricciones_blandas
+            
+        Returns:
+            Valor numérico de fitness
+        """
+        horario.medidas = medidas
+        horario.fitness = self._fitness(medidas)
         return horario.fitness
     
     def es_solucion_valida(self, horario):
@@ -66,8 +425,10 @@ class Evaluador:
             Boolean: True si no hay violaciones de restricciones duras,
                     False en caso contrario
         """
+        codificado = self._codificar(horario)
+        
         for restriccion in self.restricciones_duras:
-            if restriccion.evaluar(horario) > 0:
+            if self._violaciones(restriccion, horario, codificado) > 0:
                 return False
         
         return True
@@ -90,10 +451,12 @@ class Evaluador:
             "fitness": 0
         }
         
+        codificado = self._codificar(horario)
+        
         # Evaluar restricciones duras
         penalizaciones_duras = 0
         for restriccion in self.restricciones_duras:
-            violaciones = restriccion.evaluar(horario)
+            violaciones = self._violaciones(restriccion, horario, codificado)
             penalizacion = violaciones * restriccion.peso
             penalizaciones_duras += penalizacion
             
@@ -107,7 +470,7 @@ class Evaluador:
         # Evaluar restricciones blandas
         penalizaciones_blandas = 0
         for restriccion in self.restricciones_blandas:
-            violaciones = restriccion.evaluar(horario)
+            violaciones = self._violaciones(restriccion, horario, codificado)
             penalizacion = violaciones * restriccion.peso
             penalizaciones_blandas += penalizacion
             
@@ -125,4 +488,39 @@ class Evaluador:
         detalle["penalizacion_blandas"] = penalizaciones_blandas
         detalle["fitness"] = max(0, fitness)
         
-        return detalle
\ No newline at end of file
+        # Horas sin cubrir por materia-sección
+        if self.catalogo is not None:
+            detalle["horas_sin_cubrir"] = self.detallar_cobertura(horario)
+        
+        return detalle
+    
+    def detallar_cobertura(self, horario):
+        """
+        Detalla las materias-secciones del catálogo que no reciben todas sus
+        horas semanales, usando el contador de horas por materia-sección del horario.
+        
+        Args:
+            horario: Objeto Horario a analizar
+            
+        Returns:
+            Lista de diccionarios (materia, sección, horas requeridas, asignadas
+            y faltantes), de mayor a menor número de horas faltantes
+        """
+        if self.catalogo is None:
+            raise ValueError("El detalle de cobertura necesita un catálogo")
+        
+        cobertura = []
+        for ms in self.catalogo.materias_secciones:
+            asignadas = horario.horas_materia_seccion(ms)
+            faltantes = ms.materia.horas_semanales - asignadas
+            if faltantes > 0:
+                cobertura.append({
+                    "materia": ms.materia.nombre,
+                    "seccion": ms.seccion,
+                    "horas_requeridas": ms.materia.horas_semanales,
+                    "horas_asignadas": asignadas,
+                    "horas_faltantes": faltantes
+                })
+        
+        cobertura.sort(key=lambda fila: fila["horas_faltantes"], reverse=True)
+        return cobertura
\ No newline at end of file
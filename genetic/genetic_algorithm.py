@@ -8,9 +8,16 @@ Implementación del algoritmo genético para el problema de timetabling
 import random
 import copy
 import time
+from contextlib import nullcontext
+from model.problema import ProblemaCompilado
 from genetic.chromosomes import GeneradorCromosomas
 from genetic.crossover import CruceDias, CruceEventos, CruceMateriasSeccion
 from genetic.mutation import MutacionCambioHorario, MutacionCambioSala, MutacionIntercambio, MutacionCompuesta
+from genetic.fitness import CacheFitness
+from genetic.local_search import BusquedaLocal
+from genetic.repair import OperadorReparacion
+from genetic.checkpoint import guardar_checkpoint, cargar_checkpoint
+from genetic.parallel import EvaluadorParalelo
 from config import GA_CONFIG
 
 class GeneticAlgorithm:
@@ -20,7 +27,11 @@ class GeneticAlgorithm:
     
     def __init__(self, profesores, materias_secciones, salas, evaluador,
                 tamaño_poblacion=None, prob_cruce=None, prob_mutacion=None,
-                elitismo=None, max_generaciones=None):
+                elitismo=None, max_generaciones=None, workers=None,
+                pesos_cruce=None, pesos_mutacion=None, intervalo_busqueda_local=None,
+                individuos_busqueda_local=None, ruta_checkpoint=None, intervalo_checkpoint=None,
+                tiempo_maximo=None, callback_progreso=None, instrumentacion=None,
+                criterio_parada_fitness=None, max_generaciones_sin_mejora=None):
         """
         Inicializa el algoritmo genético.
         
@@ -34,21 +45,70 @@ class GeneticAlgorithm:
             prob_mutacion: Probabilidad de mutación
             elitismo: Número de mejores individuos que pasan directamente a la siguiente generación
             max_generaciones: Número máximo de generaciones
+            workers: Número de procesos para evaluar la población en paralelo
+                     (None o 1 para evaluar en el proceso principal)
+            pesos_cruce: Peso relativo de cada operador de cruce (CruceDias,
+                         CruceEventos, CruceMateriasSeccion); por defecto equiprobables
+            pesos_mutacion: Peso relativo de cada operador de mutación (cambio de
+                            horario, cambio de sala, intercambio); por defecto equiprobables
+            intervalo_busqueda_local: Generaciones entre aplicaciones de la búsqueda
+                                      local a los mejores individuos (0 para desactivarla)
+            individuos_busqueda_local: Número de mejores individuos a los que se aplica
+            ruta_checkpoint: Archivo .npz donde guardar puntos de control durante
+                             la ejecución (None para no guardarlos)
+            intervalo_checkpoint: Generaciones entre puntos de control
+            tiempo_maximo: Segundos disponibles para la ejecución (None sin límite).
+                           Al agotarse se devuelve el mejor horario encontrado
+            callback_progreso: Función llamada tras la población inicial y tras cada
+                               generación con (generacion, mejor_fitness, mejor_individuo);
+                               el mejor individuo no debe modificarse
+            instrumentacion: Objeto Instrumentacion que registra los tiempos y contadores
+                             de cada generación (None para no medir nada)
+            criterio_parada_fitness: Fracción del fitness base con la que se da por
+                                     encontrada la solución (float("inf") para no parar)
+            max_generaciones_sin_mejora: Generaciones sin mejora tras las que se
+                                         detiene la ejecución por estancamiento
         """
         self.profesores = profesores
         self.materias_secciones = materias_secciones
         self.salas = salas
         self.evaluador = evaluador
         
+        # Problema compilado una sola vez: catálogo de índices para la evaluación
+        # vectorizada y dominios compartidos por generadores y operadores
+        self.problema = ProblemaCompilado(profesores, materias_secciones, salas)
+        self.catalogo = self.problema
+        if self.evaluador.catalogo is None:
+            self.evaluador.catalogo = self.catalogo
+        
+        # Caché de fitness para no reevaluar horarios repetidos
+        if self.evaluador.cache is None:
+            self.evaluador.cache = CacheFitness(GA_CONFIG["tamaño_cache_fitness"])
+        
+        # Instrumentación compartida con el evaluador y los operadores de mutación
+        self.instrumentacion = instrumentacion
+        if self.instrumentacion is not None:
+            if self.instrumentacion.catalogo is None:
+                self.instrumentacion.catalogo = self.catalogo
+            self.evaluador.instrumentacion = self.instrumentacion
+        
+        # Evaluación en paralelo: mismo resultado, repartido entre varios procesos
+        self.workers = workers or 1
+        if self.workers > 1:
+            self.evaluador = EvaluadorParalelo.desde_evaluador(self.evaluador, self.workers)
+        
         # Configuración del algoritmo
         self.tamaño_poblacion = tamaño_poblacion or GA_CONFIG["tamaño_poblacion"]
         self.prob_cruce = prob_cruce or GA_CONFIG["prob_cruce"]
         self.prob_mutacion = prob_mutacion or GA_CONFIG["prob_mutacion"]
         self.elitismo = elitismo or GA_CONFIG["elitismo"]
         self.max_generaciones = max_generaciones or GA_CONFIG["max_generaciones"]
+        self.criterio_parada_fitness = criterio_parada_fitness or GA_CONFIG["criterio_parada_fitness"]
+        self.max_generaciones_sin_mejora = (max_generaciones_sin_mejora or
+                                            GA_CONFIG["generaciones_sin_mejora"])
         
         # Inicializar generador de cromosomas
-        self.generador = GeneradorCromosomas(profesores, materias_secciones, salas)
+        self.generador = GeneradorCromosomas(profesores, materias_secciones, salas, self.problema)
         
         # Inicializar operadores genéticos
         self.operadores_cruce = [
@@ -56,12 +116,36 @@ class GeneticAlgorithm:
             CruceEventos(probabilidad=self.prob_cruce),
             CruceMateriasSeccion(probabilidad=self.prob_cruce)
         ]
+        self.pesos_cruce = pesos_cruce
         
         self.operador_mutacion = MutacionCompuesta([
-            MutacionCambioHorario(probabilidad=self.prob_mutacion),
-            MutacionCambioSala(probabilidad=self.prob_mutacion / 2, salas=salas),
-            MutacionIntercambio(probabilidad=self.prob_mutacion / 2)
-        ])
+            MutacionCambioHorario(probabilidad=self.prob_mutacion, evaluador=evaluador),
+            MutacionCambioSala(probabilidad=self.prob_mutacion / 2, salas=salas, evaluador=evaluador,
+                               problema=self.problema),
+            MutacionIntercambio(probabilidad=self.prob_mutacion / 2, evaluador=evaluador)
+        ], pesos=pesos_mutacion)
+        for operador in self.operador_mutacion.operadores:
+            operador.instrumentacion = self.instrumentacion
+        
+        # Reparación de los hijos tras el cruce y la mutación
+        self.operador_reparacion = OperadorReparacion(self.problema) if GA_CONFIG["reparar_hijos"] else None
+        
+        # Búsqueda local (modo memético) sobre los mejores individuos
+        self.intervalo_busqueda_local = (intervalo_busqueda_local if intervalo_busqueda_local is not None
+                                         else GA_CONFIG["intervalo_busqueda_local"])
+        self.individuos_busqueda_local = (individuos_busqueda_local if individuos_busqueda_local is not None
+                                          else GA_CONFIG["individuos_busqueda_local"])
+        self.busqueda_local = BusquedaLocal(self.evaluador, self.problema,
+                                            estrategia=GA_CONFIG["estrategia_busqueda_local"])
+        
+        # Presupuesto de tiempo y seguimiento de la ejecución
+        self.tiempo_maximo = tiempo_maximo or GA_CONFIG["tiempo_maximo"]
+        self.callback_progreso = callback_progreso
+        self._limite = None  # Instante (time.time) en que se agota el tiempo
+        
+        # Puntos de control
+        self.ruta_checkpoint = ruta_checkpoint
+        self.intervalo_checkpoint = intervalo_checkpoint or GA_CONFIG["intervalo_checkpoint"]
         
         # Población actual
         self.poblacion = []
@@ -69,6 +153,7 @@ class GeneticAlgorithm:
         self.mejor_fitness = 0
         
         # Estadísticas
+        self.generacion = 0
         self.generaciones_sin_mejora = 0
         self.historia_fitness = []
     
@@ -77,34 +162,54 @@ class GeneticAlgorithm:
         Inicializa la población con individuos generados aleatoria y heurísticamente.
         """
         self.poblacion = []
+        self.generacion = 0
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.iniciar_generacion(0)
         
         # Generar una parte de la población de forma heurística
         num_heuristicos = max(1, self.tamaño_poblacion // 4)
+        if GA_CONFIG.get("inicializacion") == "heuristica":
+            generar, tipo = self.generador.generar_heuristico, "heuristica"
+        else:
+            generar, tipo = self.generador.generar_constructivo, "constructiva"
         for _ in range(num_heuristicos):
-            horario = self.generador.generar_heuristico()
+            with self._medir("inicializacion", tipo):
+                horario = generar()
             self.poblacion.append(horario)
+            if self._tiempo_agotado():
+                break  # Las generaciones siguientes completan la población
         
         # Generar el resto de forma aleatoria
         for _ in range(self.tamaño_poblacion - num_heuristicos):
-            horario = self.generador.generar_aleatorio()
+            if self._tiempo_agotado():
+                break
+            with self._medir("inicializacion", "aleatoria"):
+                horario = self.generador.generar_aleatorio()
             self.poblacion.append(horario)
         
         # Evaluar la población inicial
         self._evaluar_poblacion()
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.cerrar_generacion(self.poblacion)
     
     def _evaluar_poblacion(self):
         """
-        Evalúa todos los individuos de la población actual.
+        Evalúa los individuos de la población actual cuyo fitness no está al día.
+        Los individuos copiados o mutados con evaluación incremental conservan
+        sus medidas y no se vuelven a evaluar.
         """
-        for individuo in self.poblacion:
-            self.evaluador.evaluar(individuo)
+        with self._medir("evaluacion"):
+            self.evaluador.evaluar_poblacion([h for h in self.poblacion if h.modificado])
         
         # Ordenar por fitness (mayor a menor)
         self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
         
         # Actualizar mejor individuo si procede
         if self.poblacion and (not self.mejor_individuo or self.poblacion[0].fitness > self.mejor_fitness):
-            self.mejor_individuo = self.poblacion[0].clonar()
+            with self._medir("clonacion"):
+                self.mejor_individuo = self.poblacion[0].clonar()
             self.mejor_fitness = self.mejor_individuo.fitness
             self.generaciones_sin_mejora = 0
         else:
@@ -134,28 +239,191 @@ class GeneticAlgorithm:
         
         # Generar el resto mediante selección, cruce y mutación
         while len(nueva_poblacion) < self.tamaño_poblacion:
+            # Sin tiempo, el resto de la población se completa con la generación anterior
+            if self._tiempo_agotado():
+                faltan = self.tamaño_poblacion - len(nueva_poblacion)
+                nueva_poblacion.extend(self.poblacion[self.elitismo:self.elitismo + faltan])
+                break
+            
             # Seleccionar padres
-            padre1 = self._seleccion_torneo()
-            padre2 = self._seleccion_torneo()
+            with self._medir("seleccion"):
+                padre1 = self._seleccion_torneo()
+                padre2 = self._seleccion_torneo()
             
             # Aplicar cruce con cierta probabilidad
             if random.random() < self.prob_cruce:
                 # Elegir operador de cruce aleatorio
-                operador_cruce = random.choice(self.operadores_cruce)
-                hijos = operador_cruce.cruzar(padre1, padre2)
+                if self.pesos_cruce:
+                    operador_cruce = random.choices(self.operadores_cruce, weights=self.pesos_cruce)[0]
+                else:
+                    operador_cruce = random.choice(self.operadores_cruce)
+                with self._medir("cruce", type(operador_cruce).__name__):
+                    hijos = operador_cruce.cruzar(padre1, padre2)
             else:
                 # Sin cruce, los hijos son copias de los padres
-                hijos = (padre1.clonar(), padre2.clonar())
+                with self._medir("clonacion"):
+                    hijos = (padre1.clonar(), padre2.clonar())
             
             # Aplicar mutación y agregar a la nueva población
             for hijo in hijos:
                 if len(nueva_poblacion) < self.tamaño_poblacion:
                     self.operador_mutacion.mutar(hijo)
+                    if self.operador_reparacion:
+                        with self._medir("reparacion"):
+                            self.operador_reparacion.reparar(hijo)
                     nueva_poblacion.append(hijo)
         
         # Actualizar población
         self.poblacion = nueva_poblacion
     
+    def evolucionar_generacion(self):
+        """
+        Evoluciona y evalúa una generación, registrando el mejor fitness.
+        
+        Returns:
+            Número de la generación alcanzada
+        """
+        if self.instrumentacion is not None:
+            self.instrumentacion.iniciar_generacion(self.generacion + 1)
+        
+        # Mejorar a los mejores individuos antes de que pasen a la siguiente generación
+        if self.intervalo_busqueda_local and self.generacion % self.intervalo_busqueda_local == 0:
+            with self._medir("busqueda_local"):
+                self._aplicar_busqueda_local()
+        
+        # Evolucionar a siguiente generación
+        self._siguiente_generacion()
+        
+        # Evaluar nueva población
+        self._evaluar_poblacion()
+        
+        # Actualizar contador
+        self.generacion += 1
+        
+        # Guardar estado
+        self.historia_fitness.append((self.generacion, self.mejor_fitness))
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.cerrar_generacion(self.poblacion)
+        
+        return self.generacion
+    
+    def _medir(self, categoria, nombre=None):
+        """
+        Devuelve un contexto que mide el tiempo de un bloque con la instrumentación,
+        o un contexto vacío si no hay instrumentación.
+        
+        Args:
+            categoria: Categoría de la medida (p. ej. "seleccion")
+            nombre: Nombre dentro de la categoría (opcional)
+            
+        Returns:
+            Gestor de contexto
+        """
+        if self.instrumentacion is None:
+            return nullcontext()
+        return self.instrumentacion.medir(categoria, nombre)
+    
+    def _tiempo_agotado(self):
+        """
+        Indica si se ha agotado el tiempo_maximo de la ejecución en curso.
+        
+        Returns:
+            Boolean: True si hay límite de tiempo y ya se ha alcanzado
+        """
+        return self._limite is not None and time.time() >= self._limite
+    
+    def _notificar_progreso(self):
+        """
+        Comunica el mejor individuo actual a callback_progreso, si se indicó.
+        """
+        if self.callback_progreso is not None:
+            self.callback_progreso(self.generacion, self.mejor_fitness, self.mejor_individuo)
+    
+    def _aplicar_busqueda_local(self):
+        """
+        Aplica la búsqueda local a los mejores individuos de la población actual
+        (ya evaluada) y la reordena. Los individuos mejorados pasan por elitismo
+        a la siguiente generación.
+        """
+        for horario in self.poblacion[:self.individuos_busqueda_local]:
+            self.busqueda_local.mejorar(horario, limite=self._limite)
+        
+        self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
+    
+    def emigrantes(self, cantidad):
+        """
+        Selecciona los mejores individuos para migrar a otra población.
+        
+        Args:
+            cantidad: Número de individuos a migrar
+            
+        Returns:
+            Lista de copias de los mejores individuos
+        """
+        return [horario.clonar() for horario in self.poblacion[:cantidad]]
+    
+    def recibir_inmigrantes(self, inmigrantes):
+        """
+        Incorpora individuos de otra población sustituyendo a los peores.
+        
+        Args:
+            inmigrantes: Lista de objetos Horario
+        """
+        if not inmigrantes or not self.poblacion:
+            return
+        
+        inmigrantes = inmigrantes[:len(self.poblacion)]
+        self.evaluador.evaluar_poblacion([h for h in inmigrantes if h.modificado])
+        
+        # Sustituir a los peores (la población está ordenada de mayor a menor fitness)
+        self.poblacion[-len(inmigrantes):] = inmigrantes
+        self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
+        
+        # La llegada de inmigrantes no cuenta como generación: solo se
+        # actualiza el mejor individuo si alguno lo supera
+        if not self.mejor_individuo or self.poblacion[0].fitness > self.mejor_fitness:
+            self.mejor_individuo = self.poblacion[0].clonar()
+            self.mejor_fitness = self.mejor_individuo.fitness
+            self.generaciones_sin_mejora = 0
+    
+    def guardar_checkpoint(self, ruta):
+        """
+        Guarda la población, el mejor individuo, la historia de fitness y el
+        estado del generador aleatorio en un archivo .npz.
+        
+        Args:
+            ruta: Ruta del archivo .npz
+        """
+        guardar_checkpoint(ruta, self)
+    
+    def cargar_checkpoint(self, ruta):
+        """
+        Restaura el estado guardado por guardar_checkpoint y reevalúa la población.
+        
+        Args:
+            ruta: Ruta del archivo .npz
+        """
+        estado = cargar_checkpoint(ruta, self.catalogo)
+        
+        self.poblacion = estado["poblacion"]
+        self.generacion = estado["generacion"]
+        self.generaciones_sin_mejora = estado["generaciones_sin_mejora"]
+        self.historia_fitness = estado["historia_fitness"]
+        
+        # Los individuos se guardan sin medidas: se evalúan todos en un solo lote
+        self.mejor_individuo = estado["mejor_individuo"]
+        if self.mejor_individuo is not None:
+            self.evaluador.evaluar_poblacion(self.poblacion + [self.mejor_individuo])
+        else:
+            self.evaluador.evaluar_poblacion(self.poblacion)
+        self.poblacion.sort(key=lambda x: x.fitness, reverse=True)
+        self.mejor_fitness = self.mejor_individuo.fitness if self.mejor_individuo else 0
+        
+        # El generador aleatorio se restaura al final: la evaluación no lo usa,
+        # pero así la continuación es idéntica a la ejecución sin interrumpir
+        random.setstate(estado["estado_rng"])
+    
     def ejecutar(self):
         """
         Ejecuta el algoritmo genético.
@@ -163,34 +431,75 @@ class GeneticAlgorithm:
         Returns:
             Mejor horario encontrado
         """
-        print("Inicializando población...")
-        self.inicializar_poblacion()
+        self._limite = time.time() + self.tiempo_maximo if self.tiempo_maximo else None
+        
+        try:
+            print("Inicializando población...")
+            self.inicializar_poblacion()
+            
+            print(f"Población inicial generada. Mejor fitness: {self.mejor_fitness}")
+            
+            # Guardar estado inicial
+            self.historia_fitness.append((self.generacion, self.mejor_fitness))
+            
+            return self._evolucionar()
+        finally:
+            self._cerrar_evaluador()
+    
+    def reanudar(self, checkpoint):
+        """
+        Continúa una ejecución desde un punto de control hasta max_generaciones.
         
-        print(f"Población inicial generada. Mejor fitness: {self.mejor_fitness}")
+        Args:
+            checkpoint: Ruta del archivo .npz guardado durante una ejecución anterior
+            
+        Returns:
+            Mejor horario encontrado
+        """
+        self._limite = time.time() + self.tiempo_maximo if self.tiempo_maximo else None
         
+        try:
+            print(f"Reanudando desde {checkpoint}...")
+            self.cargar_checkpoint(checkpoint)
+            
+            print(f"Reanudado en generación {self.generacion}. Mejor fitness: {self.mejor_fitness}")
+            
+            return self._evolucionar()
+        finally:
+            self._cerrar_evaluador()
+    
+    def _cerrar_evaluador(self):
+        """
+        Detiene los procesos de evaluación, también si la ejecución se interrumpe
+        por una excepción o por el usuario.
+        """
+        if isinstance(self.evaluador, EvaluadorParalelo):
+            self.evaluador.cerrar()
+    
+    def _evolucionar(self):
+        """
+        Bucle principal: evoluciona la población desde la generación actual hasta
+        cumplir algún criterio de parada, guardando puntos de control si procede.
+        
+        Returns:
+            Mejor horario encontrado
+        """
         # Criterios de parada
-        criterio_fitness = GA_CONFIG["criterio_parada_fitness"] * self.evaluador.base_fitness
-        max_sin_mejora = GA_CONFIG["generaciones_sin_mejora"]
+        criterio_fitness = self.criterio_parada_fitness * self.evaluador.base_fitness
+        max_sin_mejora = self.max_generaciones_sin_mejora
         
-        generacion = 0
+        generacion = self.generacion
         inicio = time.time()
-        
-        # Guardar estado inicial
-        self.historia_fitness.append((generacion, self.mejor_fitness))
+        self._notificar_progreso()
         
         # Bucle principal
-        while generacion < self.max_generaciones:
-            # Evolucionar a siguiente generación
-            self._siguiente_generacion()
+        while generacion < self.max_generaciones and not self._tiempo_agotado():
+            generacion = self.evolucionar_generacion()
+            self._notificar_progreso()
             
-            # Evaluar nueva población
-            self._evaluar_poblacion()
-            
-            # Actualizar contador
-            generacion += 1
-            
-            # Guardar estado
-            self.historia_fitness.append((generacion, self.mejor_fitness))
+            # Guardar punto de control
+            if self.ruta_checkpoint and generacion % self.intervalo_checkpoint == 0:
+                self.guardar_checkpoint(self.ruta_checkpoint)
             
             # Mostrar progreso cada 10 generaciones
             if generacion % 10 == 0:
@@ -209,10 +518,14 @@ class GeneticAlgorithm:
                 print(f"Parada por estancamiento tras {max_sin_mejora} generaciones sin mejora.")
                 break
         
+        if self._tiempo_agotado():
+            print(f"Parada por tiempo tras {self.tiempo_maximo:.2f}s.")
+        
         tiempo_total = time.time() - inicio
         print(f"Algoritmo finalizado tras {generacion} generaciones. "
               f"Tiempo total: {tiempo_total:.2f}s")
         print(f"Mejor fitness alcanzado: {self.mejor_fitness}")
+        print(f"Tasa de aciertos de la caché de fitness: {self.evaluador.cache.tasa_aciertos:.1%}")
         
         return self.mejor_individuo
     
@@ -229,5 +542,9 @@ class GeneticAlgorithm:
             "historia_fitness": self.historia_fitness,
             "tiempo_ejecucion": None,  # Se llena al finalizar
             "generaciones_sin_mejora": self.generaciones_sin_mejora,
+            "tasa_aciertos_cache": self.evaluador.cache.tasa_aciertos,
+            "busqueda_local": self.busqueda_local.obtener_estadisticas(),
+            "reparacion": self.operador_reparacion.obtener_estadisticas() if self.operador_reparacion else None,
+            "instrumentacion": self.instrumentacion.totales() if self.instrumentacion else None,
             "evaluacion_detallada": self.evaluador.detallar_evaluacion(self.mejor_individuo) if self.mejor_individuo else None
         }
\ No newline at end of file
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentación del algoritmo genético: tiempos y contadores por generación
+"""
+
+import csv
+import json
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from genetic.vectorized import huella_eventos
+
+class Instrumentacion:
+    """
+    Registra, para cada generación, el tiempo y el número de llamadas de cada
+    fase del algoritmo (selección, cruce por operador, mutación por operador,
+    evaluación por restricción, clonado, reparación...), contadores como las
+    mutaciones aceptadas y rechazadas o las evaluaciones realizadas, y la
+    diversidad de la población. Los registros se pueden exportar en formato
+    JSON lines o CSV.
+    
+    Las claves son "categoria.nombre", por ejemplo "cruce.CruceDias" o
+    "restriccion.ProfesorNoSimultaneo". Las medidas tomadas fuera de una
+    generación (la reevaluación al cargar un punto de control, el recocido
+    simulado...) se acumulan aparte, en fuera_de_generacion. Sin un objeto
+    Instrumentacion, el algoritmo genético y el evaluador no miden nada.
+    """
+    
+    def __init__(self, catalogo=None, diversidad=True):
+        """
+        Inicializa la instrumentación.
+        
+        Args:
+            catalogo: Objeto Catalogo para codificar los horarios al medir la
+                      diversidad (el algoritmo genético asigna el suyo si falta)
+            diversidad: Si es False no se calcula la diversidad de la población,
+                        que requiere codificar todos los individuos
+        """
+        self.catalogo = catalogo
+        self.calcular_diversidad = diversidad
+        
+        self.registros = []
+        self.hooks = []
+        
+        # Generación en curso
+        self._generacion = None
+        self._inicio = None
+        self._tiempos = defaultdict(float)
+        self._llamadas = defaultdict(int)
+        self._contadores = defaultdict(int)
+        
+        # Medidas tomadas sin una generación en curso
+        self.fuera_de_generacion = {"tiempos": defaultdict(float), "llamadas": defaultdict(int),
+                                    "contadores": defaultdict(int)}
+    
+    @staticmethod
+    def _clave(categoria, nombre):
+        """
+        Construye la clave de una medida.
+        
+        Args:
+            categoria: Categoría de la medida (p. ej. "cruce")
+            nombre: Nombre dentro de la categoría (p. ej. la clase del operador), o None
+            
+        Returns:
+            Cadena "categoria.nombre", o solo la categoría si no hay nombre
+        """
+        return f"{categoria}.{nombre}" if nombre else categoria
+    
+    def agregar_hook(self, funcion):
+        """
+        Registra una función que se llamará con el registro de cada generación
+        al cerrarla (por ejemplo, para mostrarlo o enviarlo a otro sistema).
+        
+        Args:
+            funcion: Función que recibe un diccionario con el registro
+        """
+        self.hooks.append(funcion)
+    
+    def iniciar_generacion(self, generacion):
+        """
+        Empieza a acumular las medidas de una generación.
+        
+        Args:
+            generacion: Número de la generación
+        """
+        self._generacion = generacion
+        self._inicio = time.perf_counter()
+        self._tiempos = defaultdict(float)
+        self._llamadas = defaultdict(int)
+        self._contadores = defaultdict(int)
+    
+    @contextmanager
+    def medir(self, categoria, nombre=None):
+        """
+        Mide el tiempo de un bloque de código y lo suma a la generación en curso.
+        
+        Args:
+            categoria: Categoría de la medida
+            nombre: Nombre dentro de la categoría (opcional)
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.acumular(categoria, nombre, time.perf_counter() - inicio)
+    
+    def acumular(self, categoria, nombre, segundos):
+        """
+        Suma un tiempo ya medido a la generación en curso (o a las medidas fuera
+        de generación si no hay ninguna en curso).
+        
+        Args:
+            categoria: Categoría de la medida
+            nombre: Nombre dentro de la categoría, o None
+            segundos: Tiempo transcurrido
+        """
+        clave = self._clave(categoria, nombre)
+        if self._generacion is None:
+            self.fuera_de_generacion["tiempos"][clave] += segundos
+            self.fuera_de_generacion["llamadas"][clave] += 1
+        else:
+            self._tiempos[clave] += segundos
+            self._llamadas[clave] += 1
+    
+    def contar(self, categoria, nombre=None, cantidad=1):
+        """
+        Incrementa un contador de la generación en curso (o de las medidas fuera
+        de generación si no hay ninguna en curso).
+        
+        Args:
+            categoria: Categoría del contador (p. ej. "mutaciones_aceptadas")
+            nombre: Nombre dentro de la categoría (opcional)
+            cantidad: Valor a sumar
+        """
+        if self._generacion is None:
+            self.fuera_de_generacion["contadores"][self._clave(categoria, nombre)] += cantidad
+        else:
+            self._contadores[self._clave(categoria, nombre)] += cantidad
+    
+    def diversidad(self, poblacion):
+        """
+        Calcula la proporción de individuos distintos de la población, comparando
+        el contenido de sus eventos codificados.
+        
+        Args:
+            poblacion: Lista de objetos Horario
+            
+        Returns:
+            Número de contenidos distintos dividido por el tamaño de la población
+        """
+        if not poblacion:
+            return 0.0
+        
+        huellas = {huella_eventos(horario.codificar(self.catalogo)) for horario in poblacion}
+        return len(huellas) / len(poblacion)
+    
+    def cerrar_generacion(self, poblacion):
+        """
+        Cierra la generación en curso: añade las estadísticas de la población,
+        guarda el registro y lo pasa a los hooks.
+        
+        Args:
+            poblacion: Lista de objetos Horario evaluados
+            
+        Returns:
+            Diccionario con el registro de la generación
+        """
+        if self._generacion is None:
+            return None
+        
+        fitness = [horario.fitness for horario in poblacion]
+        
+        registro = {
+            "generacion": self._generacion,
+            "tiempo_total": time.perf_counter() - self._inicio,
+            "tamaño_poblacion": len(poblacion),
+            "mejor_fitness": max(fitness) if fitness else None,
+            "fitness_promedio": statistics.fmean(fitness) if fitness else None,
+            "fitness_desviacion": statistics.pstdev(fitness) if fitness else None,
+            "diversidad": (self.diversidad(poblacion)
+                           if self.calcular_diversidad and self.catalogo is not None else None),
+            "tiempos": dict(self._tiempos),
+            "llamadas": dict(self._llamadas),
+            "contadores": dict(self._contadores)
+        }
+        
+        self.registros.append(registro)
+        self._generacion = None
+        
+        for hook in self.hooks:
+            hook(registro)
+        
+        return registro
+    
+    def totales(self):
+        """
+        Suma los tiempos, llamadas y contadores de todas las generaciones
+        registradas y de las medidas tomadas fuera de generación.
+        
+        Returns:
+            Diccionario con los totales de "tiempos", "llamadas" y "contadores"
+        """
+        totales = {"tiempos": defaultdict(float), "llamadas": defaultdict(int),
+                   "contadores": defaultdict(int)}
+        
+        for registro in self.registros + [self.fuera_de_generacion]:
+            for seccion, acumulado in totales.items():
+                for clave, valor in registro[seccion].items():
+                    acumulado[clave] += valor
+        
+        return {seccion: dict(acumulado) for seccion, acumulado in totales.items()}
+    
+    def exportar_jsonl(self, ruta):
+        """
+        Escribe un registro por línea en formato JSON.
+        
+        Args:
+            ruta: Ruta del archivo de salida
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for registro in self.registros:
+                archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    
+    def exportar_csv(self, ruta):
+        """
+        Escribe los registros en formato CSV, una fila por generación. Los
+        tiempos, llamadas y contadores se aplanan en columnas como
+        "tiempos.cruce.CruceDias"; las medidas que no aparecen en una
+        generación quedan a 0.
+        
+        Args:
+            ruta: Ruta del archivo de salida
+        """
+        secciones = ("tiempos", "llamadas", "contadores")
+        
+        filas = []
+        columnas_anidadas = set()
+        for registro in self.registros:
+            fila = {clave: valor for clave, valor in registro.items() if clave not in secciones}
+            for seccion in secciones:
+                for clave, valor in registro[seccion].items():
+                    fila[f"{seccion}.{clave}"] = valor
+                    columnas_anidadas.add(f"{seccion}.{clave}")
+            filas.append(fila)
+        
+        columnas = ["generacion", "tiempo_total", "tamaño_poblacion", "mejor_fitness",
+                    "fitness_promedio", "fitness_desviacion", "diversidad"]
+        columnas += sorted(columnas_anidadas)
+        
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=columnas, restval=0)
+            escritor.writeheader()
+            escritor.writerows(filas)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Modelo de islas: varias poblaciones evolucionan en procesos separados e
+intercambian sus mejores individuos cada cierto número de generaciones
+"""
+
+import random
+import time
+import traceback
+import multiprocessing
+from model.catalogo import Catalogo
+from model.horario import Horario
+from genetic.genetic_algorithm import GeneticAlgorithm
+from config import GA_CONFIG, ISLAS_CONFIG
+
+# Mezclas de operadores por isla: pesos de (CruceDias, CruceEventos, CruceMateriasSeccion)
+# y de (cambio de horario, cambio de sala, intercambio). None significa equiprobable.
+MEZCLAS_OPERADORES = [
+    {"cruce": None, "mutacion": None},
+    {"cruce": [3, 1, 1], "mutacion": [3, 1, 1]},
+    {"cruce": [1, 3, 1], "mutacion": [1, 3, 1]},
+    {"cruce": [1, 1, 3], "mutacion": [1, 1, 3]}
+]
+
+# Argumentos de GeneticAlgorithm que solo se aplican en ejecutar o reanudar, que
+# las islas no llaman: se rechazan en lugar de ignorarlos
+PARAMETROS_NO_SOPORTADOS = ("tiempo_maximo", "ruta_checkpoint", "intervalo_checkpoint",
+                            "callback_progreso")
+
+
+def _ejecutar_isla(conexion, profesores, materias_secciones, salas, evaluador, parametros, semilla):
+    """
+    Bucle de un proceso isla. Atiende las órdenes del proceso principal:
+    ("evolucionar", n), ("inmigrantes", lista), ("resultado", None) y ("fin", None).
+    Los individuos viajan entre procesos como eventos codificados. Si la isla
+    falla, envía {"error": traza} y termina.
+    
+    Args:
+        conexion: Extremo de la tubería hacia el proceso principal
+        profesores: Lista de objetos Profesor
+        materias_secciones: Lista de objetos MateriaSecciones
+        salas: Lista de objetos Sala
+        evaluador: Objeto Evaluador
+        parametros: Diccionario de argumentos para GeneticAlgorithm
+        semilla: Semilla aleatoria de la isla
+    """
+    random.seed(semilla)
+    
+    try:
+        ga = GeneticAlgorithm(profesores, materias_secciones, salas, evaluador, **parametros)
+        ga.inicializar_poblacion()
+        conexion.send({"mejor_fitness": ga.mejor_fitness})
+        
+        while True:
+            orden, argumento = conexion.recv()
+            
+            if orden == "evolucionar":
+                num_generaciones, tamaño_migracion = argumento
+                for _ in range(num_generaciones):
+                    ga.evolucionar_generacion()
+                
+                conexion.send({
+                    "mejor_fitness": ga.mejor_fitness,
+                    "generaciones_sin_mejora": ga.generaciones_sin_mejora,
+                    "emigrantes": [h.codificar(ga.catalogo) for h in ga.emigrantes(tamaño_migracion)]
+                })
+            
+            elif orden == "inmigrantes":
+                ga.recibir_inmigrantes([Horario(ga.catalogo.decodificar(datos)) for datos in argumento])
+            
+            elif orden == "resultado":
+                conexion.send({
+                    "mejor_fitness": ga.mejor_fitness,
+                    "mejor_individuo": ga.mejor_individuo.codificar(ga.catalogo),
+                    "historia_fitness": ga.historia_fitness
+                })
+            
+            elif orden == "fin":
+                break
+    
+    except Exception:
+        # Devolver la traza al proceso principal en lugar de cerrar la tubería sin más
+        try:
+            conexion.send({"error": traceback.format_exc()})
+        except (BrokenPipeError, OSError):
+            pass
+    
+    finally:
+        conexion.close()
+
+
+def _recibir(conexion, indice):
+    """
+    Recibe la respuesta de una isla, convirtiendo sus fallos en excepciones.
+    
+    Args:
+        conexion: Extremo de la tubería hacia la isla
+        indice: Índice de la isla
+        
+    Returns:
+        Diccionario con la respuesta
+        
+    Raises:
+        RuntimeError: Si la isla falló o terminó sin responder
+    """
+    try:
+        respuesta = conexion.recv()
+    except EOFError:
+        raise RuntimeError(f"La isla {indice} terminó sin responder") from None
+    
+    if "error" in respuesta:
+        raise RuntimeError(f"La isla {indice} falló:\n{respuesta['error']}")
+    return respuesta
+
+
+class ModeloIslas:
+    """
+    Ejecuta varias instancias de GeneticAlgorithm (islas) en procesos separados.
+    Cada isla usa su propia mezcla de operadores de cruce y mutación y, cada
+    intervalo_migracion generaciones, envía sus mejores individuos a otra isla
+    según una topología en anillo o aleatoria.
+    """
+    
+    def __init__(self, profesores, materias_secciones, salas, evaluador,
+                 num_islas=None, intervalo_migracion=None, tamaño_migracion=None,
+                 topologia=None, mezclas=None, semilla=None, **parametros_ga):
+        """
+        Inicializa el modelo de islas.
+        
+        Args:
+            profesores: Lista de objetos Profesor
+            materias_secciones: Lista de objetos MateriaSecciones
+            salas: Lista de objetos Sala
+            evaluador: Objeto Evaluador para calcular fitness
+            num_islas: Número de islas (procesos)
+            intervalo_migracion: Generaciones entre migraciones
+            tamaño_migracion: Número de individuos que emigran de cada isla
+            topologia: "anillo" (la isla i envía a la i+1) o "aleatoria"
+            mezclas: Lista de diccionarios {"cruce": pesos, "mutacion": pesos};
+                     la isla i usa mezclas[i % len(mezclas)]
+            semilla: Semilla aleatoria (por defecto se obtiene del generador global)
+            **parametros_ga: Argumentos adicionales para cada GeneticAlgorithm
+                             (tamaño_poblacion, prob_cruce, max_generaciones...).
+                             max_generaciones, criterio_parada_fitness y
+                             max_generaciones_sin_mejora se aplican al conjunto
+                             de las islas
+                             
+        Raises:
+            ValueError: Si algún argumento no se puede aplicar en las islas
+        """
+        no_soportados = [nombre for nombre in PARAMETROS_NO_SOPORTADOS
+                         if parametros_ga.get(nombre) is not None]
+        if no_soportados:
+            raise ValueError(f"El modelo de islas no admite: {', '.join(no_soportados)}")
+        
+        # Cada isla ya es un proceso, y los procesos de las islas no pueden crear otros
+        if (parametros_ga.get("workers") or 1) > 1:
+            raise ValueError("El modelo de islas no admite workers > 1: cada isla es un proceso")
+        
+        self.profesores = profesores
+        self.materias_secciones = materias_secciones
+        self.salas = salas
+        self.evaluador = evaluador
+        
+        self.num_islas = num_islas or ISLAS_CONFIG["num_islas"]
+        self.intervalo_migracion = intervalo_migracion or ISLAS_CONFIG["intervalo_migracion"]
+        self.tamaño_migracion = tamaño_migracion or ISLAS_CONFIG["tamaño_migracion"]
+        self.topologia = topologia or ISLAS_CONFIG["topologia"]
+        self.mezclas = mezclas or MEZCLAS_OPERADORES
+        self.max_generaciones = parametros_ga.get("max_generaciones") or GA_CONFIG["max_generaciones"]
+        self.criterio_parada_fitness = (parametros_ga.get("criterio_parada_fitness") or
+                                        GA_CONFIG["criterio_parada_fitness"])
+        self.max_generaciones_sin_mejora = (parametros_ga.get("max_generaciones_sin_mejora") or
+                                            GA_CONFIG["generaciones_sin_mejora"])
+        self.parametros_ga = parametros_ga
+        
+        if self.topologia not in ("anillo", "aleatoria"):
+            raise ValueError(f"Topología desconocida: {self.topologia}")
+        
+        # Generador propio para las semillas de las islas y la topología aleatoria
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        self._rng = random.Random(self.semilla)
+        
+        # Catálogo para reconstruir los individuos recibidos de las islas
+        self.catalogo = Catalogo(profesores, materias_secciones, salas)
+        if self.evaluador.catalogo is None:
+            self.evaluador.catalogo = self.catalogo
+        
+        # Resultados
+        self.mejor_individuo = None
+        self.mejor_fitness = 0
+        self.historia_fitness = []
+        self.historias_islas = []
+    
+    def _parametros_isla(self, indice):
+        """
+        Construye los argumentos de GeneticAlgorithm para una isla.
+        
+        Args:
+            indice: Índice de la isla
+            
+        Returns:
+            Diccionario de argumentos
+        """
+        mezcla = self.mezclas[indice % len(self.mezclas)]
+        parametros = dict(self.parametros_ga)
+        parametros["pesos_cruce"] = mezcla.get("cruce")
+        parametros["pesos_mutacion"] = mezcla.get("mutacion")
+        return parametros
+    
+    def _destinos(self):
+        """
+        Determina a qué isla envía sus emigrantes cada isla en esta migración.
+        
+        Returns:
+            Lista con el índice de la isla destino de cada isla
+        """
+        if self.topologia == "anillo":
+            return [(i + 1) % self.num_islas for i in range(self.num_islas)]
+        
+        destinos = []
+        for i in range(self.num_islas):
+            destino = self._rng.randrange(self.num_islas - 1)
+            destinos.append(destino if destino < i else destino + 1)
+        return destinos
+    
+    def ejecutar(self):
+        """
+        Ejecuta el modelo de islas.
+        
+        Returns:
+            Mejor horario encontrado entre todas las islas
+        """
+        criterio_fitness = self.criterio_parada_fitness * self.evaluador.base_fitness
+        max_sin_mejora = self.max_generaciones_sin_mejora
+        
+        print(f"Inicializando {self.num_islas} islas...")
+        inicio = time.time()
+        
+        conexiones = []
+        procesos = []
+        for i in range(self.num_islas):
+            conexion, conexion_isla = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_ejecutar_isla,
+                args=(conexion_isla, self.profesores, self.materias_secciones, self.salas,
+                      self.evaluador, self._parametros_isla(i), self._rng.randrange(2 ** 32)),
+                daemon=True
+            )
+            proceso.start()
+            conexion_isla.close()
+            conexiones.append(conexion)
+            procesos.append(proceso)
+        
+        try:
+            mejores = [_recibir(conexion, i)["mejor_fitness"] for i, conexion in enumerate(conexiones)]
+            generacion = 0
+            self.historia_fitness = [(generacion, max(mejores))]
+            print(f"Islas inicializadas. Mejor fitness: {max(mejores)}")
+            
+            while generacion < self.max_generaciones:
+                # Evolucionar todas las islas en paralelo hasta la próxima migración
+                paso = min(self.intervalo_migracion, self.max_generaciones - generacion)
+                for conexion in conexiones:
+                    conexion.send(("evolucionar", (paso, self.tamaño_migracion)))
+                informes = [_recibir(conexion, i) for i, conexion in enumerate(conexiones)]
+                generacion += paso
+                
+                mejor = max(informe["mejor_fitness"] for informe in informes)
+                self.historia_fitness.append((generacion, mejor))
+                print(f"Generación {generacion}: Mejor fitness = {mejor:.2f}, "
+                      f"Tiempo = {time.time() - inicio:.2f}s")
+                
+                # Verificar criterios de parada
+                if mejor >= criterio_fitness:
+                    print(f"¡Solución óptima encontrada en generación {generacion}!")
+                    break
+                
+                if all(informe["generaciones_sin_mejora"] >= max_sin_mejora for informe in informes):
+                    print(f"Parada por estancamiento de todas las islas tras {max_sin_mejora} "
+                          f"generaciones sin mejora.")
+                    break
+                
+                # Migración
+                if generacion < self.max_generaciones and self.num_islas > 1:
+                    for origen, destino in enumerate(self._destinos()):
+                        conexiones[destino].send(("inmigrantes", informes[origen]["emigrantes"]))
+            
+            # Recoger el mejor individuo de cada isla
+            for conexion in conexiones:
+                conexion.send(("resultado", None))
+            resultados = [_recibir(conexion, i) for i, conexion in enumerate(conexiones)]
+        finally:
+            for conexion in conexiones:
+                try:
+                    conexion.send(("fin", None))
+                except (BrokenPipeError, OSError):
+                    pass
+                conexion.close()
+            for proceso in procesos:
+                proceso.join()
+        
+        self.historias_islas = [resultado["historia_fitness"] for resultado in resultados]
+        mejor = max(resultados, key=lambda resultado: resultado["mejor_fitness"])
+        
+        self.mejor_individuo = Horario(self.catalogo.decodificar(mejor["mejor_individuo"]))
+        self.evaluador.evaluar(self.mejor_individuo)
+        self.mejor_fitness = self.mejor_individuo.fitness
+        
+        tiempo_total = time.time() - inicio
+        print(f"Modelo de islas finalizado tras {generacion} generaciones. "
+              f"Tiempo total: {tiempo_total:.2f}s")
+        print(f"Mejor fitness alcanzado: {self.mejor_fitness}")
+        
+        return self.mejor_individuo
+    
+    def obtener_estadisticas(self):
+        """
+        Devuelve estadísticas sobre la ejecución del modelo de islas.
+        
+        Returns:
+            Diccionario con estadísticas
+        """
+        return {
+            "generaciones": len(self.historia_fitness),
+            "mejor_fitness": self.mejor_fitness,
+            "historia_fitness": self.historia_fitness,
+            "historias_islas": self.historias_islas,
+            "num_islas": self.num_islas,
+            "topologia": self.topologia,
+            "evaluacion_detallada": self.evaluador.detallar_evaluacion(self.mejor_individuo) if self.mejor_individuo else None
+        }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Búsqueda local (escalada) para mejorar individuos del algoritmo genético
+"""
+
+import random
+import time
+from config import NUM_DIAS, NUM_PERIODOS
+
+class Vecindario:
+    """
+    Movimientos de la búsqueda local, los mismos que aplican los operadores de
+    mutación: cambio de día y hora, cambio de sala e intercambio de dos eventos.
+    Cada vecino se genera sin modificar el horario, para valorarlo antes con la
+    evaluación incremental del evaluador.
+    """
+    
+    def __init__(self, evaluador, problema):
+        """
+        Inicializa el vecindario.
+        
+        Args:
+            evaluador: Objeto Evaluador con el que se actualiza el fitness al aplicar un vecino
+            problema: Objeto ProblemaCompilado con las salas adecuadas de cada materia-sección
+        """
+        self.evaluador = evaluador
+        self.problema = problema
+    
+    def eventos_en_conflicto(self, horario):
+        """
+        Obtiene los eventos que comparten día y hora con otro evento del mismo
+        profesor, sala o grupo.
+        
+        Args:
+            horario: Objeto Horario
+            
+        Returns:
+            Lista de objetos Evento en conflicto
+        """
+        return [e for e in horario.eventos
+                if horario.ocupacion_profesor(e.profesor.id, e.dia, e.hora) > 1
+                or horario.ocupacion_sala(e.sala.id, e.dia, e.hora) > 1
+                or horario.ocupacion_grupo(e.materia_seccion.seccion, e.dia, e.hora) > 1]
+    
+    def generar(self, horario, en_conflicto):
+        """
+        Genera un movimiento aleatorio válido (que no crea choques nuevos).
+        
+        Args:
+            horario: Objeto Horario
+            en_conflicto: Lista de eventos en conflicto, elegidos con preferencia
+            
+        Returns:
+            Tupla (tipo, argumentos, movimientos) o None si el movimiento no es válido
+        """
+        if en_conflicto and random.random() < 0.5:
+            evento = random.choice(en_conflicto)
+        else:
+            evento = random.choice(horario.eventos)
+        
+        tipo = random.randrange(3)
+        
+        if tipo == 0:
+            # Cambio de día y hora
+            dia = random.randrange(NUM_DIAS)
+            hora = random.randrange(NUM_PERIODOS)
+            if not horario.puede_mover(evento, dia, hora):
+                return None
+            return ("mover", (evento, dia, hora), [(evento, dia, hora, evento.sala)])
+        
+        if tipo == 1:
+            # Cambio de sala
+            salas = self.problema.salas_adecuadas(evento.materia_seccion)
+            if not salas:
+                return None
+            sala = random.choice(salas)
+            if not horario.puede_cambiar_sala(evento, sala):
+                return None
+            return ("sala", (evento, sala), [(evento, evento.dia, evento.hora, sala)])
+        
+        # Intercambio de día y hora con otro evento
+        otro = random.choice(horario.eventos)
+        if otro is evento or not horario.puede_intercambiar(evento, otro):
+            return None
+        return ("intercambio", (evento, otro), [(evento, otro.dia, otro.hora, evento.sala),
+                                                (otro, evento.dia, evento.hora, otro.sala)])
+    
+    def aplicar(self, horario, vecino, medidas):
+        """
+        Aplica un movimiento al horario y actualiza su fitness.
+        
+        Args:
+            horario: Objeto Horario
+            vecino: Tupla devuelta por generar
+            medidas: Medidas del horario tras el movimiento
+        """
+        tipo, argumentos, _ = vecino
+        
+        if tipo == "mover":
+            horario.mover_evento(*argumentos)
+        elif tipo == "sala":
+            horario.cambiar_sala(*argumentos)
+        else:
+            horario.intercambiar(*argumentos)
+        
+        self.evaluador.aplicar_medidas(horario, medidas)
+
+
+class BusquedaLocal:
+    """
+    Escalada sobre un horario con los movimientos de Vecindario. Cada vecino
+    se valora con la evaluación incremental del evaluador, sin modificar el
+    horario, y solo se aplican los movimientos que reducen la penalización.
+    Los eventos con choques de profesor, sala o grupo se eligen con
+    preferencia para resolver primero las violaciones duras.
+    """
+    
+    ESTRATEGIAS = ("primera_mejora", "maximo_descenso")
+    
+    def __init__(self, evaluador, problema, estrategia="primera_mejora",
+                 vecinos=20, max_iteraciones=200, max_sin_mejora=20):
+        """
+        Inicializa la búsqueda local.
+        
+        Args:
+            evaluador: Objeto Evaluador con restricciones incrementales
+            problema: Objeto ProblemaCompilado con las salas adecuadas de cada materia-sección
+            estrategia: "primera_mejora" aplica el primer vecino que mejora;
+                        "maximo_descenso" aplica el mejor de los vecinos muestreados
+            vecinos: Número de vecinos muestreados en cada iteración
+            max_iteraciones: Número máximo de iteraciones por horario
+            max_sin_mejora: Iteraciones consecutivas sin mejora para detenerse
+        """
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estrategia de búsqueda local desconocida: {estrategia}")
+        
+        self.evaluador = evaluador
+        self.vecindario = Vecindario(evaluador, problema)
+        self.estrategia = estrategia
+        self.vecinos = vecinos
+        self.max_iteraciones = max_iteraciones
+        self.max_sin_mejora = max_sin_mejora
+        
+        # Estadísticas acumuladas
+        self.movimientos_aplicados = 0
+        self.vecinos_evaluados = 0
+    
+    def mejorar(self, horario, limite=None):
+        """
+        Aplica la escalada al horario, modificándolo en el sitio.
+        
+        Args:
+            horario: Objeto Horario a mejorar
+            limite: Instante (time.time) en que debe detenerse la búsqueda (opcional)
+            
+        Returns:
+            Reducción de la penalización conseguida (0 si no mejora)
+        """
+        if len(horario.eventos) < 2:
+            return 0
+        
+        if horario.medidas is None:
+            self.evaluador.evaluar(horario)
+        
+        # Sin evaluación incremental cada vecino costaría una evaluación completa
+        restricciones = self.evaluador.restricciones_duras + self.evaluador.restricciones_blandas
+        if not all(r.incremental for r in restricciones):
+            return 0
+        
+        penalizacion_inicial = self.evaluador.penalizacion(horario.medidas)
+        penalizacion = penalizacion_inicial
+        en_conflicto = self.vecindario.eventos_en_conflicto(horario)
+        sin_mejora = 0
+        
+        for _ in range(self.max_iteraciones):
+            if penalizacion == 0 or sin_mejora >= self.max_sin_mejora:
+                break
+            if limite is not None and time.time() >= limite:
+                break
+            
+            mejor = None
+            for _ in range(self.vecinos):
+                vecino = self.vecindario.generar(horario, en_conflicto)
+                if vecino is None:
+                    continue
+                
+                medidas = self.evaluador.evaluar_movimientos(horario, vecino[2])
+                self.vecinos_evaluados += 1
+                nueva_penalizacion = self.evaluador.penalizacion(medidas)
+                
+                if nueva_penalizacion < penalizacion and (mejor is None or nueva_penalizacion < mejor[0]):
+                    mejor = (nueva_penalizacion, vecino, medidas)
+                    if self.estrategia == "primera_mejora":
+                        break
+            
+            if mejor is None:
+                sin_mejora += 1
+                continue
+            
+            penalizacion, vecino, medidas = mejor
+            self.vecindario.aplicar(horario, vecino, medidas)
+            self.movimientos_aplicados += 1
+            sin_mejora = 0
+            
+            if en_conflicto:
+                en_conflicto = self.vecindario.eventos_en_conflicto(horario)
+        
+        return penalizacion_inicial - penalizacion
+    
+    def obtener_estadisticas(self):
+        """
+        Devuelve estadísticas acumuladas de la búsqueda local.
+        
+        Returns:
+            Diccionario con estadísticas
+        """
+        return {
+            "movimientos_aplicados": self.movimientos_aplicados,
+            "vecinos_evaluados": self.vecinos_evaluados
+        }
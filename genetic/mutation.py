@@ -6,7 +6,6 @@ Operadores de mutación para el algoritmo genético
 """
 
 import random
-import copy
 from config import NUM_DIAS, NUM_PERIODOS
 
 class OperadorMutacion:
@@ -14,14 +13,20 @@ class OperadorMutacion:
     Clase base para los operadores de mutación.
     """
     
-    def __init__(self, probabilidad=0.2):
+    def __init__(self, probabilidad=0.2, evaluador=None):
         """
         Inicializa el operador de mutación.
         
         Args:
             probabilidad: Probabilidad de aplicar la mutación a cada individuo
+            evaluador: Objeto Evaluador para actualizar el fitness de forma
+                       incremental tras cada mutación (opcional)
         """
         self.probabilidad = probabilidad
+        self.evaluador = evaluador
+        
+        # Objeto Instrumentacion para medir tiempos y mutaciones aceptadas/rechazadas (opcional)
+        self.instrumentacion = None
     
     def mutar(self, horario):
         """
@@ -33,9 +38,18 @@ class OperadorMutacion:
         Returns:
             Boolean: True si se realizó la mutación, False en caso contrario
         """
-        if random.random() < self.probabilidad:
+        if random.random() >= self.probabilidad:
+            return False
+        
+        if self.instrumentacion is None:
             return self._aplicar_mutacion(horario)
-        return False
+        
+        nombre = type(self).__name__
+        with self.instrumentacion.medir("mutacion", nombre):
+            aplicada = self._aplicar_mutacion(horario)
+        self.instrumentacion.contar("mutaciones_aceptadas" if aplicada else "mutaciones_rechazadas", nombre)
+        
+        return aplicada
     
     def _aplicar_mutacion(self, horario):
         """
@@ -49,6 +63,33 @@ class OperadorMutacion:
             Boolean: True si se realizó la mutación, False en caso contrario
         """
         raise NotImplementedError("Método no implementado en clase base")
+    
+    def _evaluar_movimientos(self, horario, movimientos):
+        """
+        Calcula las medidas del horario tras los movimientos, antes de aplicarlos.
+        
+        Args:
+            horario: Objeto Horario a mutar
+            movimientos: Lista de tuplas (evento, dia, hora, sala)
+            
+        Returns:
+            Lista de medidas, o None si no se puede calcular de forma incremental
+        """
+        if self.evaluador is None:
+            return None
+        return self.evaluador.evaluar_movimientos(horario, movimientos)
+    
+    def _aplicar_medidas(self, horario, medidas):
+        """
+        Actualiza el fitness del horario mutado con las medidas calculadas.
+        Si no hay medidas, el horario queda pendiente de evaluación completa.
+        
+        Args:
+            horario: Objeto Horario ya mutado
+            medidas: Lista de medidas devuelta por _evaluar_movimientos, o None
+        """
+        if medidas is not None:
+            self.evaluador.aplicar_medidas(horario, medidas)
 
 
 class MutacionCambioHorario(OperadorMutacion):
@@ -84,23 +125,15 @@ class MutacionCambioHorario(OperadorMutacion):
         if nuevo_dia == dia_original and nueva_hora == hora_original:
             return False
         
-        # Crear una copia del evento con las nuevas coordenadas
-        nuevo_evento = copy.deepcopy(evento)
-        nuevo_evento.dia = nuevo_dia
-        nuevo_evento.hora = nueva_hora
-        
         # Verificar si hay conflictos con el nuevo horario
-        if (horario.tiene_conflicto_profesor(nuevo_evento) or
-            horario.tiene_conflicto_sala(nuevo_evento) or
-            horario.tiene_conflicto_grupo(nuevo_evento)):
+        if not horario.puede_mover(evento, nuevo_dia, nueva_hora):
             return False
         
-        # Si no hay conflictos, actualizar el evento
-        evento.dia = nuevo_dia
-        evento.hora = nueva_hora
+        medidas = self._evaluar_movimientos(horario, [(evento, nuevo_dia, nueva_hora, evento.sala)])
         
-        # Actualizar índices internos del horario
-        horario._actualizar_indices()
+        # Si no hay conflictos, actualizar el evento y sus índices
+        horario.mover_evento(evento, nuevo_dia, nueva_hora)
+        self._aplicar_medidas(horario, medidas)
         
         return True
 
@@ -110,16 +143,20 @@ class MutacionCambioSala(OperadorMutacion):
     Operador de mutación que cambia la sala asignada a un evento aleatorio.
     """
     
-    def __init__(self, probabilidad=0.2, salas=None):
+    def __init__(self, probabilidad=0.2, salas=None, evaluador=None, problema=None):
         """
         Inicializa el operador de mutación con lista de salas disponibles.
         
         Args:
             probabilidad: Probabilidad de aplicar la mutación
             salas: Lista de objetos Sala disponibles
+            evaluador: Objeto Evaluador para el fitness incremental (opcional)
+            problema: Objeto ProblemaCompilado con las salas adecuadas de cada
+                      materia-sección (opcional)
         """
-        super().__init__(probabilidad)
+        super().__init__(probabilidad, evaluador)
         self.salas = salas or []
+        self.problema = problema
     
     def _aplicar_mutacion(self, horario):
         """
@@ -138,10 +175,14 @@ class MutacionCambioSala(OperadorMutacion):
         evento = random.choice(horario.eventos)
         
         # Buscar salas adecuadas (diferente a la actual y compatible con el nivel)
-        salas_adecuadas = [s for s in self.salas 
-                          if s.id != evento.sala.id 
-                          and s.es_adecuada_para_nivel(evento.materia_seccion.materia.nivel)
-                          and s.tiene_equipamiento(evento.materia_seccion.materia.requiere_equipamiento)]
+        if self.problema is not None:
+            salas_adecuadas = [s for s in self.problema.salas_adecuadas(evento.materia_seccion)
+                              if s.id != evento.sala.id]
+        else:
+            salas_adecuadas = [s for s in self.salas 
+                              if s.id != evento.sala.id 
+                              and s.es_adecuada_para_nivel(evento.materia_seccion.materia.nivel)
+                              and s.tiene_equipamiento(evento.materia_seccion.materia.requiere_equipamiento)]
         
         if not salas_adecuadas:
             return False
@@ -149,19 +190,15 @@ class MutacionCambioSala(OperadorMutacion):
         # Seleccionar una sala aleatoria entre las adecuadas
         nueva_sala = random.choice(salas_adecuadas)
         
-        # Crear una copia del evento con la nueva sala
-        nuevo_evento = copy.deepcopy(evento)
-        nuevo_evento.sala = nueva_sala
-        
         # Verificar si hay conflictos con la nueva sala
-        if horario.tiene_conflicto_sala(nuevo_evento):
+        if not horario.puede_cambiar_sala(evento, nueva_sala):
             return False
         
-        # Si no hay conflictos, actualizar el evento
-        evento.sala = nueva_sala
+        medidas = self._evaluar_movimientos(horario, [(evento, evento.dia, evento.hora, nueva_sala)])
         
-        # Actualizar índices internos del horario
-        horario._actualizar_indices()
+        # Si no hay conflictos, actualizar el evento y sus índices
+        horario.cambiar_sala(evento, nueva_sala)
+        self._aplicar_medidas(horario, medidas)
         
         return True
 
@@ -188,32 +225,16 @@ class MutacionIntercambio(OperadorMutacion):
         eventos = random.sample(horario.eventos, 2)
         evento1, evento2 = eventos[0], eventos[1]
         
-        # Guardar coordenadas temporales originales
-        dia1, hora1 = evento1.dia, evento1.hora
-        dia2, hora2 = evento2.dia, evento2.hora
-        
-        # Intercambiar temporalmente para verificar conflictos
-        evento1.dia, evento1.hora = dia2, hora2
-        evento2.dia, evento2.hora = dia1, hora1
-        
         # Verificar si hay conflictos tras el intercambio
-        conflictos = False
-        
-        for evento in [evento1, evento2]:
-            if (horario.tiene_conflicto_profesor(evento) or
-                horario.tiene_conflicto_sala(evento) or
-                horario.tiene_conflicto_grupo(evento)):
-                conflictos = True
-                break
-        
-        if conflictos:
-            # Revertir el intercambio si hay conflictos
-            evento1.dia, evento1.hora = dia1, hora1
-            evento2.dia, evento2.hora = dia2, hora2
+        if not horario.puede_intercambiar(evento1, evento2):
             return False
         
-        # Actualizar índices internos del horario
-        horario._actualizar_indices()
+        # Medidas tras el intercambio, calculadas con el horario aún sin modificar
+        medidas = self._evaluar_movimientos(horario, [(evento1, evento2.dia, evento2.hora, evento1.sala),
+                                                      (evento2, evento1.dia, evento1.hora, evento2.sala)])
+        
+        horario.intercambiar(evento1, evento2)
+        self._aplicar_medidas(horario, medidas)
         
         return True
 
@@ -223,15 +244,18 @@ class MutacionCompuesta(OperadorMutacion):
     Operador de mutación que aplica una combinación de diferentes mutaciones.
     """
     
-    def __init__(self, operadores=None):
+    def __init__(self, operadores=None, pesos=None):
         """
         Inicializa el operador compuesto con una lista de operadores.
         
         Args:
             operadores: Lista de objetos OperadorMutacion
+            pesos: Peso relativo de cada operador al elegirlo (opcional,
+                   por defecto todos son equiprobables)
         """
         super().__init__(1.0)  # Siempre se intenta aplicar algún operador
         self.operadores = operadores or []
+        self.pesos = pesos
     
     def _aplicar_mutacion(self, horario):
         """
@@ -247,7 +271,10 @@ class MutacionCompuesta(OperadorMutacion):
             return False
         
         # Seleccionar un operador aleatorio
-        operador = random.choice(self.operadores)
+        if self.pesos:
+            operador = random.choices(self.operadores, weights=self.pesos)[0]
+        else:
+            operador = random.choice(self.operadores)
         
         # Aplicar la mutación
         return operador.mutar(horario)
\ No newline at end of file
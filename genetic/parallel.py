@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Evaluación de fitness en paralelo con un pool de procesos
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from model.horario import Horario
+from genetic.fitness import Evaluador
+from config import BASE_FITNESS
+
+# Evaluador propio de cada proceso del pool, creado por _inicializar_proceso
+_evaluador_proceso = None
+
+
+def _inicializar_proceso(restricciones_duras, restricciones_blandas, base_fitness, catalogo):
+    """
+    Prepara un proceso del pool. El catálogo y las restricciones se reciben
+    una sola vez al arrancar el proceso y no en cada tarea.
+    
+    Args:
+        restricciones_duras: Lista de objetos Restriccion (duras)
+        restricciones_blandas: Lista de objetos Restriccion (blandas)
+        base_fitness: Valor base para el cálculo de fitness
+        catalogo: Objeto Catalogo con el que se codifican los horarios
+    """
+    global _evaluador_proceso
+    _evaluador_proceso = Evaluador(restricciones_duras, restricciones_blandas,
+                                   base_fitness, catalogo)
+
+
+def _medir_bloque(codificados):
+    """
+    Calcula las medidas de un bloque de horarios codificados dentro de un proceso del pool.
+    
+    Args:
+        codificados: Lista con los eventos codificados de cada horario
+        
+    Returns:
+        Lista con la lista de medidas de cada horario
+    """
+    evaluador = _evaluador_proceso
+    restricciones = evaluador.restricciones_duras + evaluador.restricciones_blandas
+    
+    # Solo las restricciones no vectorizadas necesitan los objetos Evento
+    if all(r.vectorizada for r in restricciones):
+        horarios = [None] * len(codificados)
+    else:
+        horarios = [Horario(evaluador.catalogo.decodificar(c)) for c in codificados]
+    
+    eventos = np.concatenate(codificados)
+    individuos = np.repeat(np.arange(len(codificados)), [len(c) for c in codificados])
+    
+    por_restriccion = evaluador._medidas_lote(restricciones, horarios, eventos, individuos)
+    return [list(medidas) for medidas in zip(*por_restriccion)]
+
+
+class EvaluadorParalelo(Evaluador):
+    """
+    Evaluador que reparte la evaluación de la población entre varios procesos.
+    Cada proceso recibe el catálogo una sola vez y solo los eventos codificados
+    de los horarios cruzan entre procesos. El resultado es idéntico al de la
+    evaluación secuencial, independientemente del número de procesos.
+    """
+    
+    def __init__(self, restricciones_duras, restricciones_blandas, base_fitness=BASE_FITNESS,
+                 catalogo=None, cache=None, workers=2):
+        """
+        Inicializa el evaluador paralelo.
+        
+        Args:
+            restricciones_duras: Lista de objetos Restriccion (duras)
+            restricciones_blandas: Lista de objetos Restriccion (blandas)
+            base_fitness: Valor base para el cálculo de fitness
+            catalogo: Objeto Catalogo (necesario para la evaluación en paralelo)
+            cache: Objeto CacheFitness (opcional)
+            workers: Número de procesos del pool
+        """
+        super().__init__(restricciones_duras, restricciones_blandas, base_fitness,
+                         catalogo, cache)
+        self.workers = workers
+        self._pool = None
+        self._catalogo_pool = None
+    
+    @classmethod
+    def desde_evaluador(cls, evaluador, workers):
+        """
+        Crea un evaluador paralelo con la misma configuración que otro evaluador.
+        
+        Args:
+            evaluador: Objeto Evaluador de referencia
+            workers: Número de procesos del pool
+            
+        Returns:
+            Nuevo objeto EvaluadorParalelo
+        """
+        paralelo = cls(evaluador.restricciones_duras, evaluador.restricciones_blandas,
+                       evaluador.base_fitness, evaluador.catalogo, evaluador.cache, workers)
+        paralelo.instrumentacion = evaluador.instrumentacion
+        return paralelo
+    
+    def _obtener_pool(self):
+        """
+        Devuelve el pool de procesos, creándolo si es necesario.
+        
+        Returns:
+            Objeto ProcessPoolExecutor
+        """
+        # El catálogo se envía al arrancar los procesos: si cambia, se recrea el pool
+        if self._pool is not None and self._catalogo_pool is not self.catalogo:
+            self.cerrar()
+        
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_inicializar_proceso,
+                initargs=(self.restricciones_duras, self.restricciones_blandas,
+                          self.base_fitness, self.catalogo)
+            )
+            self._catalogo_pool = self.catalogo
+        
+        return self._pool
+    
+    def _evaluar_lote(self, horarios, codificados):
+        """
+        Evalúa varios horarios repartiéndolos en bloques entre los procesos del pool.
+        
+        Args:
+            horarios: Lista de objetos Horario a evaluar
+            codificados: Lista con los eventos codificados de cada horario
+        """
+        if self.workers <= 1 or len(horarios) < 2:
+            super()._evaluar_lote(horarios, codificados)
+            return
+        
+        # Bloques contiguos: el orden de los resultados coincide con el de los horarios
+        num_bloques = min(self.workers, len(horarios))
+        limites = np.linspace(0, len(horarios), num_bloques + 1).astype(int)
+        bloques = [codificados[inicio:fin] for inicio, fin in zip(limites[:-1], limites[1:])]
+        
+        # Los tiempos por restricción se miden en los procesos y no se registran
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar("evaluaciones", "completas", len(horarios))
+        
+        resultados = self._obtener_pool().map(_medir_bloque, bloques)
+        
+        medidas_horarios = [medidas for bloque in resultados for medidas in bloque]
+        for horario, medidas in zip(horarios, medidas_horarios):
+            self.aplicar_medidas(horario, medidas)
+    
+    def cerrar(self):
+        """
+        Detiene los procesos del pool.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._catalogo_pool = None
+    
+    def __enter__(self):
+        """
+        Permite usar el evaluador en un bloque with.
+        
+        Returns:
+            El propio evaluador
+        """
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        """
+        Detiene los procesos del pool al salir del bloque with.
+        """
+        self.cerrar()
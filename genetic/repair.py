@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Operador de reparación de violaciones duras para el algoritmo genético
+"""
+
+import random
+from collections import defaultdict
+from model.evento import Evento
+from config import NUM_DIAS, NUM_PERIODOS
+
+class OperadorReparacion:
+    """
+    Repara los hijos tras el cruce y la mutación. Los cruces descartan los
+    eventos que chocan, por lo que a algunas materias-secciones les faltan horas
+    y a otras les sobran. El operador reubica los eventos con choques de
+    profesor, sala o grupo, elimina las horas sobrantes y vuelve a colocar las
+    que faltan en huecos libres, usando las máscaras de ocupación del horario.
+    """
+    
+    def __init__(self, problema):
+        """
+        Inicializa el operador de reparación.
+        
+        Args:
+            problema: Objeto ProblemaCompilado con los dominios de cada materia-sección
+        """
+        self.problema = problema
+        
+        # Estadísticas acumuladas
+        self.eventos_reubicados = 0
+        self.eventos_eliminados = 0
+        self.eventos_insertados = 0
+    
+    def reparar(self, horario):
+        """
+        Repara el horario en el sitio.
+        
+        Args:
+            horario: Objeto Horario a reparar
+            
+        Returns:
+            Número de eventos reubicados, eliminados o insertados
+        """
+        cambios = self._reubicar_conflictos(horario)
+        
+        # Eventos de cada materia-sección en el horario
+        eventos_seccion = defaultdict(list)
+        for evento in horario.eventos:
+            eventos_seccion[self.problema.indice_seccion(evento.materia_seccion)].append(evento)
+        
+        for indice, horas in enumerate(self.problema.horas_seccion):
+            eventos = eventos_seccion.get(indice, [])
+            
+            # Eliminar las horas sobrantes
+            while len(eventos) > horas:
+                horario.quitar_evento(eventos.pop())
+                self.eventos_eliminados += 1
+                cambios += 1
+            
+            # Colocar las horas que faltan
+            if len(eventos) < horas:
+                cambios += self._completar_seccion(horario, indice, eventos, horas - len(eventos))
+        
+        return cambios
+    
+    def _reubicar_conflictos(self, horario):
+        """
+        Mueve a huecos libres los eventos que chocan con otro evento del mismo
+        profesor, sala o grupo. Los eventos sin hueco libre se dejan donde están.
+        
+        Args:
+            horario: Objeto Horario a reparar
+            
+        Returns:
+            Número de eventos reubicados
+        """
+        reubicados = 0
+        
+        for evento in list(horario.eventos):
+            # Se comprueba de nuevo: una reubicación anterior puede haber resuelto el choque
+            if not (horario.ocupacion_profesor(evento.profesor.id, evento.dia, evento.hora) > 1
+                    or horario.ocupacion_sala(evento.sala.id, evento.dia, evento.hora) > 1
+                    or horario.ocupacion_grupo(evento.materia_seccion.seccion, evento.dia, evento.hora) > 1):
+                continue
+            
+            indice = self.problema.indice_seccion(evento.materia_seccion)
+            hueco = self._elegir_hueco(horario, evento.profesor, evento.materia_seccion,
+                                       self.problema.salas_seccion[indice], [evento])
+            if hueco is None:
+                continue
+            
+            horario.reubicar_evento(evento, *hueco)
+            self.eventos_reubicados += 1
+            reubicados += 1
+        
+        return reubicados
+    
+    def _completar_seccion(self, horario, indice, eventos, faltantes):
+        """
+        Inserta las horas que faltan de una materia-sección. Se mantiene el
+        profesor que ya la imparte en el horario, o se elige uno de los candidatos.
+        
+        Args:
+            horario: Objeto Horario a reparar
+            indice: Índice de la materia-sección en el catálogo
+            eventos: Lista de eventos de la materia-sección en el horario
+            faltantes: Número de horas por insertar
+            
+        Returns:
+            Número de eventos insertados
+        """
+        materia_seccion = self.problema.materias_secciones[indice]
+        salas = self.problema.salas_seccion[indice]
+        
+        if eventos:
+            profesor = eventos[0].profesor
+        elif self.problema.profesores_seccion[indice]:
+            profesor = random.choice(self.problema.profesores_seccion[indice])
+        else:
+            return 0
+        
+        insertados = 0
+        for _ in range(faltantes):
+            hueco = self._elegir_hueco(horario, profesor, materia_seccion, salas, eventos)
+            if hueco is None:
+                break
+            
+            dia, hora, sala = hueco
+            evento = Evento(profesor, materia_seccion, sala, dia, hora)
+            if not horario.agregar_evento(evento):
+                break
+            
+            eventos.append(evento)
+            self.eventos_insertados += 1
+            insertados += 1
+        
+        return insertados
+    
+    def _elegir_hueco(self, horario, profesor, materia_seccion, salas, eventos):
+        """
+        Busca un día, hora y sala en que el profesor esté disponible y libre, el
+        grupo esté libre y alguna sala adecuada esté libre. Se prefieren los días
+        con menos horas de la misma materia-sección.
+        
+        Args:
+            horario: Objeto Horario
+            profesor: Objeto Profesor que impartirá la hora
+            materia_seccion: Objeto MateriaSecciones
+            salas: Lista de salas adecuadas para la materia-sección
+            eventos: Eventos de la materia-sección ya colocados en el horario
+            
+        Returns:
+            Tupla (dia, hora, sala) o None si no hay ningún hueco libre
+        """
+        if not salas:
+            return None
+        
+        horas_dia = [0] * NUM_DIAS
+        for evento in eventos:
+            horas_dia[evento.dia] += 1
+        
+        huecos = []
+        menor_carga = None
+        for dia in sorted(range(NUM_DIAS), key=lambda d: horas_dia[d]):
+            # Con huecos en un día menos cargado no hace falta mirar los demás
+            if menor_carga is not None and horas_dia[dia] > menor_carga:
+                break
+            
+            libres = (self.problema.mascara_disponibilidad(profesor.id, dia)
+                      & ~horario.mascara_profesor(profesor.id, dia)
+                      & ~horario.mascara_grupo(materia_seccion.seccion, dia))
+            if not libres:
+                continue
+            
+            for hora in range(NUM_PERIODOS):
+                if not libres >> hora & 1:
+                    continue
+                salas_libres = [s for s in salas if not horario.mascara_sala(s.id, dia) >> hora & 1]
+                if salas_libres:
+                    huecos.append((dia, hora, salas_libres))
+                    menor_carga = horas_dia[dia]
+        
+        if not huecos:
+            return None
+        
+        dia, hora, salas_libres = random.choice(huecos)
+        return dia, hora, random.choice(salas_libres)
+    
+    def obtener_estadisticas(self):
+        """
+        Devuelve estadísticas acumuladas de la reparación.
+        
+        Returns:
+            Diccionario con estadísticas
+        """
+        return {
+            "eventos_reubicados": self.eventos_reubicados,
+            "eventos_eliminados": self.eventos_eliminados,
+            "eventos_insertados": self.eventos_insertados
+        }
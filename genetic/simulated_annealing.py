@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Recocido simulado: alternativa de trayectoria única al algoritmo genético
+"""
+
+import math
+import random
+import time
+from model.problema import ProblemaCompilado
+from genetic.chromosomes import GeneradorCromosomas
+from genetic.local_search import Vecindario
+from genetic.repair import OperadorReparacion
+from config import GA_CONFIG, RECOCIDO_CONFIG
+
+class RecocidoSimulado:
+    """
+    Recocido simulado sobre un único horario. Usa los movimientos de los
+    operadores de mutación como vecindario y valora cada vecino con la
+    evaluación incremental del Evaluador. Los empeoramientos se aceptan con
+    probabilidad exp(-delta / T), y la temperatura T baja según un esquema de
+    enfriamiento geométrico o lineal. Como el vecindario solo mueve o
+    intercambia eventos, las horas que faltan se recuperan con el operador de
+    reparación sobre la solución inicial y sobre cada nueva mejor solución.
+    """
+    
+    ENFRIAMIENTOS = ("geometrico", "lineal")
+    
+    def __init__(self, profesores, materias_secciones, salas, evaluador,
+                 temperatura_inicial=None, temperatura_final=None, enfriamiento=None,
+                 alfa=None, iteraciones_por_temperatura=None, max_iteraciones=None,
+                 solucion_inicial=None, reparar=None, criterio_parada_fitness=None):
+        """
+        Inicializa el recocido simulado.
+        
+        Args:
+            profesores: Lista de objetos Profesor
+            materias_secciones: Lista de objetos MateriaSecciones
+            salas: Lista de objetos Sala
+            evaluador: Objeto Evaluador con restricciones incrementales
+            temperatura_inicial: Temperatura inicial (None para estimarla)
+            temperatura_final: Temperatura a la que se detiene la búsqueda
+            enfriamiento: "geometrico" (T = alfa * T) o "lineal" (T baja un paso fijo)
+            alfa: Factor del enfriamiento geométrico
+            iteraciones_por_temperatura: Vecinos probados en cada temperatura
+            max_iteraciones: Número máximo de vecinos probados
+            solucion_inicial: Objeto Horario de partida (por defecto se genera
+                              con el generador constructivo)
+            reparar: Si se aplica el operador de reparación (por defecto,
+                     RECOCIDO_CONFIG["reparar"])
+            criterio_parada_fitness: Fracción del fitness base con la que se da por
+                                     encontrada la solución (por defecto, la del GA)
+        """
+        self.profesores = profesores
+        self.materias_secciones = materias_secciones
+        self.salas = salas
+        self.evaluador = evaluador
+        
+        # Problema compilado: catálogo para la evaluación y salas adecuadas del vecindario
+        self.problema = ProblemaCompilado(profesores, materias_secciones, salas)
+        if self.evaluador.catalogo is None:
+            self.evaluador.catalogo = self.problema
+        
+        # Configuración
+        self.temperatura_inicial = (temperatura_inicial if temperatura_inicial is not None
+                                    else RECOCIDO_CONFIG["temperatura_inicial"])
+        self.temperatura_final = temperatura_final or RECOCIDO_CONFIG["temperatura_final"]
+        self.enfriamiento = enfriamiento or RECOCIDO_CONFIG["enfriamiento"]
+        self.alfa = alfa or RECOCIDO_CONFIG["alfa"]
+        self.iteraciones_por_temperatura = (iteraciones_por_temperatura or
+                                            RECOCIDO_CONFIG["iteraciones_por_temperatura"])
+        self.max_iteraciones = max_iteraciones or RECOCIDO_CONFIG["max_iteraciones"]
+        self.criterio_parada_fitness = criterio_parada_fitness or GA_CONFIG["criterio_parada_fitness"]
+        
+        if self.enfriamiento not in self.ENFRIAMIENTOS:
+            raise ValueError(f"Esquema de enfriamiento desconocido: {self.enfriamiento}")
+        
+        self.generador = GeneradorCromosomas(profesores, materias_secciones, salas, self.problema)
+        self.vecindario = Vecindario(self.evaluador, self.problema)
+        self.solucion_inicial = solucion_inicial
+        if reparar is None:
+            reparar = RECOCIDO_CONFIG["reparar"]
+        self.operador_reparacion = OperadorReparacion(self.problema) if reparar else None
+        
+        # Resultados
+        self.mejor_individuo = None
+        self.mejor_fitness = 0
+        self.historia_fitness = []
+        self.iteraciones = 0
+        self.aceptados = 0
+    
+    def _estimar_temperatura(self, horario, muestras=200):
+        """
+        Estima la temperatura inicial para que un empeoramiento medio se acepte
+        con la probabilidad RECOCIDO_CONFIG["aceptacion_inicial"].
+        
+        Args:
+            horario: Objeto Horario evaluado
+            muestras: Número de vecinos aleatorios a valorar
+            
+        Returns:
+            Temperatura inicial
+        """
+        penalizacion = self.evaluador.penalizacion(horario.medidas)
+        en_conflicto = self.vecindario.eventos_en_conflicto(horario)
+        
+        empeoramientos = []
+        for _ in range(muestras):
+            vecino = self.vecindario.generar(horario, en_conflicto)
+            if vecino is None:
+                continue
+            medidas = self.evaluador.evaluar_movimientos(horario, vecino[2])
+            delta = self.evaluador.penalizacion(medidas) - penalizacion
+            if delta > 0:
+                empeoramientos.append(delta)
+        
+        if not empeoramientos:
+            return 1.0
+        
+        media = sum(empeoramientos) / len(empeoramientos)
+        return -media / math.log(RECOCIDO_CONFIG["aceptacion_inicial"])
+    
+    def _reparar(self, horario, penalizacion):
+        """
+        Repara una copia del horario y la devuelve si no empeora la penalización.
+        
+        Args:
+            horario: Objeto Horario evaluado
+            penalizacion: Penalización del horario
+            
+        Returns:
+            Tupla (horario, penalización) con el horario reparado o el original
+        """
+        if self.operador_reparacion is None:
+            return horario, penalizacion
+        
+        reparado = horario.clonar()
+        if not self.operador_reparacion.reparar(reparado):
+            return horario, penalizacion
+        
+        self.evaluador.evaluar(reparado)
+        nueva_penalizacion = self.evaluador.penalizacion(reparado.medidas)
+        if nueva_penalizacion <= penalizacion:
+            return reparado, nueva_penalizacion
+        return horario, penalizacion
+    
+    def _enfriar(self, temperatura, paso_lineal):
+        """
+        Calcula la temperatura del siguiente nivel.
+        
+        Args:
+            temperatura: Temperatura actual
+            paso_lineal: Descenso por nivel del enfriamiento lineal
+            
+        Returns:
+            Nueva temperatura
+        """
+        if self.enfriamiento == "geometrico":
+            return temperatura * self.alfa
+        return temperatura - paso_lineal
+    
+    def ejecutar(self):
+        """
+        Ejecuta el recocido simulado.
+        
+        Returns:
+            Mejor horario encontrado
+        """
+        restricciones = self.evaluador.restricciones_duras + self.evaluador.restricciones_blandas
+        if not all(r.incremental for r in restricciones):
+            raise ValueError("El recocido simulado necesita restricciones con evaluación incremental")
+        
+        print("Generando solución inicial...")
+        actual = self.solucion_inicial or self.generador.generar_constructivo()
+        if actual.medidas is None:
+            self.evaluador.evaluar(actual)
+        
+        penalizacion = self.evaluador.penalizacion(actual.medidas)
+        actual, penalizacion = self._reparar(actual, penalizacion)
+        mejor_penalizacion = penalizacion
+        self.mejor_individuo = actual.clonar()
+        self.mejor_fitness = actual.fitness
+        print(f"Solución inicial generada. Fitness: {self.mejor_fitness}")
+        
+        temperatura = self.temperatura_inicial or self._estimar_temperatura(actual)
+        num_niveles = max(1, self.max_iteraciones // self.iteraciones_por_temperatura)
+        paso_lineal = (temperatura - self.temperatura_final) / num_niveles
+        
+        criterio_fitness = self.criterio_parada_fitness * self.evaluador.base_fitness
+        
+        inicio = time.time()
+        self.iteraciones = 0
+        self.aceptados = 0
+        self.historia_fitness = [(0, self.mejor_fitness)]
+        en_conflicto = self.vecindario.eventos_en_conflicto(actual)
+        
+        while (temperatura > self.temperatura_final and self.iteraciones < self.max_iteraciones
+               and mejor_penalizacion > 0 and self.mejor_fitness < criterio_fitness):
+            for _ in range(self.iteraciones_por_temperatura):
+                self.iteraciones += 1
+                
+                vecino = self.vecindario.generar(actual, en_conflicto)
+                if vecino is None:
+                    continue
+                
+                medidas = self.evaluador.evaluar_movimientos(actual, vecino[2])
+                nueva_penalizacion = self.evaluador.penalizacion(medidas)
+                delta = nueva_penalizacion - penalizacion
+                
+                # Criterio de Metropolis
+                if delta > 0 and random.random() >= math.exp(-delta / temperatura):
+                    continue
+                
+                self.vecindario.aplicar(actual, vecino, medidas)
+                penalizacion = nueva_penalizacion
+                self.aceptados += 1
+                
+                if en_conflicto:
+                    en_conflicto = self.vecindario.eventos_en_conflicto(actual)
+                
+                if penalizacion < mejor_penalizacion:
+                    actual, penalizacion = self._reparar(actual, penalizacion)
+                    en_conflicto = self.vecindario.eventos_en_conflicto(actual)
+                    mejor_penalizacion = penalizacion
+                    self.mejor_individuo = actual.clonar()
+                    self.mejor_fitness = actual.fitness
+            
+            self.historia_fitness.append((self.iteraciones, self.mejor_fitness))
+            
+            # Mostrar progreso
+            if len(self.historia_fitness) % 10 == 0:
+                print(f"Iteración {self.iteraciones}: T = {temperatura:.3f}, "
+                      f"Mejor fitness = {self.mejor_fitness:.2f}, "
+                      f"Tiempo = {time.time() - inicio:.2f}s")
+            
+            temperatura = self._enfriar(temperatura, paso_lineal)
+        
+        tiempo_total = time.time() - inicio
+        print(f"Recocido simulado finalizado tras {self.iteraciones} iteraciones. "
+              f"Tiempo total: {tiempo_total:.2f}s")
+        print(f"Mejor fitness alcanzado: {self.mejor_fitness}")
+        
+        return self.mejor_individuo
+    
+    def obtener_estadisticas(self):
+        """
+        Devuelve estadísticas sobre la ejecución del recocido simulado.
+        
+        Returns:
+            Diccionario con estadísticas
+        """
+        return {
+            "iteraciones": self.iteraciones,
+            "aceptados": self.aceptados,
+            "mejor_fitness": self.mejor_fitness,
+            "historia_fitness": self.historia_fitness,
+            "evaluacion_detallada": self.evaluador.detallar_evaluacion(self.mejor_individuo) if self.mejor_individuo else None
+        }
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Operaciones vectorizadas con NumPy sobre eventos codificados.
+
+Las funciones trabajan sobre lotes: los eventos de varios horarios se apilan
+en un único arreglo y `individuos` indica a qué horario pertenece cada fila.
+"""
+
+import hashlib
+import numpy as np
+from model.horario_compacto import TIPO_MASCARA
+from config import NUM_DIAS, NUM_PERIODOS
+
+def huecos_mascara(mascara):
+    """
+    Calcula los huecos de una máscara diaria de horas ocupadas: períodos entre
+    el primer y el último bit activo menos los bits activos.
+    
+    Args:
+        mascara: Entero con el bit h activo si la hora h está ocupada
+        
+    Returns:
+        Número de huecos
+    """
+    if not mascara:
+        return 0
+    primero = (mascara & -mascara).bit_length() - 1
+    return mascara.bit_length() - primero - bin(mascara).count("1")
+
+
+# Huecos de cada máscara diaria posible, para consultarlos en bloque con NumPy
+TABLA_HUECOS = (np.array([huecos_mascara(m) for m in range(1 << NUM_PERIODOS)], dtype=np.int8)
+                if NUM_PERIODOS <= 16 else None)
+
+
+def claves_ocupacion(entidades, dias, horas):
+    """
+    Combina (entidad, día, hora) en una única clave entera por evento.
+    
+    Args:
+        entidades: Arreglo con el índice de la entidad (profesor, sala o grupo) de cada evento
+        dias: Arreglo con el día de cada evento
+        horas: Arreglo con la hora de cada evento
+        
+    Returns:
+        Arreglo int64 de claves
+    """
+    return (entidades.astype(np.int64) * NUM_DIAS + dias) * NUM_PERIODOS + horas
+
+
+def entidades_por_individuo(entidades, individuos, num_entidades):
+    """
+    Combina el índice de individuo con el de la entidad para que las claves de
+    horarios distintos nunca coincidan.
+    
+    Args:
+        entidades: Arreglo con el índice de la entidad de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_entidades: Número total de entidades del catálogo
+        
+    Returns:
+        Arreglo int64 con el índice combinado
+    """
+    return individuos.astype(np.int64) * num_entidades + entidades
+
+
+def contar_choques_lote(entidades, dias, horas, individuos, num_individuos, num_entidades):
+    """
+    Cuenta los choques de cada entidad consigo misma: por cada clave
+    (entidad, día, hora) con k eventos se cuentan k - 1 conflictos.
+    
+    Args:
+        entidades: Arreglo con el índice de la entidad de cada evento
+        dias: Arreglo con el día de cada evento
+        horas: Arreglo con la hora de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        num_entidades: Número total de entidades del catálogo
+        
+    Returns:
+        Arreglo con el número de conflictos de cada horario
+    """
+    if len(entidades) == 0:
+        return np.zeros(num_individuos, dtype=np.int64)
+    
+    claves = claves_ocupacion(entidades_por_individuo(entidades, individuos, num_entidades), dias, horas)
+    unicas = np.unique(claves)
+    individuo_unicas = unicas // (num_entidades * NUM_DIAS * NUM_PERIODOS)
+    
+    return (np.bincount(individuos, minlength=num_individuos) -
+            np.bincount(individuo_unicas, minlength=num_individuos))
+
+
+def contar_por_individuo(mascara, individuos, num_individuos):
+    """
+    Cuenta, para cada horario, los eventos que cumplen una condición.
+    
+    Args:
+        mascara: Arreglo booleano con la condición evaluada en cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        
+    Returns:
+        Arreglo con el número de eventos que cumplen la condición en cada horario
+    """
+    return np.bincount(individuos[mascara], minlength=num_individuos)
+
+
+def mascaras_lote(profesores, dias, horas, individuos, num_individuos, num_profesores):
+    """
+    Construye la máscara de horas ocupadas de cada profesor y día en cada horario.
+    
+    Args:
+        profesores: Arreglo con el índice del profesor de cada evento
+        dias: Arreglo con el día de cada evento
+        horas: Arreglo con la hora de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        num_profesores: Número total de profesores del catálogo
+        
+    Returns:
+        Arreglo de forma (num_individuos, num_profesores, NUM_DIAS) con las máscaras
+    """
+    mascaras = np.zeros(num_individuos * num_profesores * NUM_DIAS, dtype=TIPO_MASCARA)
+    claves = entidades_por_individuo(profesores, individuos, num_profesores) * NUM_DIAS + dias
+    bits = np.left_shift(1, horas.astype(np.int64)).astype(TIPO_MASCARA)
+    np.bitwise_or.at(mascaras, claves, bits)
+    return mascaras.reshape(num_individuos, num_profesores, NUM_DIAS)
+
+
+def huecos_lote(profesores, dias, horas, individuos, num_individuos, num_profesores):
+    """
+    Calcula el total de huecos de los profesores de cada horario. Para cada
+    (profesor, día) los huecos son los períodos libres entre la primera y la
+    última hora ocupada, que se leen de una tabla indexada por la máscara diaria.
+    
+    Args:
+        profesores: Arreglo con el índice del profesor de cada evento
+        dias: Arreglo con el día de cada evento
+        horas: Arreglo con la hora de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        num_profesores: Número total de profesores del catálogo
+        
+    Returns:
+        Arreglo con el total de huecos de cada horario
+    """
+    if len(profesores) == 0:
+        return np.zeros(num_individuos, dtype=np.int64)
+    
+    if TABLA_HUECOS is None:
+        return _huecos_lote_ordenado(profesores, dias, horas, individuos, num_individuos, num_profesores)
+    
+    mascaras = mascaras_lote(profesores, dias, horas, individuos, num_individuos, num_profesores)
+    return TABLA_HUECOS[mascaras].sum(axis=(1, 2), dtype=np.int64)
+
+
+def _huecos_lote_ordenado(profesores, dias, horas, individuos, num_individuos, num_profesores):
+    """
+    Versión de huecos_lote para días con demasiados períodos para la tabla de
+    huecos: ordena las horas ocupadas y mide cada grupo (individuo, profesor, día).
+    
+    Args:
+        profesores: Arreglo con el índice del profesor de cada evento
+        dias: Arreglo con el día de cada evento
+        horas: Arreglo con la hora de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        num_profesores: Número total de profesores del catálogo
+        
+    Returns:
+        Arreglo con el total de huecos de cada horario
+    """
+    # Horas distintas ocupadas, ordenadas por (individuo, profesor, día, hora)
+    unicas = np.unique(claves_ocupacion(entidades_por_individuo(profesores, individuos, num_profesores),
+                                        dias, horas))
+    grupos = unicas // NUM_PERIODOS
+    horas_unicas = unicas % NUM_PERIODOS
+    
+    # Límites de cada grupo (individuo, profesor, día)
+    inicios = np.flatnonzero(np.r_[True, grupos[1:] != grupos[:-1]])
+    finales = np.r_[inicios[1:], len(unicas)]
+    
+    ocupadas = finales - inicios
+    huecos = horas_unicas[finales - 1] - horas_unicas[inicios] + 1 - ocupadas
+    individuo_grupos = grupos[inicios] // (num_profesores * NUM_DIAS)
+    
+    return np.bincount(individuo_grupos, weights=huecos, minlength=num_individuos).astype(np.int64)
+
+
+def carga_diaria_lote(profesores, dias, individuos, num_individuos, num_profesores):
+    """
+    Cuenta los eventos de cada profesor por día en cada horario.
+    
+    Args:
+        profesores: Arreglo con el índice del profesor de cada evento
+        dias: Arreglo con el día de cada evento
+        individuos: Arreglo con el índice del horario de cada evento
+        num_individuos: Número de horarios del lote
+        num_profesores: Número total de profesores del catálogo
+        
+    Returns:
+        Arreglo de forma (num_individuos, num_profesores, NUM_DIAS)
+    """
+    claves = entidades_por_individuo(profesores, individuos, num_profesores) * NUM_DIAS + dias
+    conteo = np.bincount(claves, minlength=num_individuos * num_profesores * NUM_DIAS)
+    return conteo.reshape(num_individuos, num_profesores, NUM_DIAS)
+
+
+def huella_eventos(eventos):
+    """
+    Calcula una huella del contenido de un horario codificado que no depende
+    del orden de los eventos: dos horarios con los mismos eventos tienen la
+    misma huella.
+    
+    Args:
+        eventos: Arreglo de eventos codificados de forma (n, NUM_COLUMNAS)
+        
+    Returns:
+        Huella como bytes
+    """
+    eventos = np.ascontiguousarray(eventos, dtype=np.int32)
+    ordenados = eventos[np.lexsort(eventos.T[::-1])] if len(eventos) else eventos
+    return hashlib.blake2b(ordenados.tobytes(), digest_size=16).digest()
@@ -10,7 +10,7 @@ import os
 import time
 import random
 import copy
-from utils.data_loader import DataLoader
+from utils.instance_cache import cargar_con_cache
 from model.horario import Horario
 from genetic.genetic_algorithm import GeneticAlgorithm
 from genetic.fitness import Evaluador
@@ -21,6 +21,7 @@ from genetic.constraints import (
     ProfesorMinHoras,
     SalaNivelCorrecto,
     AsignacionEspecifica,
+    HorasCompletas,
     MinimizarHuecos,
     DistribucionEquilibrada
 )
@@ -35,15 +36,12 @@ def main():
     
     print("Inicializando sistema de generación de horarios...")
     
-    # Cargar datos desde los archivos Excel
-    data_loader = DataLoader()
+    # Cargar datos desde la caché o, si los archivos Excel han cambiado, desde los archivos
+    # (la disponibilidad de los profesores se establece con los datos de materias)
     print("Cargando datos de profesores, materias y salas...")
-    profesores = data_loader.cargar_profesores("db/Profesor.xlsx")
-    materias_secciones = data_loader.cargar_materias_secciones("db/tabla_minable.xlsx")
-    salas = data_loader.cargar_salas("db/Sala.xlsx")
-    
-    # Establecer disponibilidad de profesores basado en los datos de materias
-    profesores = data_loader.establecer_disponibilidad_profesores(profesores, "db/tabla_minable.xlsx")
+    profesores, materias_secciones, salas = cargar_con_cache(
+        "db/Profesor.xlsx", "db/tabla_minable.xlsx", "db/Sala.xlsx"
+    )
     
     print(f"Datos cargados: {len(profesores)} profesores, {len(materias_secciones)} materias/secciones, {len(salas)} salas")
     
@@ -54,7 +52,8 @@ def main():
         GrupoNoSimultaneo(peso=1000),
         ProfesorMinHoras(peso=1000),
         SalaNivelCorrecto(peso=1000),
-        AsignacionEspecifica(peso=1000)
+        AsignacionEspecifica(peso=1000),
+        HorasCompletas(peso=1000, materias_secciones=materias_secciones)
     ]
     
     restricciones_blandas = [
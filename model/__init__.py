@@ -2,4 +2,7 @@ from model.profesor import Profesor
 from model.materia import Materia, MateriaSecciones
 from model.sala import Sala
 from model.evento import Evento
-from model.horario import Horario
\ No newline at end of file
+from model.horario import Horario
+from model.catalogo import Catalogo
+from model.horario_compacto import HorarioCompacto
+from model.problema import ProblemaCompilado
\ No newline at end of file
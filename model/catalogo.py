@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Catálogo de índices enteros para la codificación compacta de horarios
+"""
+
+import numpy as np
+from model.evento import Evento
+from config import NUM_DIAS, NUM_PERIODOS
+
+# Columnas de un evento codificado
+COL_PROFESOR = 0
+COL_SECCION = 1
+COL_SALA = 2
+COL_DIA = 3
+COL_HORA = 4
+NUM_COLUMNAS = 5
+
+class Catalogo:
+    """
+    Clase que asigna índices enteros consecutivos a profesores, materias-secciones
+    y salas, de modo que un evento pueda representarse como una fila de enteros
+    (profesor, materia-sección, sala, día, hora).
+    """
+    
+    # Valor de seccion_profesor_especifico para secciones sin profesor específico
+    SIN_PROFESOR = -1
+    # Valor para secciones cuyo profesor específico no está en el catálogo
+    PROFESOR_DESCONOCIDO = -2
+    
+    def __init__(self, profesores, materias_secciones, salas):
+        """
+        Inicializa el catálogo con los datos del problema.
+        
+        Args:
+            profesores: Lista de objetos Profesor
+            materias_secciones: Lista de objetos MateriaSecciones
+            salas: Lista de objetos Sala
+        """
+        self.profesores = list(profesores)
+        self.materias_secciones = list(materias_secciones)
+        self.salas = list(salas)
+        
+        # Mapeos de identificador a índice
+        self._indice_profesor = {p.id: i for i, p in enumerate(self.profesores)}
+        self._indice_sala = {s.id: i for i, s in enumerate(self.salas)}
+        
+        # Las materias-secciones no tienen ID propio: se indexan por identidad,
+        # con respaldo por (materia, sección) para copias de los objetos originales
+        self._indice_seccion = {id(ms): i for i, ms in enumerate(self.materias_secciones)}
+        self._indice_seccion_clave = {}
+        for i, ms in enumerate(self.materias_secciones):
+            self._indice_seccion_clave.setdefault((ms.materia.id, ms.seccion), i)
+        
+        # Grupos (valor de la sección) usados por la restricción de simultaneidad de grupo
+        self.grupos = []
+        self._indice_grupo = {}
+        grupo_seccion = []
+        for ms in self.materias_secciones:
+            if ms.seccion not in self._indice_grupo:
+                self._indice_grupo[ms.seccion] = len(self.grupos)
+                self.grupos.append(ms.seccion)
+            grupo_seccion.append(self._indice_grupo[ms.seccion])
+        self.grupo_seccion = np.array(grupo_seccion, dtype=np.int32)
+        
+        # Atributos por índice usados por las restricciones vectorizadas
+        self.profesor_con_item = np.array([bool(p.tiene_item) for p in self.profesores], dtype=bool)
+        self.sala_infantil = np.array([s.nivel == "infantil" for s in self.salas], dtype=bool)
+        self.seccion_infantil = np.array([ms.materia.nivel == "infantil" for ms in self.materias_secciones],
+                                         dtype=bool)
+        self.horas_requeridas = np.array([ms.materia.horas_semanales for ms in self.materias_secciones],
+                                         dtype=np.int32)
+        self.seccion_profesor_especifico = np.array([
+            self.SIN_PROFESOR if ms.profesor_especifico is None
+            else self._indice_profesor.get(ms.profesor_especifico, self.PROFESOR_DESCONOCIDO)
+            for ms in self.materias_secciones
+        ], dtype=np.int32)
+        
+        # Tipo entero más pequeño capaz de representar todos los índices
+        mayor = max(len(self.profesores), len(self.materias_secciones), len(self.salas),
+                    NUM_DIAS, NUM_PERIODOS)
+        self.dtype = np.int16 if mayor <= np.iinfo(np.int16).max else np.int32
+    
+    def indice_profesor(self, profesor_id):
+        """
+        Obtiene el índice de un profesor.
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Índice entero del profesor en el catálogo, o None si no existe
+        """
+        return self._indice_profesor.get(profesor_id)
+    
+    def indice_seccion(self, materia_seccion):
+        """
+        Obtiene el índice de una materia-sección.
+        
+        Args:
+            materia_seccion: Objeto MateriaSecciones
+            
+        Returns:
+            Índice entero de la materia-sección en el catálogo
+        """
+        indice = self._indice_seccion.get(id(materia_seccion))
+        if indice is None:
+            indice = self._indice_seccion_clave[(materia_seccion.materia.id, materia_seccion.seccion)]
+        return indice
+    
+    def indice_sala(self, sala_id):
+        """
+        Obtiene el índice de una sala.
+        
+        Args:
+            sala_id: ID de la sala
+            
+        Returns:
+            Índice entero de la sala en el catálogo, o None si no existe
+        """
+        return self._indice_sala.get(sala_id)
+    
+    def indice_grupo(self, seccion):
+        """
+        Obtiene el índice de un grupo a partir del identificador de sección.
+        
+        Args:
+            seccion: Identificador de la sección o grupo
+            
+        Returns:
+            Índice entero del grupo, o None si no existe
+        """
+        return self._indice_grupo.get(seccion)
+    
+    def codificar_evento(self, evento):
+        """
+        Codifica un evento como una tupla de enteros.
+        
+        Args:
+            evento: Objeto Evento a codificar
+            
+        Returns:
+            Tupla (profesor, materia-sección, sala, día, hora)
+        """
+        return (
+            self._indice_profesor[evento.profesor.id],
+            self.indice_seccion(evento.materia_seccion),
+            self._indice_sala[evento.sala.id],
+            evento.dia,
+            evento.hora
+        )
+    
+    def codificar(self, eventos):
+        """
+        Codifica una lista de eventos como arreglo de enteros.
+        
+        Args:
+            eventos: Lista de objetos Evento
+            
+        Returns:
+            Arreglo de NumPy de forma (len(eventos), NUM_COLUMNAS)
+        """
+        if not eventos:
+            return np.empty((0, NUM_COLUMNAS), dtype=self.dtype)
+        
+        return np.array([self.codificar_evento(e) for e in eventos], dtype=self.dtype)
+    
+    def decodificar_evento(self, fila):
+        """
+        Reconstruye un evento a partir de su fila codificada.
+        
+        Args:
+            fila: Secuencia (profesor, materia-sección, sala, día, hora)
+            
+        Returns:
+            Objeto Evento que referencia los objetos del catálogo
+        """
+        return Evento(
+            self.profesores[fila[COL_PROFESOR]],
+            self.materias_secciones[fila[COL_SECCION]],
+            self.salas[fila[COL_SALA]],
+            int(fila[COL_DIA]),
+            int(fila[COL_HORA])
+        )
+    
+    def decodificar(self, datos):
+        """
+        Reconstruye una lista de eventos a partir de un arreglo codificado.
+        
+        Args:
+            datos: Arreglo de forma (n, NUM_COLUMNAS)
+            
+        Returns:
+            Lista de objetos Evento
+        """
+        return [self.decodificar_evento(fila) for fila in np.asarray(datos).tolist()]
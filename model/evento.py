@@ -29,6 +29,15 @@ class Evento:
         self.dia = dia
         self.hora = hora
     
+    def copiar(self):
+        """
+        Crea una copia del evento que comparte el profesor, la materia-sección y la sala.
+        
+        Returns:
+            Nuevo objeto Evento con las mismas asignaciones
+        """
+        return Evento(self.profesor, self.materia_seccion, self.sala, self.dia, self.hora)
+    
     def get_key(self):
         """
         Genera una clave única para el evento.
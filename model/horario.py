@@ -7,6 +7,7 @@ Clase para representar un horario completo en el sistema de generación de horar
 
 import random
 import copy
+from collections import Counter
 from config import NUM_DIAS, NUM_PERIODOS
 
 class Horario:
@@ -25,15 +26,36 @@ class Horario:
         self.eventos = eventos if eventos else []
         self.fitness = 0
         
-        # Diccionarios para búsqueda rápida de conflictos
-        self._map_profesor_dia_hora = {}  # (profesor_id, dia, hora) -> evento
-        self._map_sala_dia_hora = {}      # (sala_id, dia, hora) -> evento
-        self._map_seccion_dia_hora = {}   # (seccion, dia, hora) -> evento
+        # Medidas por restricción de la última evaluación (None si debe reevaluarse)
+        self.medidas = None
+        
+        self._inicializar_indices()
         
         # Actualizar índices si hay eventos
         if self.eventos:
             self._actualizar_indices()
     
+    def _inicializar_indices(self):
+        """
+        Crea vacíos los índices internos del horario.
+        """
+        # Eventos agrupados por entidad
+        self._eventos_profesor = {}  # profesor_id -> [eventos]
+        self._eventos_sala = {}      # sala_id -> [eventos]
+        self._eventos_seccion = {}   # seccion -> [eventos]
+        
+        # Ocupación diaria como máscara de bits (bit h activo si la hora h está ocupada)
+        self._mascara_profesor = {}  # (profesor_id, dia) -> máscara
+        self._mascara_sala = {}      # (sala_id, dia) -> máscara
+        self._mascara_seccion = {}   # (seccion, dia) -> máscara
+        
+        # Contadores de ocupación para la evaluación incremental
+        self._conteo_profesor = Counter()  # (profesor_id, dia, hora) -> eventos
+        self._conteo_sala = Counter()      # (sala_id, dia, hora) -> eventos
+        self._conteo_seccion = Counter()   # (seccion, dia, hora) -> eventos
+        self._carga_profesor = Counter()   # (profesor_id, dia) -> eventos
+        self._horas_seccion = Counter()    # (materia_id, seccion) -> eventos
+    
     def agregar_evento(self, evento):
         """
         Agrega un evento al horario.
@@ -56,19 +78,11 @@ class Horario:
         
         # Agregar evento
         self.eventos.append(evento)
+        self.medidas = None
         
-        # Actualizar índices
-        profesor_key = (evento.profesor.id, evento.dia, evento.hora)
-        sala_key = (evento.sala.id, evento.dia, evento.hora)
-        seccion_key = (evento.materia_seccion.seccion, evento.dia, evento.hora)
-        
-        self._map_profesor_dia_hora[profesor_key] = evento
-        self._map_sala_dia_hora[sala_key] = evento
-        self._map_seccion_dia_hora[seccion_key] = evento
-        
-        # Actualizar contadores
-        evento.profesor.incrementar_horas()
-        evento.materia_seccion.incrementar_horas()
+        # Actualizar índices (las horas por profesor y materia-sección son propias
+        # del horario: los objetos del catálogo no se modifican)
+        self._indexar_evento(evento)
         
         return True
     
@@ -82,8 +96,7 @@ class Horario:
         Returns:
             Boolean: True si hay conflicto, False en caso contrario
         """
-        profesor_key = (evento.profesor.id, evento.dia, evento.hora)
-        return profesor_key in self._map_profesor_dia_hora
+        return bool(self._mascara_profesor.get((evento.profesor.id, evento.dia), 0) >> evento.hora & 1)
     
     def tiene_conflicto_sala(self, evento):
         """
@@ -95,8 +108,7 @@ class Horario:
         Returns:
             Boolean: True si hay conflicto, False en caso contrario
         """
-        sala_key = (evento.sala.id, evento.dia, evento.hora)
-        return sala_key in self._map_sala_dia_hora
+        return bool(self._mascara_sala.get((evento.sala.id, evento.dia), 0) >> evento.hora & 1)
     
     def tiene_conflicto_grupo(self, evento):
         """
@@ -108,8 +120,7 @@ class Horario:
         Returns:
             Boolean: True si hay conflicto, False en caso contrario
         """
-        seccion_key = (evento.materia_seccion.seccion, evento.dia, evento.hora)
-        return seccion_key in self._map_seccion_dia_hora
+        return bool(self._mascara_seccion.get((evento.materia_seccion.seccion, evento.dia), 0) >> evento.hora & 1)
     
     def obtener_eventos_profesor(self, profesor_id):
         """
@@ -121,7 +132,7 @@ class Horario:
         Returns:
             Lista de eventos del profesor
         """
-        return [e for e in self.eventos if e.profesor.id == profesor_id]
+        return list(self._eventos_profesor.get(profesor_id, []))
     
     def obtener_eventos_sala(self, sala_id):
         """
@@ -133,7 +144,7 @@ class Horario:
         Returns:
             Lista de eventos en la sala
         """
-        return [e for e in self.eventos if e.sala.id == sala_id]
+        return list(self._eventos_sala.get(sala_id, []))
     
     def obtener_eventos_seccion(self, seccion):
         """
@@ -145,12 +156,13 @@ class Horario:
         Returns:
             Lista de eventos de la sección
         """
-        return [e for e in self.eventos if e.materia_seccion.seccion == seccion]
+        return list(self._eventos_seccion.get(seccion, []))
     
     def obtener_huecos_profesor(self, profesor_id):
         """
         Calcula los "huecos" en el horario de un profesor.
         Un hueco es un período libre entre dos períodos ocupados en el mismo día.
+        Se calcula con la máscara de ocupación diaria del profesor.
         
         Args:
             profesor_id: ID del profesor
@@ -158,56 +170,460 @@ class Horario:
         Returns:
             Número total de huecos
         """
-        eventos_profesor = self.obtener_eventos_profesor(profesor_id)
-        if not eventos_profesor:
-            return 0
-        
         huecos = 0
         
-        # Agrupar eventos por día
-        eventos_por_dia = {}
-        for e in eventos_profesor:
-            if e.dia not in eventos_por_dia:
-                eventos_por_dia[e.dia] = []
-            eventos_por_dia[e.dia].append(e.hora)
-        
-        # Contar huecos para cada día
-        for dia, horas in eventos_por_dia.items():
-            if len(horas) <= 1:
-                continue
-            
-            horas.sort()
-            for i in range(1, len(horas)):
-                if horas[i] - horas[i-1] > 1:
-                    huecos += horas[i] - horas[i-1] - 1
+        for dia in range(NUM_DIAS):
+            mascara = self._mascara_profesor.get((profesor_id, dia), 0)
+            if mascara:
+                # Períodos entre el primero y el último ocupado, menos los ocupados
+                primero = (mascara & -mascara).bit_length() - 1
+                huecos += mascara.bit_length() - primero - bin(mascara).count("1")
         
         return huecos
     
+    def ocupacion_profesor(self, profesor_id, dia, hora):
+        """
+        Cuenta los eventos de un profesor en un día y hora.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            hora: Índice de la hora
+            
+        Returns:
+            Número de eventos
+        """
+        return self._conteo_profesor.get((profesor_id, dia, hora), 0)
+    
+    def ocupacion_sala(self, sala_id, dia, hora):
+        """
+        Cuenta los eventos de una sala en un día y hora.
+        
+        Args:
+            sala_id: ID de la sala
+            dia: Índice del día
+            hora: Índice de la hora
+            
+        Returns:
+            Número de eventos
+        """
+        return self._conteo_sala.get((sala_id, dia, hora), 0)
+    
+    def ocupacion_grupo(self, seccion, dia, hora):
+        """
+        Cuenta los eventos de un grupo/sección en un día y hora.
+        
+        Args:
+            seccion: ID de la sección
+            dia: Índice del día
+            hora: Índice de la hora
+            
+        Returns:
+            Número de eventos
+        """
+        return self._conteo_seccion.get((seccion, dia, hora), 0)
+    
+    def carga_profesor(self, profesor_id, dia):
+        """
+        Cuenta los eventos de un profesor en un día.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            
+        Returns:
+            Número de eventos
+        """
+        return self._carga_profesor.get((profesor_id, dia), 0)
+    
+    def horas_profesor(self, profesor_id):
+        """
+        Cuenta las horas asignadas en este horario a un profesor.
+        A diferencia de Profesor.horas_asignadas, es propio del horario.
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Número de eventos del profesor
+        """
+        return len(self._eventos_profesor.get(profesor_id, ()))
+    
+    def horas_materia_seccion(self, materia_seccion):
+        """
+        Cuenta las horas asignadas en este horario a una materia-sección.
+        A diferencia de MateriaSecciones.horas_asignadas, es propio del horario.
+        
+        Args:
+            materia_seccion: Objeto MateriaSecciones
+            
+        Returns:
+            Número de eventos de la materia-sección
+        """
+        return self._horas_seccion.get((materia_seccion.materia.id, materia_seccion.seccion), 0)
+    
+    def mascara_profesor(self, profesor_id, dia):
+        """
+        Obtiene la máscara de horas ocupadas por un profesor en un día.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            
+        Returns:
+            Entero con el bit h activo si el profesor tiene clase en la hora h
+        """
+        return self._mascara_profesor.get((profesor_id, dia), 0)
+    
+    def mascara_sala(self, sala_id, dia):
+        """
+        Obtiene la máscara de horas ocupadas de una sala en un día.
+        
+        Args:
+            sala_id: ID de la sala
+            dia: Índice del día
+            
+        Returns:
+            Entero con el bit h activo si la sala está ocupada en la hora h
+        """
+        return self._mascara_sala.get((sala_id, dia), 0)
+    
+    def mascara_grupo(self, seccion, dia):
+        """
+        Obtiene la máscara de horas ocupadas de un grupo/sección en un día.
+        
+        Args:
+            seccion: ID de la sección
+            dia: Índice del día
+            
+        Returns:
+            Entero con el bit h activo si el grupo tiene clase en la hora h
+        """
+        return self._mascara_seccion.get((seccion, dia), 0)
+    
+    @staticmethod
+    def _ocupar(conteo, mascaras, entidad, dia, hora):
+        """
+        Suma un evento a la ocupación de una entidad.
+        
+        Args:
+            conteo: Contador (entidad, dia, hora) -> eventos
+            mascaras: Diccionario (entidad, dia) -> máscara de horas ocupadas
+            entidad: ID del profesor, sala o sección
+            dia: Índice del día
+            hora: Índice de la hora
+        """
+        conteo[(entidad, dia, hora)] += 1
+        mascaras[(entidad, dia)] = mascaras.get((entidad, dia), 0) | (1 << hora)
+    
+    @staticmethod
+    def _liberar(conteo, mascaras, entidad, dia, hora):
+        """
+        Resta un evento de la ocupación de una entidad. La hora solo queda
+        libre en la máscara cuando no le queda ningún evento.
+        
+        Args:
+            conteo: Contador (entidad, dia, hora) -> eventos
+            mascaras: Diccionario (entidad, dia) -> máscara de horas ocupadas
+            entidad: ID del profesor, sala o sección
+            dia: Índice del día
+            hora: Índice de la hora
+        """
+        clave = (entidad, dia, hora)
+        conteo[clave] -= 1
+        if conteo[clave] > 0:
+            return
+        
+        del conteo[clave]
+        mascara = mascaras[(entidad, dia)] & ~(1 << hora)
+        if mascara:
+            mascaras[(entidad, dia)] = mascara
+        else:
+            del mascaras[(entidad, dia)]
+    
+    def _indexar_evento(self, evento):
+        """
+        Registra un evento en los índices y contadores internos.
+        
+        Args:
+            evento: Objeto Evento a registrar
+        """
+        profesor_id = evento.profesor.id
+        sala_id = evento.sala.id
+        seccion = evento.materia_seccion.seccion
+        
+        self._eventos_profesor.setdefault(profesor_id, []).append(evento)
+        self._eventos_sala.setdefault(sala_id, []).append(evento)
+        self._eventos_seccion.setdefault(seccion, []).append(evento)
+        
+        self._ocupar(self._conteo_profesor, self._mascara_profesor, profesor_id, evento.dia, evento.hora)
+        self._ocupar(self._conteo_sala, self._mascara_sala, sala_id, evento.dia, evento.hora)
+        self._ocupar(self._conteo_seccion, self._mascara_seccion, seccion, evento.dia, evento.hora)
+        self._carga_profesor[(profesor_id, evento.dia)] += 1
+        self._horas_seccion[(evento.materia_seccion.materia.id, seccion)] += 1
+    
+    def _desindexar_evento(self, evento):
+        """
+        Elimina un evento de los índices y contadores internos. Debe llamarse
+        antes de modificar el día, la hora o la sala del evento.
+        
+        Args:
+            evento: Objeto Evento a eliminar de los índices
+        """
+        profesor_id = evento.profesor.id
+        sala_id = evento.sala.id
+        seccion = evento.materia_seccion.seccion
+        
+        self._eventos_profesor[profesor_id].remove(evento)
+        self._eventos_sala[sala_id].remove(evento)
+        self._eventos_seccion[seccion].remove(evento)
+        
+        self._liberar(self._conteo_profesor, self._mascara_profesor, profesor_id, evento.dia, evento.hora)
+        self._liberar(self._conteo_sala, self._mascara_sala, sala_id, evento.dia, evento.hora)
+        self._liberar(self._conteo_seccion, self._mascara_seccion, seccion, evento.dia, evento.hora)
+        
+        carga_key = (profesor_id, evento.dia)
+        self._carga_profesor[carga_key] -= 1
+        if not self._carga_profesor[carga_key]:
+            del self._carga_profesor[carga_key]
+        
+        seccion_key = (evento.materia_seccion.materia.id, seccion)
+        self._horas_seccion[seccion_key] -= 1
+        if not self._horas_seccion[seccion_key]:
+            del self._horas_seccion[seccion_key]
+    
+    def reubicar_evento(self, evento, dia, hora, sala):
+        """
+        Cambia el día, la hora y la sala de un evento del horario, actualizando
+        los índices solo para ese evento. No verifica conflictos (ver mover_evento,
+        cambiar_sala e intercambiar).
+        
+        Args:
+            evento: Objeto Evento del horario
+            dia: Nuevo día
+            hora: Nueva hora
+            sala: Nueva sala (objeto Sala)
+        """
+        self._desindexar_evento(evento)
+        evento.dia = dia
+        evento.hora = hora
+        evento.sala = sala
+        self._indexar_evento(evento)
+        self.medidas = None
+    
+    def quitar_evento(self, evento):
+        """
+        Elimina un evento del horario, deshaciendo lo que hizo agregar_evento.
+        
+        Args:
+            evento: Objeto Evento del horario
+        """
+        self._desindexar_evento(evento)
+        self.eventos.remove(evento)
+        self.medidas = None
+    
+    def puede_mover(self, evento, dia, hora):
+        """
+        Verifica, sin modificar el horario, si un evento puede pasar a otro día y hora
+        sin chocar con el profesor, la sala o el grupo de otro evento.
+        
+        Args:
+            evento: Objeto Evento del horario
+            dia: Nuevo día
+            hora: Nueva hora
+            
+        Returns:
+            Boolean: True si el movimiento es válido, False si no cambia nada o hay conflictos
+        """
+        if dia == evento.dia and hora == evento.hora:
+            return False
+        
+        bit = 1 << hora
+        return not (self._mascara_profesor.get((evento.profesor.id, dia), 0) & bit or
+                    self._mascara_sala.get((evento.sala.id, dia), 0) & bit or
+                    self._mascara_seccion.get((evento.materia_seccion.seccion, dia), 0) & bit)
+    
+    def puede_cambiar_sala(self, evento, sala):
+        """
+        Verifica, sin modificar el horario, si un evento puede pasar a otra sala.
+        
+        Args:
+            evento: Objeto Evento del horario
+            sala: Nueva sala (objeto Sala)
+            
+        Returns:
+            Boolean: True si la sala es distinta y está libre en el día y hora del evento
+        """
+        if sala.id == evento.sala.id:
+            return False
+        
+        return not self._mascara_sala.get((sala.id, evento.dia), 0) >> evento.hora & 1
+    
+    def puede_intercambiar(self, evento1, evento2):
+        """
+        Verifica, sin modificar el horario, si dos eventos pueden intercambiar
+        su día y hora. Cada evento se compara con la ocupación de la posición
+        del otro, descontando al otro evento, que la dejaría libre.
+        
+        Args:
+            evento1: Primer objeto Evento del horario
+            evento2: Segundo objeto Evento del horario
+            
+        Returns:
+            Boolean: True si el intercambio es válido, False si no cambia nada o hay conflictos
+        """
+        if evento1.dia == evento2.dia and evento1.hora == evento2.hora:
+            return False
+        
+        return not (self._conflicto_en_posicion_de(evento1, evento2) or
+                    self._conflicto_en_posicion_de(evento2, evento1))
+    
+    def _conflicto_en_posicion_de(self, evento, otro):
+        """
+        Verifica si un evento chocaría con algún evento distinto de otro
+        al ocupar el día y la hora de este.
+        
+        Args:
+            evento: Objeto Evento que se movería
+            otro: Objeto Evento que dejaría libre su posición
+            
+        Returns:
+            Boolean: True si habría conflicto
+        """
+        dia, hora = otro.dia, otro.hora
+        
+        profesor_id = evento.profesor.id
+        if self.ocupacion_profesor(profesor_id, dia, hora) - (otro.profesor.id == profesor_id) > 0:
+            return True
+        
+        sala_id = evento.sala.id
+        if self.ocupacion_sala(sala_id, dia, hora) - (otro.sala.id == sala_id) > 0:
+            return True
+        
+        seccion = evento.materia_seccion.seccion
+        return self.ocupacion_grupo(seccion, dia, hora) - (otro.materia_seccion.seccion == seccion) > 0
+    
+    def mover_evento(self, evento, dia, hora):
+        """
+        Mueve un evento a otro día y hora si no produce conflictos. La operación
+        es atómica: si no es válida, el horario queda sin cambios.
+        
+        Args:
+            evento: Objeto Evento del horario
+            dia: Nuevo día
+            hora: Nueva hora
+            
+        Returns:
+            Boolean: True si se movió el evento, False en caso contrario
+        """
+        if not self.puede_mover(evento, dia, hora):
+            return False
+        
+        self.reubicar_evento(evento, dia, hora, evento.sala)
+        return True
+    
+    def cambiar_sala(self, evento, sala):
+        """
+        Cambia la sala de un evento si está libre. La operación es atómica:
+        si no es válida, el horario queda sin cambios.
+        
+        Args:
+            evento: Objeto Evento del horario
+            sala: Nueva sala (objeto Sala)
+            
+        Returns:
+            Boolean: True si se cambió la sala, False en caso contrario
+        """
+        if not self.puede_cambiar_sala(evento, sala):
+            return False
+        
+        self.reubicar_evento(evento, evento.dia, evento.hora, sala)
+        return True
+    
+    def intercambiar(self, evento1, evento2):
+        """
+        Intercambia el día y la hora de dos eventos si no produce conflictos.
+        La operación es atómica: si no es válida, el horario queda sin cambios.
+        
+        Args:
+            evento1: Primer objeto Evento del horario
+            evento2: Segundo objeto Evento del horario
+            
+        Returns:
+            Boolean: True si se intercambiaron, False en caso contrario
+        """
+        if not self.puede_intercambiar(evento1, evento2):
+            return False
+        
+        self._desindexar_evento(evento1)
+        self._desindexar_evento(evento2)
+        
+        evento1.dia, evento2.dia = evento2.dia, evento1.dia
+        evento1.hora, evento2.hora = evento2.hora, evento1.hora
+        
+        self._indexar_evento(evento1)
+        self._indexar_evento(evento2)
+        self.medidas = None
+        return True
+    
     def _actualizar_indices(self):
         """
         Actualiza los índices internos para búsqueda rápida.
         """
-        self._map_profesor_dia_hora = {}
-        self._map_sala_dia_hora = {}
-        self._map_seccion_dia_hora = {}
+        self._inicializar_indices()
         
         for evento in self.eventos:
-            profesor_key = (evento.profesor.id, evento.dia, evento.hora)
-            sala_key = (evento.sala.id, evento.dia, evento.hora)
-            seccion_key = (evento.materia_seccion.seccion, evento.dia, evento.hora)
+            self._indexar_evento(evento)
+        
+        self.medidas = None
+    
+    @property
+    def modificado(self):
+        """
+        Indica si el horario cambió desde su última evaluación y debe reevaluarse.
+        """
+        return self.medidas is None
+    
+    def codificar(self, catalogo):
+        """
+        Codifica los eventos del horario como arreglo de enteros.
+        
+        Args:
+            catalogo: Objeto Catalogo que define los índices
             
-            self._map_profesor_dia_hora[profesor_key] = evento
-            self._map_sala_dia_hora[sala_key] = evento
-            self._map_seccion_dia_hora[seccion_key] = evento
+        Returns:
+            Arreglo de NumPy con una fila (profesor, materia-sección, sala, día, hora) por evento
+        """
+        return catalogo.codificar(self.eventos)
     
-    def clonar(self):
+    def clonar(self, profundo=False):
         """
-        Crea una copia profunda del horario.
+        Crea una copia del horario.
+        
+        Por defecto la copia comparte los objetos del catálogo (profesores,
+        materias-secciones y salas) y solo duplica los eventos y los índices,
+        que son el estado propio de cada horario.
         
+        Args:
+            profundo: Si es True, copia también todo el grafo de objetos (copy.deepcopy)
+            
         Returns:
             Nuevo objeto Horario con los mismos eventos
         """
-        return copy.deepcopy(self)
+        if profundo:
+            return copy.deepcopy(self)
+        
+        clon = Horario()
+        clon.fitness = self.fitness
+        clon.medidas = list(self.medidas) if self.medidas is not None else None
+        
+        # Copiar eventos y reconstruir índices apuntando a las copias
+        for evento in self.eventos:
+            copia = evento.copiar()
+            clon.eventos.append(copia)
+            clon._indexar_evento(copia)
+        
+        return clon
     
     def obtener_matriz_horario(self, tipo, id_elemento):
         """
@@ -223,17 +639,16 @@ class Horario:
         matriz = [[None for _ in range(NUM_PERIODOS)] for _ in range(NUM_DIAS)]
         
         if tipo == 'profesor':
-            for evento in self.eventos:
-                if evento.profesor.id == id_elemento:
-                    matriz[evento.dia][evento.hora] = evento
+            eventos = self._eventos_profesor.get(id_elemento, [])
         elif tipo == 'sala':
-            for evento in self.eventos:
-                if evento.sala.id == id_elemento:
-                    matriz[evento.dia][evento.hora] = evento
+            eventos = self._eventos_sala.get(id_elemento, [])
         elif tipo == 'seccion':
-            for evento in self.eventos:
-                if evento.materia_seccion.seccion == id_elemento:
-                    matriz[evento.dia][evento.hora] = evento
+            eventos = self._eventos_seccion.get(id_elemento, [])
+        else:
+            eventos = []
+        
+        for evento in eventos:
+            matriz[evento.dia][evento.hora] = evento
         
         return matriz
     
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Representación compacta de un horario como arreglo de enteros
+"""
+
+import numpy as np
+from model.horario import Horario
+from model.catalogo import (
+    COL_PROFESOR, COL_SECCION, COL_SALA, COL_DIA, COL_HORA, NUM_COLUMNAS
+)
+from config import NUM_DIAS, NUM_PERIODOS
+
+# Máscara de bits con un bit por período del día
+TIPO_MASCARA = np.uint16 if NUM_PERIODOS <= 16 else np.uint64
+
+CAPACIDAD_INICIAL = 64
+
+class HorarioCompacto:
+    """
+    Clase que representa un horario como un arreglo de enteros con una fila por
+    hora asignada (ver Catalogo para el significado de cada columna).
+    Ofrece la misma interfaz pública que Horario pero ocupa una fracción de su memoria.
+    """
+    
+    def __init__(self, catalogo, datos=None):
+        """
+        Inicializa un nuevo horario compacto.
+        
+        Args:
+            catalogo: Objeto Catalogo que define los índices
+            datos: Arreglo de eventos codificados (opcional)
+        """
+        self.catalogo = catalogo
+        self.fitness = 0
+        self.medidas = None
+        
+        self._datos = np.empty((CAPACIDAD_INICIAL, NUM_COLUMNAS), dtype=catalogo.dtype)
+        self._num_eventos = 0
+        
+        # Ocupación por entidad y día: bit h activo si el período h está ocupado
+        self._ocupacion_profesor = np.zeros((len(catalogo.profesores), NUM_DIAS), dtype=TIPO_MASCARA)
+        self._ocupacion_sala = np.zeros((len(catalogo.salas), NUM_DIAS), dtype=TIPO_MASCARA)
+        self._ocupacion_grupo = np.zeros((len(catalogo.grupos), NUM_DIAS), dtype=TIPO_MASCARA)
+        
+        # Horas asignadas a cada profesor y a cada materia-sección
+        self._horas_profesor = np.zeros(len(catalogo.profesores), dtype=np.int32)
+        self._horas_seccion = np.zeros(len(catalogo.materias_secciones), dtype=np.int32)
+        
+        if datos is not None:
+            for fila in np.asarray(datos).tolist():
+                self.agregar_fila(*fila)
+    
+    @classmethod
+    def desde_horario(cls, horario, catalogo):
+        """
+        Convierte un Horario basado en objetos a su representación compacta.
+        
+        Args:
+            horario: Objeto Horario a convertir
+            catalogo: Objeto Catalogo que define los índices
+            
+        Returns:
+            Nuevo objeto HorarioCompacto
+        """
+        compacto = cls(catalogo, horario.codificar(catalogo))
+        compacto.fitness = horario.fitness
+        return compacto
+    
+    def a_horario(self):
+        """
+        Convierte el horario compacto a un Horario basado en objetos.
+        
+        Returns:
+            Nuevo objeto Horario con eventos que referencian el catálogo
+        """
+        horario = Horario(self.eventos)
+        horario.fitness = self.fitness
+        return horario
+    
+    @property
+    def datos(self):
+        """
+        Arreglo de eventos codificados, de forma (len(self), NUM_COLUMNAS).
+        """
+        return self._datos[:self._num_eventos]
+    
+    @property
+    def eventos(self):
+        """
+        Lista de objetos Evento reconstruidos a partir de la codificación.
+        """
+        return self.catalogo.decodificar(self.datos)
+    
+    def agregar_evento(self, evento):
+        """
+        Agrega un evento al horario.
+        
+        Args:
+            evento: Objeto Evento a agregar
+            
+        Returns:
+            Boolean: True si se agregó correctamente, False si hay conflictos
+        """
+        return self.agregar_fila(*self.catalogo.codificar_evento(evento))
+    
+    def agregar_fila(self, profesor, seccion, sala, dia, hora):
+        """
+        Agrega un evento ya codificado al horario.
+        
+        Args:
+            profesor: Índice del profesor
+            seccion: Índice de la materia-sección
+            sala: Índice de la sala
+            dia: Índice del día
+            hora: Índice de la hora
+            
+        Returns:
+            Boolean: True si se agregó correctamente, False si hay conflictos
+        """
+        grupo = self.catalogo.grupo_seccion[seccion]
+        bit = 1 << hora
+        
+        # Verificar conflictos
+        if (int(self._ocupacion_profesor[profesor, dia]) & bit or
+            int(self._ocupacion_sala[sala, dia]) & bit or
+            int(self._ocupacion_grupo[grupo, dia]) & bit):
+            return False
+        
+        # Ampliar el arreglo si está lleno
+        if self._num_eventos == len(self._datos):
+            ampliado = np.empty((2 * len(self._datos), NUM_COLUMNAS), dtype=self._datos.dtype)
+            ampliado[:self._num_eventos] = self._datos
+            self._datos = ampliado
+        
+        self._datos[self._num_eventos] = (profesor, seccion, sala, dia, hora)
+        self._num_eventos += 1
+        self.medidas = None
+        
+        # Actualizar ocupación
+        self._ocupacion_profesor[profesor, dia] |= bit
+        self._ocupacion_sala[sala, dia] |= bit
+        self._ocupacion_grupo[grupo, dia] |= bit
+        self._horas_profesor[profesor] += 1
+        self._horas_seccion[seccion] += 1
+        
+        return True
+    
+    def tiene_conflicto_profesor(self, evento):
+        """
+        Verifica si hay conflicto de profesor con el evento dado.
+        
+        Args:
+            evento: Objeto Evento a verificar
+            
+        Returns:
+            Boolean: True si hay conflicto, False en caso contrario
+        """
+        profesor = self.catalogo.indice_profesor(evento.profesor.id)
+        if profesor is None:
+            return False
+        return bool(int(self._ocupacion_profesor[profesor, evento.dia]) >> evento.hora & 1)
+    
+    def tiene_conflicto_sala(self, evento):
+        """
+        Verifica si hay conflicto de sala con el evento dado.
+        
+        Args:
+            evento: Objeto Evento a verificar
+            
+        Returns:
+            Boolean: True si hay conflicto, False en caso contrario
+        """
+        sala = self.catalogo.indice_sala(evento.sala.id)
+        if sala is None:
+            return False
+        return bool(int(self._ocupacion_sala[sala, evento.dia]) >> evento.hora & 1)
+    
+    def tiene_conflicto_grupo(self, evento):
+        """
+        Verifica si hay conflicto de grupo/sección con el evento dado.
+        
+        Args:
+            evento: Objeto Evento a verificar
+            
+        Returns:
+            Boolean: True si hay conflicto, False en caso contrario
+        """
+        grupo = self.catalogo.indice_grupo(evento.materia_seccion.seccion)
+        if grupo is None:
+            return False
+        return bool(int(self._ocupacion_grupo[grupo, evento.dia]) >> evento.hora & 1)
+    
+    def _filas(self, tipo, id_elemento):
+        """
+        Selecciona las filas de los eventos de un profesor, sala o sección.
+        
+        Args:
+            tipo: Tipo de elemento ('profesor', 'sala', 'seccion')
+            id_elemento: ID del elemento
+            
+        Returns:
+            Arreglo con las filas seleccionadas
+        """
+        datos = self.datos
+        if tipo == 'profesor':
+            indice = self.catalogo.indice_profesor(id_elemento)
+            return datos[datos[:, COL_PROFESOR] == indice] if indice is not None else datos[:0]
+        if tipo == 'sala':
+            indice = self.catalogo.indice_sala(id_elemento)
+            return datos[datos[:, COL_SALA] == indice] if indice is not None else datos[:0]
+        if tipo == 'seccion':
+            indice = self.catalogo.indice_grupo(id_elemento)
+            if indice is None:
+                return datos[:0]
+            return datos[self.catalogo.grupo_seccion[datos[:, COL_SECCION]] == indice]
+        return datos[:0]
+    
+    def obtener_eventos_profesor(self, profesor_id):
+        """
+        Obtiene todos los eventos asignados a un profesor.
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Lista de eventos del profesor
+        """
+        return self.catalogo.decodificar(self._filas('profesor', profesor_id))
+    
+    def obtener_eventos_sala(self, sala_id):
+        """
+        Obtiene todos los eventos asignados a una sala.
+        
+        Args:
+            sala_id: ID de la sala
+            
+        Returns:
+            Lista de eventos en la sala
+        """
+        return self.catalogo.decodificar(self._filas('sala', sala_id))
+    
+    def obtener_eventos_seccion(self, seccion):
+        """
+        Obtiene todos los eventos asignados a una sección.
+        
+        Args:
+            seccion: ID de la sección
+            
+        Returns:
+            Lista de eventos de la sección
+        """
+        return self.catalogo.decodificar(self._filas('seccion', seccion))
+    
+    def obtener_huecos_profesor(self, profesor_id):
+        """
+        Calcula los "huecos" en el horario de un profesor a partir de su
+        máscara de ocupación diaria.
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Número total de huecos
+        """
+        indice = self.catalogo.indice_profesor(profesor_id)
+        if indice is None:
+            return 0
+        
+        huecos = 0
+        for mascara in self._ocupacion_profesor[indice].tolist():
+            if mascara:
+                # Períodos entre el primero y el último ocupado, menos los ocupados
+                primero = (mascara & -mascara).bit_length() - 1
+                huecos += mascara.bit_length() - primero - bin(mascara).count("1")
+        
+        return huecos
+    
+    def mascara_profesor(self, profesor_id, dia):
+        """
+        Obtiene la máscara de horas ocupadas por un profesor en un día.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            
+        Returns:
+            Entero con el bit h activo si el profesor tiene clase en la hora h
+        """
+        indice = self.catalogo.indice_profesor(profesor_id)
+        if indice is None:
+            return 0
+        return int(self._ocupacion_profesor[indice, dia])
+    
+    def carga_profesor(self, profesor_id, dia):
+        """
+        Cuenta los eventos de un profesor en un día. Como el horario compacto
+        no admite choques, coincide con el número de bits de su máscara.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            
+        Returns:
+            Número de eventos
+        """
+        return bin(self.mascara_profesor(profesor_id, dia)).count("1")
+    
+    def horas_profesor(self, profesor_id):
+        """
+        Cuenta las horas asignadas en este horario a un profesor.
+        
+        Args:
+            profesor_id: ID del profesor
+            
+        Returns:
+            Número de eventos del profesor
+        """
+        indice = self.catalogo.indice_profesor(profesor_id)
+        if indice is None:
+            return 0
+        return int(self._horas_profesor[indice])
+    
+    def horas_materia_seccion(self, materia_seccion):
+        """
+        Cuenta las horas asignadas en este horario a una materia-sección.
+        
+        Args:
+            materia_seccion: Objeto MateriaSecciones
+            
+        Returns:
+            Número de eventos de la materia-sección
+        """
+        return int(self._horas_seccion[self.catalogo.indice_seccion(materia_seccion)])
+    
+    @property
+    def modificado(self):
+        """
+        Indica si el horario cambió desde su última evaluación y debe reevaluarse.
+        """
+        return self.medidas is None
+    
+    def codificar(self, catalogo=None):
+        """
+        Devuelve la codificación entera del horario.
+        
+        Args:
+            catalogo: Ignorado; el horario ya está codificado con su propio catálogo
+            
+        Returns:
+            Arreglo de eventos codificados
+        """
+        return self.datos
+    
+    def clonar(self):
+        """
+        Crea una copia del horario que comparte el catálogo.
+        
+        Returns:
+            Nuevo objeto HorarioCompacto con los mismos eventos
+        """
+        clon = HorarioCompacto.__new__(HorarioCompacto)
+        clon.catalogo = self.catalogo
+        clon.fitness = self.fitness
+        clon.medidas = list(self.medidas) if self.medidas is not None else None
+        clon._datos = self._datos.copy()
+        clon._num_eventos = self._num_eventos
+        clon._ocupacion_profesor = self._ocupacion_profesor.copy()
+        clon._ocupacion_sala = self._ocupacion_sala.copy()
+        clon._ocupacion_grupo = self._ocupacion_grupo.copy()
+        clon._horas_profesor = self._horas_profesor.copy()
+        clon._horas_seccion = self._horas_seccion.copy()
+        return clon
+    
+    def obtener_matriz_horario(self, tipo, id_elemento):
+        """
+        Genera una matriz que representa el horario para un profesor, sala o sección.
+        
+        Args:
+            tipo: Tipo de elemento ('profesor', 'sala', 'seccion')
+            id_elemento: ID del elemento
+            
+        Returns:
+            Matriz de NUM_DIAS x NUM_PERIODOS con los eventos o None en cada celda
+        """
+        matriz = [[None for _ in range(NUM_PERIODOS)] for _ in range(NUM_DIAS)]
+        
+        for fila in self._filas(tipo, id_elemento).tolist():
+            matriz[fila[COL_DIA]][fila[COL_HORA]] = self.catalogo.decodificar_evento(fila)
+        
+        return matriz
+    
+    def __len__(self):
+        """
+        Devuelve el número de eventos en el horario.
+        
+        Returns:
+            Número de eventos
+        """
+        return self._num_eventos
+    
+    def __str__(self):
+        """
+        Representación en string del horario.
+        
+        Returns:
+            String con información básica del horario
+        """
+        return f"HorarioCompacto con {self._num_eventos} eventos, fitness: {self.fitness}"
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Problema compilado: dominios precalculados de cada materia-sección
+"""
+
+import numpy as np
+from model.catalogo import Catalogo
+from model.horario_compacto import TIPO_MASCARA
+from config import NUM_DIAS, NUM_PERIODOS
+
+class ProblemaCompilado(Catalogo):
+    """
+    Catálogo ampliado con los dominios de cada materia-sección, calculados una
+    sola vez: salas adecuadas (nivel y equipamiento), profesores candidatos y
+    disponibilidad de cada profesor como máscara de bits por día. Los
+    generadores de cromosomas y los operadores lo comparten para no repetir
+    estas comprobaciones en cada individuo.
+    """
+    
+    def __init__(self, profesores, materias_secciones, salas):
+        """
+        Compila los datos del problema.
+        
+        Args:
+            profesores: Lista de objetos Profesor
+            materias_secciones: Lista de objetos MateriaSecciones
+            salas: Lista de objetos Sala
+        """
+        super().__init__(profesores, materias_secciones, salas)
+        
+        # Salas adecuadas para cada materia-sección
+        self.salas_seccion = [
+            [s for s in self.salas
+             if s.es_adecuada_para_nivel(ms.materia.nivel)
+             and s.tiene_equipamiento(ms.materia.requiere_equipamiento)]
+            for ms in self.materias_secciones
+        ]
+        
+        # Profesores candidatos para cada materia-sección: el profesor específico
+        # si lo tiene (ninguno si no existe) o los que pueden impartir la materia
+        self.profesores_seccion = []
+        for ms in self.materias_secciones:
+            if ms.profesor_especifico:
+                indice = self.indice_profesor(ms.profesor_especifico)
+                candidatos = [self.profesores[indice]] if indice is not None else []
+            else:
+                candidatos = [p for p in self.profesores if p.puede_impartir(ms.materia.id)]
+            self.profesores_seccion.append(candidatos)
+        
+        # Los mismos dominios como arreglos de índices del catálogo
+        self.indices_salas_seccion = [
+            np.array([self.indice_sala(s.id) for s in salas], dtype=np.int32)
+            for salas in self.salas_seccion
+        ]
+        self.indices_profesores_seccion = [
+            np.array([self.indice_profesor(p.id) for p in candidatos], dtype=np.int32)
+            for candidatos in self.profesores_seccion
+        ]
+        
+        # Horas semanales de cada materia-sección (las mismas que exige HorasCompletas)
+        self.horas_seccion = self.horas_requeridas
+        
+        # Disponibilidad de cada profesor: bit h del día d activo si está disponible
+        self._disponibilidad = [
+            [sum(1 << hora for hora in range(NUM_PERIODOS) if p.esta_disponible(dia, hora))
+             for dia in range(NUM_DIAS)]
+            for p in self.profesores
+        ]
+        self.disponibilidad_profesor = np.array(self._disponibilidad, dtype=TIPO_MASCARA).reshape(
+            len(self.profesores), NUM_DIAS)
+    
+    def salas_adecuadas(self, materia_seccion):
+        """
+        Obtiene las salas adecuadas para una materia-sección.
+        
+        Args:
+            materia_seccion: Objeto MateriaSecciones
+            
+        Returns:
+            Lista de objetos Sala (no debe modificarse)
+        """
+        return self.salas_seccion[self.indice_seccion(materia_seccion)]
+    
+    def profesores_candidatos(self, materia_seccion):
+        """
+        Obtiene los profesores que pueden impartir una materia-sección.
+        
+        Args:
+            materia_seccion: Objeto MateriaSecciones
+            
+        Returns:
+            Lista de objetos Profesor (no debe modificarse)
+        """
+        return self.profesores_seccion[self.indice_seccion(materia_seccion)]
+    
+    def esta_disponible(self, profesor_id, dia, hora):
+        """
+        Verifica si un profesor está disponible en un día y hora.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            hora: Índice de la hora
+            
+        Returns:
+            Boolean: True si está disponible, False en caso contrario
+        """
+        indice = self.indice_profesor(profesor_id)
+        if indice is None:
+            return False
+        return bool(self._disponibilidad[indice][dia] >> hora & 1)
+    
+    def mascara_disponibilidad(self, profesor_id, dia):
+        """
+        Obtiene la máscara de horas en que un profesor está disponible en un día.
+        
+        Args:
+            profesor_id: ID del profesor
+            dia: Índice del día
+            
+        Returns:
+            Entero con el bit h activo si el profesor está disponible en la hora h
+        """
+        indice = self.indice_profesor(profesor_id)
+        if indice is None:
+            return 0
+        return self._disponibilidad[indice][dia]
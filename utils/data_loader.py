@@ -6,17 +6,163 @@ Utilidad para cargar datos desde archivos Excel
 """
 
 import os
+import numpy as np
 import pandas as pd
 from model.profesor import Profesor
 from model.materia import Materia, MateriaSecciones
 from model.sala import Sala
 from config import NUM_DIAS, NUM_PERIODOS
 
+# Columnas que usa cada método; el resto de columnas del archivo no se lee
+COLUMNAS_PROFESORES = ["profesor_id", "nombre", "apellido", "seccion", "categoria"]
+COLUMNAS_MATERIAS = ["materia_id", "nombre_materia", "nivel", "horas_semanales_tipicas",
+                     "seccion", "tipo_materia"]
+COLUMNAS_SALAS = ["sala_id", "capacidad", "tipo_sala", "nombre_nivel"]
+COLUMNAS_DIAS = ["lunes", "martes", "miercoles", "jueves", "viernes"]
+
+# Tipo de cada columna: las numéricas se leen como float para admitir celdas vacías;
+# los identificadores de profesor se leen sin convertir, porque pueden ser números o textos
+TIPOS_COLUMNAS = {
+    "profesor_id": object,
+    "nombre": str,
+    "apellido": str,
+    "seccion": str,
+    "categoria": str,
+    "materia_id": str,
+    "nombre_materia": str,
+    "nivel": str,
+    "horas_semanales_tipicas": "float64",
+    "tipo_materia": str,
+    "sala_id": str,
+    "capacidad": "float64",
+    "tipo_sala": str,
+    "nombre_nivel": str,
+    **{dia: "float64" for dia in COLUMNAS_DIAS}
+}
+
+# Conversión de cada tipo de columna en la lectura con openpyxl
+CONVERSIONES = {"float64": float, str: str, object: lambda valor: valor}
+
 class DataLoader:
     """
     Clase para cargar datos desde archivos Excel.
     """
     
+    def __init__(self, solo_lectura=False):
+        """
+        Inicializa el cargador.
+        
+        Args:
+            solo_lectura: Si es True los archivos se leen fila a fila con el modo
+                          de solo lectura de openpyxl, sin construir un DataFrame;
+                          si es False se usa pd.read_excel
+        """
+        self.solo_lectura = solo_lectura
+    
+    def _leer_columnas(self, archivo, columnas):
+        """
+        Lee de un archivo Excel solo las columnas indicadas, con su tipo explícito.
+        Las celdas con solo espacios cuentan como vacías y las filas completamente
+        vacías se descartan.
+        
+        Args:
+            archivo: Ruta al archivo Excel
+            columnas: Lista de nombres de columna a leer
+            
+        Returns:
+            Tupla (datos, filas): diccionario columna -> lista de valores (None en
+            las celdas vacías) con las columnas presentes en el archivo, y número de filas
+        """
+        if self.solo_lectura:
+            datos = self._leer_columnas_openpyxl(archivo, columnas)
+        else:
+            df = pd.read_excel(archivo, usecols=lambda columna: columna in columnas,
+                               dtype={c: TIPOS_COLUMNAS[c] for c in columnas if c in TIPOS_COLUMNAS})
+            df = df.replace(r"^\s*$", np.nan, regex=True).dropna(how="all")
+            datos = {columna: df[columna].astype(object).where(df[columna].notna(), None).tolist()
+                     for columna in df.columns}
+        
+        filas = len(next(iter(datos.values()))) if datos else 0
+        return datos, filas
+    
+    def _leer_columnas_openpyxl(self, archivo, columnas):
+        """
+        Lee las columnas indicadas recorriendo la hoja activa en modo de solo
+        lectura de openpyxl, convirtiendo cada valor al tipo de TIPOS_COLUMNAS.
+        
+        Args:
+            archivo: Ruta al archivo Excel
+            columnas: Lista de nombres de columna a leer
+            
+        Returns:
+            Diccionario columna -> lista de valores (None en las celdas vacías)
+        """
+        from openpyxl import load_workbook
+        
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+        try:
+            filas = libro.active.iter_rows(values_only=True)
+            cabecera = next(filas, ())
+            indices = {nombre: i for i, nombre in enumerate(cabecera) if nombre in columnas}
+            conversiones = [CONVERSIONES.get(TIPOS_COLUMNAS.get(nombre), str) for nombre in indices]
+            
+            datos = {nombre: [] for nombre in indices}
+            listas = list(datos.values())
+            for fila in filas:
+                valores = [fila[i] if i < len(fila) else None for i in indices.values()]
+                valores = [None if valor is None or (isinstance(valor, str) and not valor.strip())
+                           else convertir(valor)
+                           for valor, convertir in zip(valores, conversiones)]
+                if all(valor is None for valor in valores):
+                    continue
+                for lista, valor in zip(listas, valores):
+                    lista.append(valor)
+        finally:
+            libro.close()
+        
+        return datos
+    
+    @staticmethod
+    def _columna(datos, nombre, filas, defecto=None):
+        """
+        Devuelve los valores de una columna, con un valor por defecto para las
+        celdas vacías o si la columna no existe.
+        
+        Args:
+            datos: Diccionario devuelto por _leer_columnas
+            nombre: Nombre de la columna
+            filas: Número de filas
+            defecto: Valor para las celdas vacías
+            
+        Returns:
+            Lista de valores
+        """
+        if nombre not in datos:
+            return [defecto] * filas
+        if defecto is None:
+            return datos[nombre]
+        return [defecto if valor is None else valor for valor in datos[nombre]]
+    
+    @staticmethod
+    def _identificador(valor):
+        """
+        Convierte a entero los identificadores numéricos enteros; los textos
+        (por ejemplo "P-01") se conservan, sin los espacios de los extremos.
+        
+        Args:
+            valor: Valor leído de la columna de identificadores
+            
+        Returns:
+            El mismo valor, como int si es un número entero
+        """
+        if isinstance(valor, str):
+            return valor.strip()
+        if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+            return int(valor)
+        if isinstance(valor, np.integer):
+            return int(valor)
+        return valor
+    
     def cargar_profesores(self, archivo):
         """
         Carga datos de profesores desde un archivo Excel.
@@ -28,38 +174,25 @@ class DataLoader:
             Lista de objetos Profesor
         """
         try:
-            # Leer archivo Excel
-            df = pd.read_excel(archivo)
+            datos, filas = self._leer_columnas(archivo, COLUMNAS_PROFESORES)
             
             profesores = []
             
-            # Procesar cada fila
-            for _, row in df.iterrows():
-                # Extraer datos básicos según la estructura proporcionada
-                id_profesor = row.get('profesor_id', len(profesores) + 1)
-                nombre = f"{row.get('nombre', '')} {row.get('apellido', '')}".strip()
-                
-                # Determinar si tiene ítem basado en la categoría
-                tiene_item = str(row.get('categoria', '')).lower() == 'item'
-                
-                # Extraer especialidades basadas en la sección
-                # Por ejemplo, si la sección es "Guitarra", puede impartir materias relacionadas
-                especialidades = []
-                seccion = row.get('seccion', '')
-                
-                # Lógica para asignar especialidades basadas en la sección
-                # Esta es una implementación básica que debe adaptarse según los requisitos
-                if seccion:
-                    # Asignar IDs de materias basados en la sección
-                    # En una implementación real, se debería cargar esta relación desde los datos
-                    especialidades.append(seccion)
-                
-                # Crear objeto Profesor
+            # Procesar las columnas a la vez, fila a fila
+            for i, (id_profesor, nombre, apellido, seccion, categoria) in enumerate(zip(
+                    self._columna(datos, "profesor_id", filas),
+                    self._columna(datos, "nombre", filas, ""),
+                    self._columna(datos, "apellido", filas, ""),
+                    self._columna(datos, "seccion", filas, ""),
+                    self._columna(datos, "categoria", filas, ""))):
+                # Crear objeto Profesor. Las especialidades se basan en la sección
+                # (por ejemplo "Guitarra"); en una implementación real se debería
+                # cargar la relación con las materias desde los datos
                 profesor = Profesor(
-                    id=id_profesor,
-                    nombre=nombre,
-                    tiene_item=tiene_item,
-                    especialidades=especialidades,
+                    id=self._identificador(id_profesor) if id_profesor is not None else i + 1,
+                    nombre=f"{nombre} {apellido}".strip(),
+                    tiene_item=categoria.lower() == 'item',
+                    especialidades=[seccion] if seccion else [],
                     disponibilidad=None  # La disponibilidad se configurará más adelante
                 )
                 
@@ -82,55 +215,7 @@ class DataLoader:
             Lista de objetos MateriaSecciones
         """
         try:
-            # Leer archivo Excel
-            df = pd.read_excel(archivo)
-            
-            materias_dict = {}  # Para evitar duplicados
-            materias_secciones = []
-            
-            # Procesar cada fila
-            for _, row in df.iterrows():
-                # Extraer datos básicos según la estructura proporcionada
-                id_materia = row.get('materia_id', len(materias_dict) + 1)
-                nombre = row.get('nombre_materia', f"Materia {id_materia}")
-                nivel = row.get('nivel', 'general').lower()
-                horas_semanales = int(row.get('horas_semanales_tipicas', 1))
-                seccion = row.get('seccion', 'Todos')
-                
-                # Obtener profesor específico si se requiere
-                # En este caso, basado en la cantidad de docentes
-                profesor_especifico = None
-                
-                # Extraer requisitos de equipamiento si están presentes
-                # Basado en el tipo_materia o otros campos relevantes
-                equipamiento = []
-                tipo_materia = row.get('tipo_materia', '').lower()
-                if tipo_materia:
-                    equipamiento.append(tipo_materia)
-                
-                # Crear o recuperar objeto Materia
-                if id_materia not in materias_dict:
-                    materia = Materia(
-                        id=id_materia,
-                        nombre=nombre,
-                        nivel=nivel,
-                        horas_semanales=horas_semanales,
-                        requiere_equipamiento=equipamiento if equipamiento else None
-                    )
-                    materias_dict[id_materia] = materia
-                else:
-                    materia = materias_dict[id_materia]
-                
-                # Crear objeto MateriaSecciones
-                materia_seccion = MateriaSecciones(
-                    materia=materia,
-                    seccion=seccion,
-                    profesor_especifico=profesor_especifico
-                )
-                
-                materias_secciones.append(materia_seccion)
-            
-            return materias_secciones
+            return self._materias_secciones(*self._leer_columnas(archivo, COLUMNAS_MATERIAS))
         
         except Exception as e:
             print(f"Error al cargar materias y secciones: {e}")
@@ -147,38 +232,35 @@ class DataLoader:
             Lista de objetos Sala
         """
         try:
-            # Leer archivo Excel
-            df = pd.read_excel(archivo)
+            datos, filas = self._leer_columnas(archivo, COLUMNAS_SALAS)
             
             salas = []
             
-            # Procesar cada fila
-            for _, row in df.iterrows():
-                # Extraer datos básicos según la estructura proporcionada
-                id_sala = row.get('sala_id', len(salas) + 1)
-                nombre = row.get('sala_id', f"Sala {id_sala}")  # Usando sala_id como nombre
-                capacidad = int(row.get('capacidad', 30))
+            # Procesar las columnas a la vez, fila a fila
+            for id_sala, capacidad, tipo_sala, nombre_nivel in zip(
+                    self._columna(datos, "sala_id", filas),
+                    self._columna(datos, "capacidad", filas, 30),
+                    self._columna(datos, "tipo_sala", filas, ""),
+                    self._columna(datos, "nombre_nivel", filas, "")):
+                if id_sala is None:
+                    id_sala = len(salas) + 1
                 
                 # Determinar el nivel de la sala
-                nombre_nivel = row.get('nombre_nivel', '').lower()
-                if nombre_nivel == 'todos':
+                nivel = nombre_nivel.lower()
+                if nivel == 'todos':
                     nivel = 'general'
-                else:
-                    nivel = nombre_nivel.lower()
                 
                 # Extraer equipamiento disponible basado en tipo_sala
-                equipamiento = []
-                tipo_sala = row.get('tipo_sala', '').lower()
-                if tipo_sala and tipo_sala != 'regular':
-                    equipamiento.append(tipo_sala)
+                tipo_sala = tipo_sala.lower()
+                equipamiento = [tipo_sala] if tipo_sala and tipo_sala != 'regular' else None
                 
-                # Crear objeto Sala
+                # Crear objeto Sala (usando sala_id como nombre)
                 sala = Sala(
                     id=id_sala,
-                    nombre=nombre,
-                    capacidad=capacidad,
+                    nombre=id_sala,
+                    capacidad=int(capacidad),
                     nivel=nivel,
-                    equipamiento=equipamiento if equipamiento else None
+                    equipamiento=equipamiento
                 )
                 
                 salas.append(sala)
@@ -201,50 +283,114 @@ class DataLoader:
             Lista actualizada de profesores con disponibilidad
         """
         try:
-            # Leer archivo Excel
-            df = pd.read_excel(archivo_materias)
+            self._asignar_disponibilidad(profesores, *self._leer_columnas(archivo_materias, COLUMNAS_DIAS))
+            return profesores
+        
+        except Exception as e:
+            print(f"Error al establecer disponibilidad de profesores: {e}")
+            return profesores
+    
+    def _materias_secciones(self, datos, filas):
+        """
+        Construye las materias-secciones a partir de las columnas leídas.
+        
+        Args:
+            datos: Diccionario columna -> valores devuelto por _leer_columnas
+            filas: Número de filas
             
-            # Crear mapa de profesores por ID para acceso rápido
-            profesores_map = {p.id: p for p in profesores}
+        Returns:
+            Lista de objetos MateriaSecciones
+        """
+        materias_dict = {}  # Para evitar duplicados
+        materias_secciones = []
+        
+        # Procesar las columnas a la vez, fila a fila
+        for id_materia, nombre, nivel, horas_semanales, seccion, tipo_materia in zip(
+                self._columna(datos, "materia_id", filas),
+                self._columna(datos, "nombre_materia", filas),
+                self._columna(datos, "nivel", filas, "general"),
+                self._columna(datos, "horas_semanales_tipicas", filas, 1),
+                self._columna(datos, "seccion", filas, "Todos"),
+                self._columna(datos, "tipo_materia", filas, "")):
+            if id_materia is None:
+                id_materia = len(materias_dict) + 1
             
-            # Procesar cada fila para extraer disponibilidad
-            for _, row in df.iterrows():
-                # Verificar disponibilidad por día
-                disponibilidad = [[False for _ in range(NUM_PERIODOS)] for _ in range(NUM_DIAS)]
-                
-                # Días de la semana (0=Lunes, 4=Viernes)
-                dias = [
-                    bool(row.get('lunes', 0)),
-                    bool(row.get('martes', 0)),
-                    bool(row.get('miercoles', 0)),
-                    bool(row.get('jueves', 0)),
-                    bool(row.get('viernes', 0))
-                ]
-                
-                # Convertir hora de entrada/salida en períodos disponibles
-                hora_entrada = row.get('horario_entrada', '00:00:00')
-                hora_salida = row.get('horario_salida', '23:59:59')
-                
-                # Simplificación: asignar disponibilidad para todos los períodos en los días indicados
+            # Crear o recuperar objeto Materia. El equipamiento requerido se
+            # basa en el tipo de materia
+            if id_materia not in materias_dict:
+                materia = Materia(
+                    id=id_materia,
+                    nombre=nombre if nombre is not None else f"Materia {id_materia}",
+                    nivel=nivel.lower(),
+                    horas_semanales=int(horas_semanales),
+                    requiere_equipamiento=[tipo_materia.lower()] if tipo_materia else None
+                )
+                materias_dict[id_materia] = materia
+            else:
+                materia = materias_dict[id_materia]
+            
+            # Crear objeto MateriaSecciones (sin profesor específico)
+            materia_seccion = MateriaSecciones(
+                materia=materia,
+                seccion=seccion,
+                profesor_especifico=None
+            )
+            
+            materias_secciones.append(materia_seccion)
+        
+        return materias_secciones
+    
+    def _asignar_disponibilidad(self, profesores, datos, filas):
+        """
+        Asigna a los profesores la disponibilidad derivada de las columnas de días.
+        
+        Args:
+            profesores: Lista de objetos Profesor (se modifican en el sitio)
+            datos: Diccionario columna -> valores devuelto por _leer_columnas
+            filas: Número de filas
+        """
+        # Días con alguna materia (0=Lunes, 4=Viernes). Simplificación: se
+        # asignan todos los períodos de esos días, sin usar el horario de
+        # entrada y salida de cada materia
+        dias = np.array([self._columna(datos, dia, filas, 0) for dia in COLUMNAS_DIAS],
+                        dtype=float).reshape(NUM_DIAS, filas).any(axis=1)
+        disponibilidad = [[bool(dias[dia])] * NUM_PERIODOS for dia in range(NUM_DIAS)]
+        
+        # Asignar esta disponibilidad a todos los profesores
+        # En una implementación real, se debería relacionar cada materia con sus profesores
+        for profesor in profesores:
+            if not profesor.disponibilidad:
+                profesor.disponibilidad = [fila[:] for fila in disponibilidad]
+            else:
+                # Combinar disponibilidades (OR lógico)
                 for dia in range(NUM_DIAS):
-                    if dias[dia]:
-                        for periodo in range(NUM_PERIODOS):
-                            disponibilidad[dia][periodo] = True
-                
-                # Asignar esta disponibilidad a los profesores relevantes
-                # En este ejemplo, asignamos a todos los profesores la misma disponibilidad
-                # En una implementación real, se debería relacionar cada materia con sus profesores
-                for profesor in profesores:
-                    if profesor.disponibilidad is None:
-                        profesor.disponibilidad = [row[:] for row in disponibilidad]
-                    else:
-                        # Combinar disponibilidades (OR lógico)
-                        for dia in range(NUM_DIAS):
-                            for periodo in range(NUM_PERIODOS):
-                                profesor.disponibilidad[dia][periodo] |= disponibilidad[dia][periodo]
+                    for periodo in range(NUM_PERIODOS):
+                        profesor.disponibilidad[dia][periodo] |= disponibilidad[dia][periodo]
+    
+    def cargar_instancia(self, archivo_profesores, archivo_materias, archivo_salas):
+        """
+        Carga profesores, materias-secciones y salas, y establece la disponibilidad
+        de los profesores. A diferencia de llamar a cargar_materias_secciones y a
+        establecer_disponibilidad_profesores por separado, el archivo de materias
+        se lee una sola vez.
+        
+        Args:
+            archivo_profesores: Ruta al archivo Excel de profesores
+            archivo_materias: Ruta al archivo Excel de materias (tabla minable)
+            archivo_salas: Ruta al archivo Excel de salas
             
-            return profesores
+        Returns:
+            Tupla (profesores, materias_secciones, salas)
+        """
+        profesores = self.cargar_profesores(archivo_profesores)
+        salas = self.cargar_salas(archivo_salas)
         
+        try:
+            datos, filas = self._leer_columnas(archivo_materias, COLUMNAS_MATERIAS + COLUMNAS_DIAS)
+            materias_secciones = self._materias_secciones(datos, filas)
+            self._asignar_disponibilidad(profesores, datos, filas)
         except Exception as e:
-            print(f"Error al establecer disponibilidad de profesores: {e}")
-            return profesores
\ No newline at end of file
+            print(f"Error al cargar materias y secciones: {e}")
+            materias_secciones = []
+        
+        return profesores, materias_secciones, salas
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Caché binaria de las instancias cargadas desde los archivos Excel
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+from model.profesor import Profesor
+from model.materia import Materia, MateriaSecciones
+from model.sala import Sala
+from utils.data_loader import DataLoader
+from config import NUM_DIAS, NUM_PERIODOS, DIRECTORIO_CACHE_INSTANCIAS
+
+# Versión del formato de la caché
+VERSION_CACHE = 1
+
+# Nombre del manifiesto dentro de cada entrada de la caché
+MANIFIESTO = "manifiesto.json"
+
+
+def huella_cargador(data_loader):
+    """
+    Resume la configuración y el código del cargador: una entrada de la caché
+    solo es válida para el cargador que la produjo. Se incluye el código fuente
+    del módulo del cargador (columnas, tipos y normalización) y el de este
+    módulo (conversión a arreglos), de modo que cualquier cambio en ellos
+    invalida las entradas sin tener que cambiar VERSION_CACHE.
+    
+    Args:
+        data_loader: Objeto DataLoader
+        
+    Returns:
+        Cadena hexadecimal con la huella
+    """
+    resumen = hashlib.sha256(type(data_loader).__qualname__.encode())
+    resumen.update(repr(sorted(vars(data_loader).items())).encode())
+    for modulo in (sys.modules[type(data_loader).__module__], sys.modules[__name__]):
+        ruta = getattr(modulo, "__file__", None)
+        if ruta:
+            with open(ruta, "rb") as archivo:
+                resumen.update(archivo.read())
+    return resumen.hexdigest()
+
+
+def clave_fuentes(rutas, contenido=False, data_loader=None):
+    """
+    Calcula la clave de la caché a partir de los archivos de origen y del cargador.
+    
+    Args:
+        rutas: Lista de rutas de los archivos de origen
+        contenido: Si es True la clave depende del contenido de los archivos
+                   (SHA-256); si es False, de su tamaño y fecha de modificación
+        data_loader: Objeto DataLoader con el que se cargan los archivos (opcional;
+                     si se indica, la clave incluye su huella, ver huella_cargador)
+                     
+    Returns:
+        Cadena hexadecimal con la clave
+    """
+    resumen = hashlib.sha256(f"v{VERSION_CACHE}".encode())
+    if data_loader is not None:
+        resumen.update(huella_cargador(data_loader).encode())
+    for ruta in rutas:
+        resumen.update(os.path.abspath(ruta).encode())
+        if contenido:
+            with open(ruta, "rb") as archivo:
+                for bloque in iter(lambda: archivo.read(1 << 20), b""):
+                    resumen.update(bloque)
+        else:
+            estado = os.stat(ruta)
+            resumen.update(f"{estado.st_size}:{estado.st_mtime_ns}".encode())
+    return resumen.hexdigest()
+
+
+def _valores(valores):
+    """
+    Convierte una lista de identificadores o textos en un arreglo que se pueda
+    guardar en .npy sin pickle: enteros o cadenas Unicode de ancho fijo.
+    
+    Args:
+        valores: Lista de valores
+        
+    Returns:
+        Arreglo de NumPy
+        
+    Raises:
+        ValueError: Si los valores no son todos enteros o todos cadenas
+    """
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in valores):
+        return np.array(valores, dtype=np.int64)
+    if all(isinstance(v, str) for v in valores):
+        return np.array(valores, dtype=np.str_) if valores else np.empty(0, dtype="<U1")
+    raise ValueError("Solo se pueden guardar identificadores enteros o de texto")
+
+
+def _listas(listas):
+    """
+    Aplana una lista de listas en formato CSR: inicio de cada lista y valores.
+    
+    Args:
+        listas: Lista de listas de valores
+        
+    Returns:
+        Tupla (inicios, valores): inicios tiene len(listas) + 1 elementos
+    """
+    inicios = np.zeros(len(listas) + 1, dtype=np.int64)
+    inicios[1:] = np.cumsum([len(lista) for lista in listas])
+    return inicios, _valores([valor for lista in listas for valor in lista])
+
+
+def _desplegar(inicios, valores):
+    """
+    Reconstruye las listas guardadas con _listas.
+    
+    Args:
+        inicios: Arreglo de inicios
+        valores: Arreglo de valores
+        
+    Returns:
+        Lista de listas
+    """
+    valores = valores.tolist()
+    inicios = inicios.tolist()
+    return [valores[inicio:fin] for inicio, fin in zip(inicios[:-1], inicios[1:])]
+
+
+def _arreglos(profesores, materias_secciones, salas):
+    """
+    Normaliza la instancia en arreglos: una tabla por tipo de objeto, con las
+    listas (especialidades, equipamiento) en formato CSR y las materias
+    compartidas por varias secciones guardadas una sola vez.
+    
+    Args:
+        profesores: Lista de objetos Profesor
+        materias_secciones: Lista de objetos MateriaSecciones
+        salas: Lista de objetos Sala
+        
+    Returns:
+        Diccionario nombre -> arreglo
+        
+    Raises:
+        ValueError: Si algún dato no se puede representar en la caché
+    """
+    # Materias distintas, en orden de aparición
+    materias = list({id(ms.materia): ms.materia for ms in materias_secciones}.values())
+    indice_materia = {id(materia): i for i, materia in enumerate(materias)}
+    indice_profesor = {profesor.id: i for i, profesor in enumerate(profesores)}
+    
+    # Disponibilidad: matriz completa y si el profesor tenía alguna definida
+    con_disponibilidad = np.array([bool(p.disponibilidad) for p in profesores], dtype=bool)
+    disponibilidad = np.ones((len(profesores), NUM_DIAS, NUM_PERIODOS), dtype=bool)
+    for i, profesor in enumerate(profesores):
+        if profesor.disponibilidad:
+            disponibilidad[i] = np.array(profesor.disponibilidad, dtype=bool).reshape(NUM_DIAS, NUM_PERIODOS)
+    
+    especificos = []
+    for ms in materias_secciones:
+        if ms.profesor_especifico is None:
+            especificos.append(-1)
+        elif ms.profesor_especifico in indice_profesor:
+            especificos.append(indice_profesor[ms.profesor_especifico])
+        else:
+            raise ValueError(f"Profesor específico desconocido: {ms.profesor_especifico}")
+    
+    arreglos = {
+        "profesores_id": _valores([p.id for p in profesores]),
+        "profesores_nombre": _valores([p.nombre for p in profesores]),
+        "profesores_item": np.array([bool(p.tiene_item) for p in profesores], dtype=bool),
+        "profesores_con_disponibilidad": con_disponibilidad,
+        "profesores_disponibilidad": disponibilidad,
+        "materias_id": _valores([m.id for m in materias]),
+        "materias_nombre": _valores([m.nombre for m in materias]),
+        "materias_nivel": _valores([m.nivel for m in materias]),
+        "materias_horas": np.array([m.horas_semanales for m in materias], dtype=np.int64),
+        "secciones_materia": np.array([indice_materia[id(ms.materia)] for ms in materias_secciones],
+                                      dtype=np.int64),
+        "secciones_seccion": _valores([ms.seccion for ms in materias_secciones]),
+        "secciones_profesor": np.array(especificos, dtype=np.int64),
+        "salas_id": _valores([s.id for s in salas]),
+        "salas_nombre": _valores([s.nombre for s in salas]),
+        "salas_capacidad": np.array([s.capacidad for s in salas], dtype=np.int64),
+        "salas_nivel": _valores([s.nivel for s in salas])
+    }
+    
+    for nombre, listas in (("profesores_especialidades", [p.especialidades for p in profesores]),
+                           ("materias_equipamiento", [m.requiere_equipamiento for m in materias]),
+                           ("salas_equipamiento", [s.equipamiento for s in salas])):
+        arreglos[f"{nombre}_inicio"], arreglos[nombre] = _listas(listas)
+    
+    return arreglos
+
+
+def _objetos(arreglos):
+    """
+    Reconstruye los objetos del modelo a partir de los arreglos de _arreglos.
+    
+    Args:
+        arreglos: Diccionario nombre -> arreglo (posiblemente mapeado en memoria)
+        
+    Returns:
+        Tupla (profesores, materias_secciones, salas)
+    """
+    especialidades = _desplegar(arreglos["profesores_especialidades_inicio"],
+                                arreglos["profesores_especialidades"])
+    disponibilidad = arreglos["profesores_disponibilidad"].tolist()
+    profesores = [
+        Profesor(id=id_profesor, nombre=nombre, tiene_item=item, especialidades=especialidades[i],
+                 disponibilidad=disponibilidad[i] if con_disponibilidad else None)
+        for i, (id_profesor, nombre, item, con_disponibilidad) in enumerate(zip(
+            arreglos["profesores_id"].tolist(), arreglos["profesores_nombre"].tolist(),
+            arreglos["profesores_item"].tolist(), arreglos["profesores_con_disponibilidad"].tolist()))
+    ]
+    
+    equipamiento = _desplegar(arreglos["materias_equipamiento_inicio"], arreglos["materias_equipamiento"])
+    materias = [
+        Materia(id=id_materia, nombre=nombre, nivel=nivel, horas_semanales=horas,
+                requiere_equipamiento=equipamiento[i])
+        for i, (id_materia, nombre, nivel, horas) in enumerate(zip(
+            arreglos["materias_id"].tolist(), arreglos["materias_nombre"].tolist(),
+            arreglos["materias_nivel"].tolist(), arreglos["materias_horas"].tolist()))
+    ]
+    
+    materias_secciones = [
+        MateriaSecciones(materias[materia], seccion,
+                         profesor_especifico=profesores[profesor].id if profesor >= 0 else None)
+        for materia, seccion, profesor in zip(
+            arreglos["secciones_materia"].tolist(), arreglos["secciones_seccion"].tolist(),
+            arreglos["secciones_profesor"].tolist())
+    ]
+    
+    equipamiento = _desplegar(arreglos["salas_equipamiento_inicio"], arreglos["salas_equipamiento"])
+    salas = [
+        Sala(id=id_sala, nombre=nombre, capacidad=capacidad, nivel=nivel, equipamiento=equipamiento[i])
+        for i, (id_sala, nombre, capacidad, nivel) in enumerate(zip(
+            arreglos["salas_id"].tolist(), arreglos["salas_nombre"].tolist(),
+            arreglos["salas_capacidad"].tolist(), arreglos["salas_nivel"].tolist()))
+    ]
+    
+    return profesores, materias_secciones, salas
+
+
+def guardar_instancia(directorio, clave, profesores, materias_secciones, salas, fuentes=()):
+    """
+    Guarda la instancia en una entrada de la caché: un archivo .npy por arreglo
+    y un manifiesto JSON. La entrada se escribe en un directorio temporal y
+    después se renombra, y sustituye a las entradas anteriores de la caché.
+    
+    Args:
+        directorio: Directorio de la caché
+        clave: Clave calculada con clave_fuentes
+        profesores: Lista de objetos Profesor (con su disponibilidad)
+        materias_secciones: Lista de objetos MateriaSecciones
+        salas: Lista de objetos Sala
+        fuentes: Rutas de los archivos de origen, solo informativas
+        
+    Returns:
+        Ruta de la entrada guardada
+        
+    Raises:
+        ValueError: Si algún dato no se puede representar en la caché
+    """
+    arreglos = _arreglos(profesores, materias_secciones, salas)
+    
+    os.makedirs(directorio, exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix=".tmp-", dir=directorio)
+    try:
+        for nombre, arreglo in arreglos.items():
+            np.save(os.path.join(temporal, f"{nombre}.npy"), arreglo, allow_pickle=False)
+        
+        manifiesto = {
+            "version": VERSION_CACHE,
+            "clave": clave,
+            "fuentes": [os.path.abspath(ruta) for ruta in fuentes],
+            "arreglos": {nombre: {"dtype": arreglo.dtype.str, "forma": list(arreglo.shape)}
+                         for nombre, arreglo in arreglos.items()}
+        }
+        with open(os.path.join(temporal, MANIFIESTO), "w", encoding="utf-8") as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+        
+        # Eliminar las entradas anteriores y publicar la nueva
+        for entrada in os.listdir(directorio):
+            ruta = os.path.join(directorio, entrada)
+            if entrada != os.path.basename(temporal) and os.path.isfile(os.path.join(ruta, MANIFIESTO)):
+                shutil.rmtree(ruta, ignore_errors=True)
+        destino = os.path.join(directorio, clave)
+        os.replace(temporal, destino)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    
+    return destino
+
+
+def cargar_instancia(directorio, clave):
+    """
+    Carga una instancia de la caché, mapeando en memoria sus arreglos.
+    
+    Args:
+        directorio: Directorio de la caché
+        clave: Clave calculada con clave_fuentes
+        
+    Returns:
+        Tupla (profesores, materias_secciones, salas), o None si no hay una
+        entrada válida para esa clave
+    """
+    entrada = os.path.join(directorio, clave)
+    try:
+        with open(os.path.join(entrada, MANIFIESTO), encoding="utf-8") as archivo:
+            manifiesto = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    
+    if manifiesto.get("version") != VERSION_CACHE or manifiesto.get("clave") != clave:
+        return None
+    
+    try:
+        arreglos = {nombre: np.load(os.path.join(entrada, f"{nombre}.npy"), mmap_mode="r",
+                                    allow_pickle=False)
+                    for nombre in manifiesto["arreglos"]}
+        return _objetos(arreglos)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def cargar_con_cache(archivo_profesores, archivo_materias, archivo_salas,
+                     directorio=DIRECTORIO_CACHE_INSTANCIAS, data_loader=None, contenido=False):
+    """
+    Carga la instancia desde la caché si los archivos de origen y el cargador no
+    han cambiado; si no, la carga de los archivos Excel con el DataLoader y la guarda en la caché.
+    
+    Args:
+        archivo_profesores: Ruta al archivo Excel de profesores
+        archivo_materias: Ruta al archivo Excel de materias (tabla minable)
+        archivo_salas: Ruta al archivo Excel de salas
+        directorio: Directorio de la caché (None para no usarla)
+        data_loader: Objeto DataLoader para la carga desde Excel (opcional)
+        contenido: Si es True la clave se calcula con el contenido de los
+                   archivos en lugar de su fecha de modificación
+                   
+    Returns:
+        Tupla (profesores, materias_secciones, salas)
+    """
+    fuentes = [archivo_profesores, archivo_materias, archivo_salas]
+    data_loader = data_loader or DataLoader()
+    clave = clave_fuentes(fuentes, contenido, data_loader) if directorio else None
+    
+    if clave is not None:
+        instancia = cargar_instancia(directorio, clave)
+        if instancia is not None:
+            return instancia
+    
+    profesores, materias_secciones, salas = data_loader.cargar_instancia(*fuentes)
+    
+    # No se guardan cargas fallidas (el DataLoader devuelve listas vacías)
+    if clave is not None and profesores and materias_secciones and salas:
+        try:
+            guardar_instancia(directorio, clave, profesores, materias_secciones, salas, fuentes)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo guardar la instancia en la caché: {e}")
+    
+    return profesores, materias_secciones, salas